@@ -0,0 +1,8 @@
+"""
+Punto de entrada para `python -m src`.
+"""
+
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,524 @@
+"""
+Módulo que implementa la forma compilada de un Autómata Finito Determinista (AFD).
+Este módulo convierte el AFD obtenido por construcción de subconjuntos en una
+tabla de transiciones densa de enteros, adecuada para el análisis léxico.
+"""
+
+from array import array
+from bisect import bisect_right
+from .caracteres import ClaseCaracteres
+
+
+class TablaClases(dict):
+    """
+    Diccionario {simbolo: clase} de un AFD compilado que también resuelve
+    caracteres por intervalos.
+    
+    Los símbolos sueltos del alfabeto son claves del diccionario, y
+    también los caracteres de las clases de caracteres pequeñas (hasta
+    LIMITE_EXPANSION caracteres). Los de las clases más grandes, como las
+    letras Unicode, se guardan como intervalos: `clases[caracter]` los
+    busca por bisección la primera vez que aparecen y los memoriza como
+    claves, y resolver() memoriza de una vez los caracteres de un texto
+    para que luego baste `clases.get(caracter, 0)`. Todo otro símbolo
+    pertenece a la clase 0.
+    """
+    
+    # Tamaño máximo de una clase de caracteres que se expande a claves
+    LIMITE_EXPANSION = 1024
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Intervalos (inicio, fin, clase) ordenados y disjuntos, sus inicios
+        # para la bisección y los caracteres memorizados desde ellos
+        self.intervalos = []
+        self.inicios = []
+        self.memorizados = set()
+    
+    def agregar_intervalos(self, caracteres: ClaseCaracteres, clase: int):
+        """
+        Asigna una clase a todos los caracteres de una ClaseCaracteres.
+        
+        Args:
+            caracteres (ClaseCaracteres): Caracteres, disjuntos de los ya agregados
+            clase (int): Clase que se les asigna
+        """
+        if len(caracteres) <= self.LIMITE_EXPANSION:
+            for inicio, fin in caracteres.intervalos:
+                for punto in range(inicio, fin + 1):
+                    self[chr(punto)] = clase
+            return
+        self.intervalos.extend((inicio, fin, clase) for inicio, fin in caracteres.intervalos)
+        self.intervalos.sort()
+        self.inicios = [inicio for inicio, _, _ in self.intervalos]
+        for simbolo in self.memorizados:
+            del self[simbolo]
+        self.memorizados.clear()
+    
+    def __missing__(self, simbolo) -> int:
+        """
+        Busca por intervalos un símbolo que no es clave y lo memoriza.
+        
+        Args:
+            simbolo: Símbolo de entrada
+        
+        Returns:
+            int: Clase del intervalo que lo contiene, o 0
+        """
+        if not isinstance(simbolo, str) or len(simbolo) != 1:
+            return 0
+        punto = ord(simbolo)
+        indice = bisect_right(self.inicios, punto) - 1
+        clase = 0
+        if indice >= 0 and punto <= self.intervalos[indice][1]:
+            clase = self.intervalos[indice][2]
+        self[simbolo] = clase
+        self.memorizados.add(simbolo)
+        return clase
+    
+    def resolver(self, texto):
+        """
+        Memoriza la clase de todos los caracteres distintos de un texto.
+        
+        Args:
+            texto: Cadena o iterable de caracteres
+        """
+        if self.intervalos:
+            for caracter in set(texto).difference(self):
+                self[caracter]
+    
+    def sueltos(self) -> dict:
+        """
+        Returns:
+            dict: Los símbolos sueltos y su clase, sin los memorizados
+        """
+        return {simbolo: clase for simbolo, clase in self.items() if simbolo not in self.memorizados}
+    
+    def reasignar(self, nueva_clase: list) -> 'TablaClases':
+        """
+        Traduce las clases, por ejemplo después de minimizar.
+        
+        Args:
+            nueva_clase (list): Nueva clase de cada clase actual
+        
+        Returns:
+            TablaClases: Tabla con las clases traducidas, sin las entradas
+            que pasan a la clase 0
+        """
+        tabla = TablaClases(
+            (simbolo, nueva_clase[clase])
+            for simbolo, clase in self.sueltos().items()
+            if nueva_clase[clase] != 0
+        )
+        tabla.intervalos = [
+            (inicio, fin, nueva_clase[clase])
+            for inicio, fin, clase in self.intervalos
+            if nueva_clase[clase] != 0
+        ]
+        tabla.inicios = [inicio for inicio, _, _ in tabla.intervalos]
+        return tabla
+
+
+class AFDCompilado:
+    """
+    Clase que representa un AFD compilado a una tabla de transiciones densa.
+
+    A partir del AFD producido por `AFND.convertir_a_afd` se obtiene:
+    - Estados renumerados como enteros pequeños (0 es el estado muerto)
+    - Símbolos agrupados en clases de equivalencia (0 es la clase "otro",
+      a la que pertenece todo carácter que no aparece en `clases`). Las
+      clases de caracteres del AFND se guardan como intervalos (ver TablaClases)
+    - Una tabla plana `array('H')` indexada por `estado * n_clases + clase`
+    - Un mapa de bits con los estados finales y el tipo de token de cada uno
+    - Las etiquetas originales (subconjuntos del AFND) de cada estado
+
+    Opcionalmente puede minimizarse con el algoritmo de Hopcroft.
+    """
+
+    ESTADO_MUERTO = 0
+    CLASE_OTRO = 0
+    
+    # Versión de la representación interna. Forma parte del nombre de los
+    # AFDs guardados en disco, así que cambiarla invalida los archivos viejos
+    FORMATO = 2
+
+    def __init__(self, estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd,
+                 tipos=None, otro=None, alfabeto=None):
+        """
+        Compila el AFD dado por construcción de subconjuntos.
+        
+        Args:
+            estados_afd: Conjunto de estados del AFD (frozensets)
+            estado_inicial_afd: Estado inicial del AFD
+            transiciones_afd: Diccionario {(estado, simbolo): estado_destino}
+            estados_finales_afd: Conjunto de estados finales del AFD
+            tipos: Diccionario opcional {estado_final: tipo de token}
+            otro: Símbolo que representa a los caracteres fuera del alfabeto;
+                  sus transiciones forman la clase 0
+            alfabeto: Alfabeto del AFND; necesario junto con `otro` para que
+                      los símbolos sin transiciones no caigan en la clase 0
+        """
+        # Agrupar las transiciones por estado para recorrerlas en orden
+        salidas = {}
+        for (estado, simbolo), destino in transiciones_afd.items():
+            salidas.setdefault(estado, {})[simbolo] = destino
+        
+        # Renumerar los estados en orden de recorrido (BFS) desde el inicial,
+        # de forma determinista: el 0 queda reservado para el estado muerto
+        self.etiquetas = [frozenset(), estado_inicial_afd]
+        numeros = {estado_inicial_afd: 1}
+        indice = 1
+        while indice < len(self.etiquetas):
+            estado = self.etiquetas[indice]
+            for simbolo in sorted(salidas.get(estado, {}), key=_orden_simbolo):
+                destino = salidas[estado][simbolo]
+                if destino not in numeros:
+                    numeros[destino] = len(self.etiquetas)
+                    self.etiquetas.append(destino)
+            indice += 1
+        self.n_estados = len(self.etiquetas)
+        self.estado_inicial = 1
+        
+        # Agrupar los símbolos en clases de equivalencia: dos símbolos son
+        # equivalentes si llevan al mismo destino desde todos los estados.
+        # La clase 0 es la del símbolo `otro` (o la del estado muerto si no
+        # existe); los símbolos que se comportan igual no se guardan.
+        # La firma de cada símbolo se arma con sus transiciones
+        # (origen, destino) en orden de estados, sin recorrer los estados
+        # desde los que no sale, y se expande a columna solo por clase
+        columnas = {}
+        for origen, estado in enumerate(self.etiquetas):
+            for simbolo, destino in salidas.get(estado, {}).items():
+                columnas.setdefault(simbolo, []).append((origen, numeros[destino]))
+        
+        firmas = {tuple(columnas.get(otro, ())): self.CLASE_OTRO}
+        self.clases = TablaClases()
+        simbolos = set(alfabeto or ()) | {simbolo for (_, simbolo) in transiciones_afd}
+        for simbolo in sorted(simbolos, key=_orden_simbolo):
+            if simbolo == otro:
+                continue
+            firma = tuple(columnas.get(simbolo, ()))
+            if firma not in firmas:
+                firmas[firma] = len(firmas)
+            if firmas[firma] == self.CLASE_OTRO:
+                continue
+            if isinstance(simbolo, ClaseCaracteres):
+                self.clases.agregar_intervalos(simbolo, firmas[firma])
+            else:
+                self.clases[simbolo] = firmas[firma]
+        self.n_clases = len(firmas)
+        
+        def columna(firma):
+            destinos = [self.ESTADO_MUERTO] * self.n_estados
+            for origen, destino in firma:
+                destinos[origen] = destino
+            return tuple(destinos)
+        
+        self._llenar({columna(firma): clase for firma, clase in firmas.items()})
+        
+        # Mapa de bits de estados finales y tipo de token de cada estado
+        self.finales = bytearray((self.n_estados + 7) // 8)
+        self.tipos = [None] * self.n_estados
+        for estado in estados_finales_afd:
+            if estado in numeros:
+                numero = numeros[estado]
+                self.finales[numero >> 3] |= 1 << (numero & 7)
+                if tipos:
+                    self.tipos[numero] = tipos.get(estado)
+        
+        # Número de estados antes de minimizar (None si no se ha minimizado)
+        self.estados_sin_minimizar = None
+
+    def _llenar(self, firmas):
+        """
+        Construye la tabla plana de transiciones a partir de las columnas.
+        
+        Args:
+            firmas: Diccionario {columna: clase}, donde cada columna es la tupla
+                    de estados destino de la clase para cada estado origen
+        """
+        tipo = 'H' if self.n_estados <= 0xFFFF else 'I'
+        self.tabla = array(tipo, bytes(array(tipo).itemsize * self.n_estados * self.n_clases))
+        for firma, clase in firmas.items():
+            for estado, destino in enumerate(firma):
+                self.tabla[estado * self.n_clases + clase] = destino
+
+    def clase(self, simbolo) -> int:
+        """
+        Obtiene la clase de equivalencia de un símbolo.
+        
+        Args:
+            simbolo: Símbolo de entrada
+        
+        Returns:
+            int: Identificador de clase (0 si el símbolo no pertenece al alfabeto)
+        """
+        clase = self.clases.get(simbolo)
+        return self.clases[simbolo] if clase is None else clase
+
+    def siguiente(self, estado: int, simbolo) -> int:
+        """
+        Calcula el estado siguiente desde un estado con un símbolo.
+        
+        Args:
+            estado (int): Estado actual
+            simbolo: Símbolo a consumir
+        
+        Returns:
+            int: Estado destino (0 si no hay transición)
+        """
+        return self.tabla[estado * self.n_clases + self.clase(simbolo)]
+
+    def expresion_ciclo(self, estado: int):
+        """
+        Describe los caracteres con los que un estado vuelve a sí mismo.
+        
+        Args:
+            estado (int): Estado a consultar
+        
+        Returns:
+            str: Clase de expresión regular ([...] o [^...]) de esos
+            caracteres, o None si el estado no tiene ciclo. Sirve para
+            consumir de una vez con `re` los tramos largos en los que el AFD
+            no cambia de estado (espacios, cuerpos de comentarios y cadenas)
+        """
+        fila = self.tabla[estado * self.n_clases:(estado + 1) * self.n_clases]
+        en_ciclo = [destino == estado for destino in fila]
+        if not any(en_ciclo):
+            return None
+        
+        # Si la clase 0 está en el ciclo, se describen los caracteres que lo
+        # cortan (todo carácter fuera de `clases` pertenece a la clase 0)
+        negada = en_ciclo[self.CLASE_OTRO]
+        caracteres = [
+            simbolo for simbolo, clase in self.clases.sueltos().items()
+            if isinstance(simbolo, str) and len(simbolo) == 1 and en_ciclo[clase] != negada
+        ]
+        intervalos = [(inicio, fin) for inicio, fin, clase in self.clases.intervalos if en_ciclo[clase] != negada]
+        return ClaseCaracteres(caracteres, intervalos).expresion(negada)
+
+    def es_final(self, estado: int) -> bool:
+        """
+        Indica si un estado es de aceptación consultando el mapa de bits.
+        
+        Args:
+            estado (int): Estado a consultar
+        
+        Returns:
+            bool: True si el estado es final
+        """
+        return bool(self.finales[estado >> 3] >> (estado & 7) & 1)
+
+    def acepta(self, cadena) -> bool:
+        """
+        Evalúa una cadena sobre la tabla sin imprimir el recorrido.
+        
+        Args:
+            cadena: Cadena a evaluar
+        
+        Returns:
+            bool: True si la cadena es aceptada
+        """
+        tabla, n_clases, clases = self.tabla, self.n_clases, self.clases
+        estado = self.estado_inicial
+        for simbolo in cadena:
+            clase = clases.get(simbolo)
+            if clase is None:
+                clase = clases[simbolo]
+            estado = tabla[estado * n_clases + clase]
+            if not estado:
+                return False
+        return self.es_final(estado)
+
+    def etiqueta(self, estado: int):
+        """
+        Obtiene la etiqueta original (subconjunto del AFND) de un estado.
+        
+        Args:
+            estado (int): Estado compilado
+        
+        Returns:
+            frozenset: Subconjunto de estados del AFND que representa
+        """
+        return self.etiquetas[estado]
+
+    def minimizar(self):
+        """
+        Minimiza el AFD mediante el refinamiento de particiones de Hopcroft.
+        
+        Proceso:
+        1. Partición inicial: estados no finales y finales, agrupados por tipo
+        2. Para cada bloque pendiente y cada clase de símbolos, se calculan
+           los predecesores del bloque y se dividen los bloques que quedan
+           parcialmente dentro de ese conjunto
+        3. Cada bloque final se convierte en un estado del nuevo AFD
+        
+        Returns:
+            AFDCompilado: Nuevo AFD mínimo equivalente. Su atributo
+            `estados_sin_minimizar` guarda el número de estados original
+        """
+        n_estados, n_clases, tabla = self.n_estados, self.n_clases, self.tabla
+        
+        # Transiciones inversas: inversas[clase][destino] = [origenes]
+        inversas = [[[] for _ in range(n_estados)] for _ in range(n_clases)]
+        for origen in range(n_estados):
+            base = origen * n_clases
+            for clase in range(n_clases):
+                inversas[clase][tabla[base + clase]].append(origen)
+        
+        # Partición inicial: un bloque por (es final, tipo de token)
+        grupos = {}
+        for estado in range(n_estados):
+            grupos.setdefault((self.es_final(estado), self.tipos[estado]), set()).add(estado)
+        particion = list(grupos.values())
+        bloque_de = [0] * n_estados
+        for indice, bloque in enumerate(particion):
+            for estado in bloque:
+                bloque_de[estado] = indice
+        pendientes = list(range(len(particion)))
+        en_pendientes = set(pendientes)
+        
+        while pendientes:
+            indice = pendientes.pop()
+            en_pendientes.discard(indice)
+            divisor = list(particion[indice])
+            for clase in range(n_clases):
+                # Estados que con esta clase entran al bloque divisor
+                predecesores = set()
+                for destino in divisor:
+                    predecesores.update(inversas[clase][destino])
+                if not predecesores:
+                    continue
+                
+                # Agrupar los predecesores por el bloque al que pertenecen
+                tocados = {}
+                for estado in predecesores:
+                    tocados.setdefault(bloque_de[estado], set()).add(estado)
+                
+                for afectado, dentro in tocados.items():
+                    bloque = particion[afectado]
+                    if len(dentro) == len(bloque):
+                        continue
+                    fuera = bloque - dentro
+                    particion[afectado] = dentro
+                    nuevo = len(particion)
+                    particion.append(fuera)
+                    for estado in fuera:
+                        bloque_de[estado] = nuevo
+                    if afectado in en_pendientes:
+                        pendientes.append(nuevo)
+                        en_pendientes.add(nuevo)
+                    else:
+                        menor = afectado if len(dentro) <= len(fuera) else nuevo
+                        pendientes.append(menor)
+                        en_pendientes.add(menor)
+        
+        # Si el lenguaje es vacío el estado inicial equivale al muerto;
+        # se separa para conservar la convención muerto = 0, inicial = 1
+        if bloque_de[self.estado_inicial] == bloque_de[self.ESTADO_MUERTO]:
+            particion[bloque_de[self.estado_inicial]].discard(self.estado_inicial)
+            bloque_de[self.estado_inicial] = len(particion)
+            particion.append({self.estado_inicial})
+        
+        return self._desde_particion(particion, bloque_de)
+
+    def _desde_particion(self, particion, bloque_de):
+        """
+        Construye el AFD cociente a partir de una partición de estados.
+        
+        Args:
+            particion: Lista de bloques (conjuntos de estados equivalentes)
+            bloque_de: Lista que asigna a cada estado el índice de su bloque
+        
+        Returns:
+            AFDCompilado: AFD con un estado por bloque, renumerado en BFS
+            (muerto = 0, inicial = 1) y con las clases de símbolos reagrupadas
+        """
+        n_clases = self.n_clases
+        
+        # Renumerar bloques: el del estado muerto es 0 y el inicial es 1
+        numeros = {bloque_de[self.ESTADO_MUERTO]: 0, bloque_de[self.estado_inicial]: 1}
+        orden = [bloque_de[self.estado_inicial]]
+        indice = 0
+        while indice < len(orden):
+            representante = next(iter(particion[orden[indice]]))
+            for clase in range(n_clases):
+                destino = bloque_de[self.tabla[representante * n_clases + clase]]
+                if destino not in numeros:
+                    numeros[destino] = len(numeros)
+                    orden.append(destino)
+            indice += 1
+        n_estados = len(numeros)
+        
+        # Columnas de la nueva tabla por clase antigua
+        representantes = [None] * n_estados
+        for bloque, numero in numeros.items():
+            representantes[numero] = next(iter(particion[bloque]))
+        columnas = [
+            tuple(
+                numeros[bloque_de[self.tabla[representante * n_clases + clase]]]
+                for representante in representantes
+            )
+            for clase in range(n_clases)
+        ]
+        
+        # Reagrupar clases que ahora son equivalentes (la 0 se conserva)
+        firmas = {columnas[self.CLASE_OTRO]: self.CLASE_OTRO}
+        nueva_clase = []
+        for firma in columnas:
+            if firma not in firmas:
+                firmas[firma] = len(firmas)
+            nueva_clase.append(firmas[firma])
+        
+        minimo = object.__new__(AFDCompilado)
+        minimo.n_estados = n_estados
+        minimo.n_clases = len(firmas)
+        minimo.estado_inicial = 1
+        minimo.clases = self.clases.reasignar(nueva_clase)
+        minimo.etiquetas = [frozenset()] * n_estados
+        for bloque, numero in numeros.items():
+            if numero != self.ESTADO_MUERTO:
+                minimo.etiquetas[numero] = frozenset().union(
+                    *(self.etiquetas[estado] for estado in particion[bloque])
+                )
+        minimo._llenar(firmas)
+        
+        minimo.finales = bytearray((n_estados + 7) // 8)
+        minimo.tipos = [self.tipos[representante] for representante in representantes]
+        for numero, representante in enumerate(representantes):
+            if self.es_final(representante):
+                minimo.finales[numero >> 3] |= 1 << (numero & 7)
+        
+        minimo.estados_sin_minimizar = self.n_estados
+        return minimo
+
+    def depurar(self):
+        """
+        Muestra la tabla compilada: clases de equivalencia, estados y transiciones.
+        """
+        print(f"Tabla compilada: {self.n_estados} estados x {self.n_clases} clases "
+              f"({len(self.tabla)} celdas, tipo '{self.tabla.typecode}')")
+        if self.estados_sin_minimizar is not None:
+            print(f"Minimizado (Hopcroft): {self.estados_sin_minimizar} -> {self.n_estados} estados")
+        miembros = {}
+        for simbolo, clase in self.clases.sueltos().items():
+            miembros.setdefault(clase, []).append(simbolo)
+        for inicio, fin, clase in self.clases.intervalos:
+            miembros.setdefault(clase, []).append(str(ClaseCaracteres.rango(inicio, fin)))
+        for clase in sorted(miembros):
+            print(f"Clase {clase}: {''.join(sorted(miembros[clase]))!r}")
+        for estado in range(1, self.n_estados):
+            fila = self.tabla[estado * self.n_clases:(estado + 1) * self.n_clases]
+            marca = '*' if self.es_final(estado) else ' '
+            tipo = f" [{self.tipos[estado]}]" if self.tipos[estado] else ''
+            print(f"{marca}{estado}: {list(fila)}{tipo}  <- {set(self.etiquetas[estado])}")
+
+
+def _orden_simbolo(simbolo):
+    """
+    Clave de orden de los símbolos al numerar las clases: primero los
+    símbolos sueltos y después las clases de caracteres.
+    """
+    if isinstance(simbolo, ClaseCaracteres):
+        return (True, simbolo.intervalos)
+    return (False, simbolo)
@@ -0,0 +1,382 @@
+"""
+Módulo que implementa un AFD perezoso sobre un AFND.
+Este módulo simula el AFND y materializa los estados y transiciones del AFD
+a medida que la entrada los visita, en lugar de ejecutar la construcción
+por subconjuntos completa, que en gramáticas grandes puede crecer
+exponencialmente aunque un código real solo recorra unos pocos estados.
+"""
+
+from collections import OrderedDict
+from .afd import TablaClases
+from .caracteres import ClaseCaracteres
+
+
+class EstadoPerezoso:
+    """
+    Estado materializado del AFD perezoso.
+
+    Atributos:
+        conjunto (frozenset): Estados del AFND (clausura epsilon incluida)
+        tipo: Tipo de token del estado, o None si no es final o no tiene tipo
+        final (bool): Si contiene algún estado final del AFND
+        siguientes (dict): Transiciones ya calculadas {clase: EstadoPerezoso}
+        entrantes (set): Pares (origen, clase) que llevan a este estado, para
+                         borrarlos cuando se desaloja
+    """
+
+    __slots__ = ('conjunto', 'tipo', 'final', 'siguientes', 'entrantes')
+
+    def __init__(self, conjunto: frozenset, tipo=None, final: bool = False):
+        self.conjunto = conjunto
+        self.tipo = tipo
+        self.final = final
+        self.siguientes = {}
+        self.entrantes = set()
+
+
+class AFDPerezoso:
+    """
+    AFD construido bajo demanda a partir de un AFND.
+
+    Características:
+    - Las clases de símbolos y las transiciones por clase de cada estado del
+      AFND se calculan una sola vez (ver AFND.salidas_por_clase); cada
+      transición del AFD se calcula la primera vez que la entrada la pide
+    - Caché acotada: como mucho `capacidad` estados materializados. Al
+      superarla se desaloja el usado hace más tiempo, junto con las
+      transiciones que llegan a él; el estado inicial y el muerto no se
+      desalojan
+    - Si la caché se agota (se desalojan `capacidad` estados habiendo
+      consumido menos de `caracteres_por_estado` caracteres por estado
+      nuevo), se vacía y se simula el AFND directamente, sin materializar,
+      durante los siguientes `capacidad * caracteres_por_estado` caracteres
+    - Contadores de aciertos, fallos, desalojos y simulaciones
+    """
+
+    # Estados materializados como máximo
+    CAPACIDAD = 4096
+
+    # Caracteres consumidos por estado nuevo por debajo de los cuales se
+    # considera que la caché no sirve
+    CARACTERES_POR_ESTADO = 10
+
+    def __init__(self, afnd, capacidad: int = None, caracteres_por_estado: int = None):
+        """
+        Prepara el AFD perezoso de un AFND sin construir ningún estado más
+        que el inicial.
+        
+        Args:
+            afnd (AFND): Autómata a simular; no debe modificarse después
+            capacidad (int): Estados materializados como máximo (al menos 2);
+                             por defecto CAPACIDAD
+            caracteres_por_estado (int): Umbral de agotamiento de la caché;
+                                         por defecto CARACTERES_POR_ESTADO
+        
+        Raises:
+            ValueError: Si la capacidad es menor que 2
+        """
+        self.capacidad = self.CAPACIDAD if capacidad is None else capacidad
+        self.caracteres_por_estado = (self.CARACTERES_POR_ESTADO if caracteres_por_estado is None
+                                      else caracteres_por_estado)
+        if self.capacidad < 2:
+            raise ValueError(f"La capacidad del AFD perezoso debe ser al menos 2, no {self.capacidad}")
+        self.afnd = afnd
+        
+        # Clases de símbolos: la 0 es la de los caracteres fuera del
+        # alfabeto (la del símbolo `otro`, o una sin transiciones)
+        miembros, salidas = afnd.salidas_por_clase()
+        otro = next((clase for clase, simbolos in enumerate(miembros) if afnd.otro in simbolos), None)
+        numeros = {otro: 0} if otro is not None else {}
+        for clase in range(len(miembros)):
+            if clase not in numeros:
+                numeros[clase] = len(numeros) + (otro is None)
+        self.n_clases = len(miembros) + (otro is None)
+        self.clases = TablaClases()
+        for clase, simbolos in enumerate(miembros):
+            for simbolo in simbolos:
+                if isinstance(simbolo, ClaseCaracteres):
+                    self.clases.agregar_intervalos(simbolo, numeros[clase])
+                elif simbolo != afnd.otro and numeros[clase]:
+                    self.clases[simbolo] = numeros[clase]
+        self._salidas = {
+            estado: {numeros[clase]: frozenset(destinos) for clase, destinos in por_clase.items()}
+            for estado, por_clase in salidas.items()
+        }
+        self._clausuras = {}
+        
+        self.muerto = EstadoPerezoso(frozenset())
+        self.inicial = self._nuevo_estado(self._clausura((afnd.estado_inicial,)))
+        self._estados = OrderedDict()
+        
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.simulaciones = 0
+        self.caracteres = 0
+        self._simular = 0
+        self._ventana = (0, 0)
+
+    def _clausura(self, estados) -> frozenset:
+        """
+        Args:
+            estados: Estados del AFND
+        
+        Returns:
+            frozenset: Su clausura epsilon, memorizada por estado del AFND
+        """
+        resultado = set()
+        for estado in estados:
+            clausura = self._clausuras.get(estado)
+            if clausura is None:
+                clausura = self._clausuras[estado] = frozenset(self.afnd.epsilon_clausura(estado))
+            resultado |= clausura
+        return frozenset(resultado)
+
+    def _paso(self, conjunto: frozenset, clase: int) -> frozenset:
+        """
+        Simula un paso del AFND.
+        
+        Args:
+            conjunto (frozenset): Estados actuales del AFND
+            clase (int): Clase del símbolo consumido
+        
+        Returns:
+            frozenset: Clausura epsilon de los estados alcanzados (vacía si
+                       no se alcanza ninguno)
+        """
+        alcanzados = set()
+        salidas = self._salidas
+        for estado in conjunto:
+            por_clase = salidas.get(estado)
+            if por_clase is not None:
+                destinos = por_clase.get(clase)
+                if destinos:
+                    alcanzados |= destinos
+        return self._clausura(alcanzados) if alcanzados else frozenset()
+
+    def _nuevo_estado(self, conjunto: frozenset) -> EstadoPerezoso:
+        """
+        Args:
+            conjunto (frozenset): Estados del AFND, con clausura epsilon
+        
+        Returns:
+            EstadoPerezoso: Estado (sin transiciones) con el tipo y la
+                            condición de final del conjunto
+        """
+        return EstadoPerezoso(
+            conjunto,
+            self.afnd.tipo_de(conjunto),
+            not conjunto.isdisjoint(self.afnd.estados_finales)
+        )
+
+    def _materializar(self, estado: EstadoPerezoso, clase: int) -> EstadoPerezoso:
+        """
+        Calcula y guarda una transición que no estaba en la caché.
+        
+        Args:
+            estado (EstadoPerezoso): Estado de origen
+            clase (int): Clase del símbolo consumido
+        
+        Returns:
+            EstadoPerezoso: Estado destino (self.muerto si no hay transición)
+        """
+        self.fallos += 1
+        conjunto = self._paso(estado.conjunto, clase)
+        if not conjunto:
+            destino = self.muerto
+        elif conjunto == self.inicial.conjunto:
+            destino = self.inicial
+        else:
+            destino = self._estados.get(conjunto)
+            if destino is None:
+                destino = self._nuevo_estado(conjunto)
+                self._estados[conjunto] = destino
+                if len(self._estados) > self.capacidad:
+                    self._desalojar()
+        estado.siguientes[clase] = destino
+        if destino is not self.muerto:
+            destino.entrantes.add((estado, clase))
+        return destino
+
+    def _desalojar(self):
+        """
+        Desaloja el estado usado hace más tiempo y las transiciones que
+        entran y salen de él, y detecta el agotamiento de la caché.
+        """
+        _, estado = self._estados.popitem(last=False)
+        self.desalojos += 1
+        for origen, clase in estado.entrantes:
+            if origen.siguientes.get(clase) is estado:
+                del origen.siguientes[clase]
+        for clase, destino in estado.siguientes.items():
+            destino.entrantes.discard((estado, clase))
+        estado.siguientes = {}
+        estado.entrantes = set()
+        
+        # Agotamiento: `capacidad` desalojos en pocos caracteres
+        desalojos, caracteres = self._ventana
+        if self.desalojos - desalojos >= self.capacidad:
+            if self.caracteres - caracteres < self.capacidad * self.caracteres_por_estado:
+                self.simulaciones += 1
+                self._simular = self.capacidad * self.caracteres_por_estado
+                self.vaciar_estados()
+            self._ventana = (self.desalojos, self.caracteres)
+
+    def vaciar_estados(self):
+        """
+        Descarta todos los estados materializados salvo el inicial y el muerto.
+        """
+        self._estados.clear()
+        self.inicial.siguientes = {}
+        self.inicial.entrantes = set()
+
+    def reconocer(self, texto: str, inicio: int):
+        """
+        Reconoce el lexema más largo de `texto` desde `inicio`.
+        
+        Args:
+            texto (str): Texto a recorrer
+            inicio (int): Posición desde donde reconocer
+        
+        Returns:
+            tuple: (tipo, fin, agotado), con el mismo significado que en
+            AnalizadorLexico._reconocer_afd
+        """
+        if self._simular > 0:
+            return self._reconocer_simulando(texto, inicio)
+        
+        clases = self.clases
+        estados = self._estados
+        muerto = self.muerto
+        estado = self.inicial
+        tipo = None
+        fin = inicio
+        fallos = self.fallos
+        indice = inicio
+        
+        for indice in range(inicio, len(texto)):
+            caracter = texto[indice]
+            clase = clases.get(caracter)
+            if clase is None:
+                clase = clases[caracter]
+            siguiente = estado.siguientes.get(clase)
+            if siguiente is None:
+                siguiente = self._materializar(estado, clase)
+            if siguiente is not estado and siguiente.conjunto in estados:
+                estados.move_to_end(siguiente.conjunto)
+            estado = siguiente
+            if estado is muerto:
+                self._contar(indice - inicio + 1, fallos)
+                return tipo, fin, False
+            if estado.tipo is not None:
+                tipo = estado.tipo
+                fin = indice + 1
+        self._contar(len(texto) - inicio, fallos)
+        return tipo, fin, True
+
+    def _contar(self, pasos: int, fallos: int):
+        """
+        Args:
+            pasos (int): Caracteres consumidos en un reconocimiento
+            fallos (int): Valor de self.fallos al empezarlo
+        """
+        self.caracteres += pasos
+        self.aciertos += pasos - (self.fallos - fallos)
+
+    def _reconocer_simulando(self, texto: str, inicio: int):
+        """
+        Reconoce como reconocer(), simulando el AFND sin la caché.
+        
+        Returns:
+            tuple: (tipo, fin, agotado)
+        """
+        clases = self.clases
+        conjunto = self.inicial.conjunto
+        tipo = None
+        fin = inicio
+        agotado = True
+        pasos = 0
+        for indice in range(inicio, len(texto)):
+            caracter = texto[indice]
+            clase = clases.get(caracter)
+            if clase is None:
+                clase = clases[caracter]
+            conjunto = self._paso(conjunto, clase)
+            pasos += 1
+            if not conjunto:
+                agotado = False
+                break
+            tipo_estado = self.afnd.tipo_de(conjunto)
+            if tipo_estado is not None:
+                tipo = tipo_estado
+                fin = indice + 1
+        self._simulados(pasos)
+        return tipo, fin, agotado
+
+    def _simulados(self, pasos: int):
+        """
+        Descuenta los caracteres simulados y, al agotar la cuota, vuelve a
+        usar la caché con una ventana de agotamiento nueva.
+        
+        Args:
+            pasos (int): Caracteres consumidos simulando el AFND
+        """
+        self.caracteres += pasos
+        self._simular -= pasos
+        if self._simular <= 0:
+            self._ventana = (self.desalojos, self.caracteres)
+
+    def acepta(self, cadena) -> bool:
+        """
+        Evalúa una cadena completa.
+        
+        Args:
+            cadena: Cadena a evaluar
+        
+        Returns:
+            bool: True si la cadena es aceptada
+        """
+        if self._simular > 0:
+            conjunto = self.inicial.conjunto
+            pasos = 0
+            for simbolo in cadena:
+                conjunto = self._paso(conjunto, self.clases[simbolo])
+                pasos += 1
+                if not conjunto:
+                    break
+            self._simulados(pasos)
+            return not conjunto.isdisjoint(self.afnd.estados_finales)
+        
+        estado = self.inicial
+        fallos = self.fallos
+        pasos = 0
+        for simbolo in cadena:
+            clase = self.clases[simbolo]
+            siguiente = estado.siguientes.get(clase)
+            if siguiente is None:
+                siguiente = self._materializar(estado, clase)
+            if siguiente is not estado and siguiente.conjunto in self._estados:
+                self._estados.move_to_end(siguiente.conjunto)
+            estado = siguiente
+            pasos += 1
+            if estado is self.muerto:
+                break
+        self._contar(pasos, fallos)
+        return estado.final
+
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            dict: Contadores 'aciertos' y 'fallos' (transiciones encontradas
+                  y calculadas), 'desalojos', 'simulaciones' (veces que se
+                  pasó a simular el AFND), 'caracteres' consumidos y
+                  'estados' materializados en este momento
+        """
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'simulaciones': self.simulaciones,
+            'caracteres': self.caracteres,
+            'estados': len(self._estados),
+        }
@@ -4,6 +4,10 @@ Este módulo proporciona la funcionalidad necesaria para crear, manipular
 y convertir AFNDs a AFDs para el análisis léxico.
 """
 
+import hashlib
+from .afd import AFDCompilado
+from .caracteres import ClaseCaracteres, particionar
+
 class AFND:
     """
     Clase que implementa un Autómata Finito No Determinista (AFND).
@@ -12,8 +16,20 @@ class AFND:
     - Múltiples estados posibles simultáneos
     - Transiciones con el mismo símbolo a diferentes estados
     - Transiciones epsilon (sin consumir símbolo)
+    - Transiciones con "cualquier otro símbolo" (todos salvo unos excluidos)
+    - Transiciones con una clase de caracteres (rangos e intervalos Unicode)
+    - Estados finales etiquetados con un tipo de token y una prioridad
+    
+    La construcción por subconjuntos y la compilación se memorizan por
+    huella del AFND: dos AFNDs con la misma definición comparten el mismo
+    AFD, y volver a compilar un AFND sin cambios no repite el trabajo.
     """
     
+    # AFDs ya calculados, compartidos por todas las instancias:
+    # huella -> resultado de convertir_a_afd, y (huella, minimizar) -> AFDCompilado
+    _subconjuntos = {}
+    _compilados = {}
+    
     def __init__(self):
         """
         Inicializa un nuevo AFND vacío.
@@ -25,6 +41,10 @@ class AFND:
         - estado_inicial: estado de inicio
         - estados_finales: conjunto de estados de aceptación
         - epsilon: símbolo para transiciones sin consumo
+        - otro: símbolo que representa a todo carácter fuera del alfabeto
+        - transiciones_excepto: transiciones con cualquier símbolo salvo excluidos
+        - transiciones_clase: transiciones con cualquier carácter de una ClaseCaracteres
+        - tipos_finales: tipo de token y prioridad de cada estado final
         """
         self.estados = set()
         self.alfabeto = set()
@@ -32,6 +52,10 @@ class AFND:
         self.estado_inicial = None
         self.estados_finales = set()
         self.epsilon = 'ε'
+        self.otro = 'OTRO'
+        self.transiciones_excepto = {}
+        self.transiciones_clase = {}
+        self.tipos_finales = {}
     
     def agregar_estado(self, estado):
         """
@@ -62,15 +86,20 @@ class AFND:
         self.estado_inicial = estado
         self.estados.add(estado)
     
-    def agregar_estado_final(self, estado):
+    def agregar_estado_final(self, estado, tipo=None, prioridad=0):
         """
         Agrega un estado al conjunto de estados finales.
         
         Args:
             estado: Identificador del estado a marcar como final
+            tipo: Tipo de token que reconoce el estado (opcional)
+            prioridad: Prioridad del tipo cuando un estado del AFD contiene
+                       finales de varios tipos (gana la mayor)
         """
         self.estados_finales.add(estado)
         self.estados.add(estado)
+        if tipo is not None:
+            self.tipos_finales[estado] = (prioridad, tipo)
     
     def agregar_transicion(self, estado_origen, simbolo, estado_destino):
         """
@@ -78,9 +107,22 @@ class AFND:
         
         Args:
             estado_origen: Estado desde donde parte la transición
-            simbolo: Símbolo que activa la transición
+            simbolo: Símbolo que activa la transición. También puede ser una
+                     ClaseCaracteres o un rango (desde, hasta) de caracteres,
+                     que se guardan como intervalos en transiciones_clase
+                     sin agregar cada carácter al alfabeto
             estado_destino: Estado al que se llega con la transición
         """
+        if isinstance(simbolo, tuple):
+            simbolo = ClaseCaracteres.rango(*simbolo)
+        if isinstance(simbolo, ClaseCaracteres):
+            self.estados.add(estado_origen)
+            self.estados.add(estado_destino)
+            salidas = self.transiciones_clase.setdefault(estado_origen, [])
+            if (simbolo, estado_destino) not in salidas:
+                salidas.append((simbolo, estado_destino))
+            return
+        
         # Agregar el símbolo al alfabeto
         self.agregar_simbolo(simbolo)
         
@@ -92,6 +134,28 @@ class AFND:
         if (estado_origen, simbolo) not in self.transiciones:
             self.transiciones[(estado_origen, simbolo)] = set()
         self.transiciones[(estado_origen, simbolo)].add(estado_destino)
+
+    def agregar_transicion_excepto(self, estado_origen, excluidos, estado_destino):
+        """
+        Agrega una transición con cualquier símbolo salvo los excluidos.
+        
+        Args:
+            estado_origen: Estado desde donde parte la transición
+            excluidos: Símbolos que NO activan la transición
+            estado_destino: Estado al que se llega con la transición
+        
+        Los símbolos excluidos se agregan al alfabeto para que el AFD los
+        distinga, y el símbolo `otro` representa a todos los caracteres que
+        no aparecen en el alfabeto.
+        """
+        for simbolo in excluidos:
+            self.agregar_simbolo(simbolo)
+        self.agregar_simbolo(self.otro)
+        self.estados.add(estado_origen)
+        self.estados.add(estado_destino)
+        self.transiciones_excepto.setdefault(estado_origen, []).append(
+            (frozenset(excluidos), estado_destino)
+        )
     
     def epsilon_clausura(self, estados):
         """
@@ -134,22 +198,126 @@ class AFND:
         for estado in estados:
             if (estado, simbolo) in self.transiciones:
                 resultado.update(self.transiciones[(estado, simbolo)])
+            for excluidos, destino in self.transiciones_excepto.get(estado, ()):
+                if simbolo not in excluidos:
+                    resultado.add(destino)
+            for clase, destino in self.transiciones_clase.get(estado, ()):
+                if simbolo in clase:
+                    resultado.add(destino)
         return resultado
+
+    def tipo_de(self, estados):
+        """
+        Determina el tipo de token reconocido por un conjunto de estados.
+        
+        Args:
+            estados: Conjunto de estados del AFND (un estado del AFD)
+        
+        Returns:
+            El tipo del estado final etiquetado de mayor prioridad,
+            o None si ningún estado final del conjunto tiene tipo
+        """
+        etiquetas = [self.tipos_finales[e] for e in estados if e in self.tipos_finales]
+        if not etiquetas:
+            return None
+        return max(etiquetas, key=lambda etiqueta: etiqueta[0])[1]
     
+    def huella(self) -> str:
+        """
+        Identifica la definición del AFND.
+        
+        Returns:
+            str: Hash SHA-256 (hexadecimal) de los estados, el alfabeto, las
+            transiciones, el estado inicial, los estados finales y sus tipos.
+            Dos AFNDs con la misma huella producen el mismo AFD
+        """
+        ordenar = lambda elementos: sorted(elementos, key=repr)
+        definicion = repr((
+            ordenar(self.estados),
+            ordenar(self.alfabeto),
+            ordenar((clave, ordenar(destinos)) for clave, destinos in self.transiciones.items()),
+            self.estado_inicial,
+            ordenar(self.estados_finales),
+            self.epsilon,
+            self.otro,
+            ordenar((estado, ordenar((ordenar(excluidos), destino) for excluidos, destino in salidas))
+                    for estado, salidas in self.transiciones_excepto.items()),
+            ordenar((estado, ordenar(salidas)) for estado, salidas in self.transiciones_clase.items()),
+            ordenar(self.tipos_finales.items()),
+        ))
+        return hashlib.sha256(definicion.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def vaciar_cache(cls):
+        """
+        Descarta los AFDs memorizados de todas las instancias.
+        """
+        cls._subconjuntos.clear()
+        cls._compilados.clear()
+
     def convertir_a_afd(self):
         """
         Convierte el AFND a un Autómata Finito Determinista (AFD).
         
         Returns:
-            tuple: (estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd)
+            tuple: (estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd).
+            El resultado se memoriza por huella y se comparte entre llamadas,
+            por lo que no debe modificarse
             
         El proceso utiliza el algoritmo de construcción por subconjuntos:
         1. Obtener estado inicial del AFD mediante clausura epsilon
         2. Procesar estados nuevos y sus transiciones
         3. Identificar estados finales del AFD
         """
+        return self._convertir_memorizado(self.huella())
+
+    def _convertir_memorizado(self, huella: str):
+        """
+        Args:
+            huella (str): Huella del AFND, ya calculada
+        
+        Returns:
+            tuple: El resultado memorizado de convertir_a_afd
+        """
+        afd = self._subconjuntos.get(huella)
+        if afd is None:
+            afd = self._subconjuntos[huella] = self._construir_subconjuntos()
+        return afd
+
+    def _construir_subconjuntos(self):
+        """
+        Ejecuta la construcción por subconjuntos (ver convertir_a_afd).
+        
+        Returns:
+            tuple: (estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd)
+        
+        En lugar de probar cada símbolo del alfabeto con mover desde cada
+        estado del AFD:
+        - Los símbolos se agrupan en clases: dos símbolos con las mismas
+          transiciones desde todos los estados del AFND y excluidos de las
+          mismas transiciones "excepto" se comportan igual, así que cada
+          clase se calcula una vez y se asigna a todos sus símbolos. Los
+          intervalos de las transiciones por clase de caracteres se parten
+          en piezas disjuntas que se agrupan de la misma forma
+        - Desde cada estado del AFD se recorren solo las transiciones que
+          salen de sus estados del AFND, con las "excepto" ya repartidas
+          entre las clases (ver salidas_por_clase)
+        - La clausura epsilon de cada estado del AFND se calcula una sola vez
+        """
+        miembros, salidas = self.salidas_por_clase()
+        
+        clausuras = {}
+        
+        def clausura(estados):
+            resultado = set()
+            for estado in estados:
+                if estado not in clausuras:
+                    clausuras[estado] = frozenset(self.epsilon_clausura(estado))
+                resultado |= clausuras[estado]
+            return frozenset(resultado)
+        
         # Obtener el estado inicial del AFD
-        estado_inicial_afd = frozenset(self.epsilon_clausura(self.estado_inicial))
+        estado_inicial_afd = clausura((self.estado_inicial,))
         estados_afd = {estado_inicial_afd}
         estados_por_procesar = [estado_inicial_afd]
         transiciones_afd = {}
@@ -157,34 +325,156 @@ class AFND:
         
         # Si el estado inicial contiene algún estado final del AFND,
         # entonces es un estado final en el AFD
-        if any(estado in self.estados_finales for estado in estado_inicial_afd):
+        if not estado_inicial_afd.isdisjoint(self.estados_finales):
             estados_finales_afd.add(estado_inicial_afd)
         
         while estados_por_procesar:
             estado_actual = estados_por_procesar.pop()
             
-            for simbolo in self.alfabeto:
-                # Calcular el siguiente estado usando mover y epsilon-clausura
-                siguiente = set()
-                for estado in estado_actual:
-                    siguiente.update(self.mover(estado, simbolo))
-                siguiente = frozenset(self.epsilon_clausura(siguiente))
+            # Estados del AFND alcanzables con cada clase
+            por_clase = {}
+            for estado in estado_actual:
+                for clase, destinos in salidas.get(estado, {}).items():
+                    por_clase.setdefault(clase, set()).update(destinos)
+            
+            for clase, alcanzados in por_clase.items():
+                siguiente = clausura(alcanzados)
+                if not siguiente:
+                    continue
                 
-                if siguiente:
-                    # Agregar la transición al AFD
+                # Agregar la transición al AFD para todos los símbolos de la clase
+                for simbolo in miembros[clase]:
                     transiciones_afd[(estado_actual, simbolo)] = siguiente
-                    
-                    # Si es un nuevo estado, agregarlo a la lista de estados por procesar
-                    if siguiente not in estados_afd:
-                        estados_afd.add(siguiente)
-                        estados_por_procesar.append(siguiente)
+                
+                # Si es un nuevo estado, agregarlo a la lista de estados por procesar
+                if siguiente not in estados_afd:
+                    estados_afd.add(siguiente)
+                    estados_por_procesar.append(siguiente)
                     
                     # Verificar si es un estado final
-                    if any(estado in self.estados_finales for estado in siguiente):
+                    if not siguiente.isdisjoint(self.estados_finales):
                         estados_finales_afd.add(siguiente)
         
         return estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd
 
+    def salidas_por_clase(self):
+        """
+        Agrupa las transiciones del AFND por clase de símbolos.
+        
+        Returns:
+            tuple: (miembros, salidas). `miembros[clase]` es la lista de
+            símbolos de cada clase (ver _clases_de_simbolos) y `salidas` el
+            diccionario {estado: {clase: destinos}} con los estados a los que
+            se llega desde cada estado del AFND consumiendo un símbolo de la
+            clase, sin clausura epsilon. Las transiciones "excepto" ya están
+            repartidas entre las clases que no excluyen
+        """
+        miembros, firmas = self._clases_de_simbolos()
+        salidas = {}
+        for clase, (transiciones, exclusiones, cubiertas) in enumerate(firmas):
+            for estado, destinos in transiciones:
+                salidas.setdefault(estado, {}).setdefault(clase, set()).update(destinos)
+            for estado, _, destino in cubiertas:
+                salidas.setdefault(estado, {}).setdefault(clase, set()).add(destino)
+            for estado, lista in self.transiciones_excepto.items():
+                for excluidos, destino in lista:
+                    if (estado, excluidos, destino) not in exclusiones:
+                        salidas.setdefault(estado, {}).setdefault(clase, set()).add(destino)
+        return miembros, salidas
+
+    def _clases_de_simbolos(self):
+        """
+        Agrupa los símbolos que el AFND no distingue.
+        
+        Returns:
+            tuple: (miembros, firmas): los símbolos de cada clase y la firma
+            común a todos ellos. La firma es una tupla con el conjunto de
+            transiciones (origen, destinos) del símbolo, el de transiciones
+            "excepto" (origen, excluidos, destino) que lo excluyen y el de
+            transiciones por clase de caracteres (origen, clase, destino)
+            que lo contienen
+        
+        Los símbolos son los del alfabeto y, si hay transiciones por clase
+        de caracteres, una ClaseCaracteres por cada grupo de piezas de sus
+        intervalos (sin los caracteres del alfabeto) con la misma firma. Los
+        símbolos sin transiciones propias forman una sola clase.
+        """
+        transiciones = {}
+        for (estado, simbolo), destinos in self.transiciones.items():
+            if simbolo != self.epsilon:
+                transiciones.setdefault(simbolo, set()).add((estado, frozenset(destinos)))
+        exclusiones = {}
+        for estado, lista in self.transiciones_excepto.items():
+            for excluidos, destino in lista:
+                for simbolo in excluidos:
+                    exclusiones.setdefault(simbolo, set()).add((estado, excluidos, destino))
+        
+        # Partir los intervalos de las clases de caracteres, separando los
+        # caracteres del alfabeto, que ya se tratan uno a uno
+        cubiertas = {}
+        piezas = []
+        if self.transiciones_clase:
+            sueltos = {ord(simbolo): simbolo for simbolo in self.alfabeto
+                       if isinstance(simbolo, str) and len(simbolo) == 1}
+            piezas, cubiertos = particionar(
+                ((clase, (estado, clase, destino))
+                 for estado, lista in self.transiciones_clase.items()
+                 for clase, destino in lista),
+                sueltos
+            )
+            cubiertas = {sueltos[punto]: etiquetas for punto, etiquetas in cubiertos.items()}
+        
+        vacio = frozenset()
+        firmas = {}
+        miembros = []
+        
+        def agregar(simbolo, firma):
+            if firma not in firmas:
+                firmas[firma] = len(miembros)
+                miembros.append([])
+            miembros[firmas[firma]].append(simbolo)
+        
+        for simbolo in self.alfabeto:
+            agregar(simbolo, (
+                frozenset(transiciones.get(simbolo, vacio)),
+                frozenset(exclusiones.get(simbolo, vacio)),
+                cubiertas.get(simbolo, vacio),
+            ))
+        por_etiquetas = {}
+        for inicio, fin, etiquetas in piezas:
+            por_etiquetas.setdefault(etiquetas, []).append((inicio, fin))
+        for etiquetas, intervalos in por_etiquetas.items():
+            agregar(ClaseCaracteres(intervalos=intervalos), (vacio, vacio, etiquetas))
+        return miembros, list(firmas)
+
+    def compilar(self, minimizar=False):
+        """
+        Convierte el AFND a un AFD y lo compila a una tabla densa de enteros.
+        
+        Args:
+            minimizar: Si es True, aplica la minimización de Hopcroft
+                       después de la construcción por subconjuntos
+        
+        Returns:
+            AFDCompilado: AFD con estados numerados, clases de símbolos y
+            tabla de transiciones plana, que conserva las etiquetas originales
+            y el tipo de token de cada estado. Se memoriza por huella y se
+            comparte entre AFNDs con la misma definición
+        """
+        huella = self.huella()
+        afd = self._compilados.get((huella, minimizar))
+        if afd is not None:
+            return afd
+        
+        estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd = self._convertir_memorizado(huella)
+        tipos = {estado: self.tipo_de(estado) for estado in estados_finales_afd}
+        afd = AFDCompilado(estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd,
+                           tipos=tipos, otro=self.otro, alfabeto=self.alfabeto)
+        if minimizar:
+            afd = afd.minimizar()
+        self._compilados[(huella, minimizar)] = afd
+        return afd
+
     def depurar_afnd(self):
         """
         Muestra información detallada sobre el AFND y su conversión a AFD.
@@ -205,6 +495,14 @@ class AFND:
         print("\nTransiciones:")
         for (estado, simbolo), destinos in self.transiciones.items():
             print(f"{estado} --{simbolo}--> {destinos}")
+        for estado, salidas in self.transiciones_excepto.items():
+            for excluidos, destino in salidas:
+                print(f"{estado} --[^{''.join(sorted(excluidos))}]--> {destino}")
+        for estado, salidas in self.transiciones_clase.items():
+            for clase, destino in salidas:
+                print(f"{estado} --{clase}--> {destino}")
+        if self.tipos_finales:
+            print(f"Tipos de los estados finales: {self.tipos_finales}")
             
         print("\n=== Conversión a AFD ===")
         afd = self.convertir_a_afd()
@@ -216,6 +514,9 @@ class AFND:
         print("\nTransiciones AFD:")
         for (estado, simbolo), destino in transiciones_afd.items():
             print(f"{estado} --{simbolo}--> {destino}")
+        
+        print("\n=== AFD compilado ===")
+        AFDCompilado(*afd).depurar()
             
     def probar_cadena(self, cadena):
         """
@@ -233,23 +534,23 @@ class AFND:
         - Estado final
         - Resultado de la evaluación
         """
-        afd = self.convertir_a_afd()
-        estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd = afd
+        afd = self.compilar()
         
-        estado_actual = estado_inicial_afd
+        estado_actual = afd.estado_inicial
         print(f"\nProbando cadena: '{cadena}'")
-        print(f"Estado inicial: {estado_actual}")
+        print(f"Estado inicial: {afd.etiqueta(estado_actual)}")
         
         for simbolo in cadena:
-            if (estado_actual, simbolo) in transiciones_afd:
+            siguiente = afd.siguiente(estado_actual, simbolo)
+            if siguiente != AFDCompilado.ESTADO_MUERTO:
                 estado_anterior = estado_actual
-                estado_actual = transiciones_afd[(estado_actual, simbolo)]
-                print(f"{estado_anterior} --{simbolo}--> {estado_actual}")
+                estado_actual = siguiente
+                print(f"{afd.etiqueta(estado_anterior)} --{simbolo}--> {afd.etiqueta(estado_actual)}")
             else:
-                print(f"Rechazada: No hay transición desde {estado_actual} con '{simbolo}'")
+                print(f"Rechazada: No hay transición desde {afd.etiqueta(estado_actual)} con '{simbolo}'")
                 return False
         
-        aceptada = estado_actual in estados_finales_afd
-        print(f"Estado final: {estado_actual}")
+        aceptada = afd.es_final(estado_actual)
+        print(f"Estado final: {afd.etiqueta(estado_actual)}")
         print(f"Cadena {'aceptada' if aceptada else 'rechazada'}")
-        return aceptada 
\ No newline at end of file
+        return aceptada
\ No newline at end of file
@@ -4,8 +4,26 @@ Este módulo implementa un analizador léxico que reconoce tokens del lenguaje K
 utilizando Autómatas Finitos Deterministas (AFD) y No Deterministas (AFND).
 """
 
-from .token import Token
+import codecs
+import hashlib
+from array import array
+from bisect import bisect_left
+import mmap as mmap_modulo
+import os
+import pickle
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from .token import Token, TokenArray, TipoToken, IndiceLineas, ResultadoIncremental
 from .afnd import AFND
+from .afd import AFDCompilado
+from .afd_perezoso import AFDPerezoso
+from .expresiones import afnd_desde_expresion, afnd_desde_tabla, escapar_clase
+from .generador import cargar_escaner, generar_escaner
+from .perfilado import PerfilAnalisis
 
 class AnalizadorLexico:
     """
@@ -20,38 +38,172 @@ class AnalizadorLexico:
     - Procesar cadenas de texto
     - Manejar comentarios de línea (//) y de bloque (/* */)
     
-    El analizador utiliza AFNDs convertidos a AFDs para el reconocimiento
-    de patrones complejos como identificadores y números.
+    Todos los patrones se reúnen en un único AFND cuyos estados finales
+    están etiquetados con el tipo de token; se convierte una vez a un AFD
+    compilado que se recorre con la regla del máximo alcance.
     """
     
-    def __init__(self):
+    # Motores de reconocimiento disponibles
+    BACKENDS = ('afd', 'regex', 'perezoso', 'generado')
+    
+    # Cantidad de tokens entre avisos de progreso del análisis incremental
+    PASO_PROGRESO = 2048
+    
+    # Versión del comportamiento del analizador. Forma parte de la huella,
+    # así que cambiarla invalida los resultados guardados en caché
+    VERSION = 2
+    
+    # Autómatas ya construidos, compartidos por todas las instancias:
+    # (huella, minimizar) -> (afnd_identificador, afnd_numero, afnd_lexico,
+    #                         afd_identificador, afd_numero, afd_lexico)
+    _automatas = {}
+    
+    # Escáneres generados y cargados: (huella, minimizar) -> módulo
+    _escaneres = {}
+
+    def __init__(self, minimizar: bool = False, backend: str = 'afd', cache_afd=None, perfilar: bool = False):
         """
         Inicializa el analizador léxico con sus conjuntos de caracteres y palabras reservadas.
         
+        Args:
+            minimizar (bool): Si es True, los AFDs se minimizan con el
+                              algoritmo de Hopcroft después de construirlos
+            backend (str): Motor que reconoce cada token:
+                           - 'afd': recorre el AFD unificado (por defecto)
+                           - 'regex': usa un único patrón `re` con grupos
+                             con nombre, uno por tipo de estado final
+                           - 'perezoso': recorre un AFDPerezoso sobre el
+                             AFND unificado, que materializa solo los
+                             estados que visita el código
+                           - 'generado': usa un escáner de Python generado
+                             a partir del AFD unificado (ver generador.py)
+            cache_afd: Directorio donde guardar y buscar los autómatas
+                       compilados entre ejecuciones, o None para
+                       memorizarlos solo en el proceso actual
+            perfilar (bool): Si es True se activa el modo de perfilado
+                             (ver activar_perfilado)
+        
+        Raises:
+            ValueError: Si el backend no es uno de BACKENDS
+        
         Define:
         - Conjunto de palabras reservadas de Kotlin
         - Conjuntos de caracteres válidos (letras, dígitos, operadores, delimitadores)
-        - Estado inicial del analizador (posición, línea, columna)
+        - Estado inicial del analizador (posición e índice de líneas)
         - Inicializa los AFNDs para identificadores y números
         """
-        # Conjunto de palabras reservadas
-        self.palabras_reservadas = {'fun', 'val', 'var', 'if', 'else', 'when', 'Int', 'Double', 'String', 'return'}
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend desconocido '{backend}', se esperaba uno de {self.BACKENDS}")
+        
+        # Palabras clave de Kotlin: duras (reservadas), suaves y modificadores.
+        # Int, Double y String no son palabras clave de Kotlin, pero este
+        # analizador siempre las trató como reservadas
+        self.palabras_reservadas = {
+            'as', 'break', 'class', 'continue', 'do', 'else', 'false', 'for', 'fun', 'if', 'in',
+            'interface', 'is', 'null', 'object', 'package', 'return', 'super', 'this', 'throw',
+            'true', 'try', 'typealias', 'typeof', 'val', 'var', 'when', 'while',
+            'Int', 'Double', 'String',
+        }
+        self.palabras_suaves = {
+            'by', 'catch', 'constructor', 'delegate', 'dynamic', 'field', 'file', 'finally', 'get',
+            'import', 'init', 'param', 'property', 'receiver', 'set', 'setparam', 'value', 'where',
+        }
+        self.modificadores = {
+            'abstract', 'actual', 'annotation', 'companion', 'const', 'crossinline', 'data', 'enum',
+            'expect', 'external', 'final', 'infix', 'inline', 'inner', 'internal', 'lateinit',
+            'noinline', 'open', 'operator', 'out', 'override', 'private', 'protected', 'public',
+            'reified', 'sealed', 'suspend', 'tailrec', 'vararg',
+        }
+        
+        # Tipo de cada palabra clave, para clasificar un identificador con una
+        # sola búsqueda en lugar de consultar los tres conjuntos
+        self._palabras_clave = dict.fromkeys(self.modificadores, TipoToken.MODIFICADOR)
+        self._palabras_clave.update(dict.fromkeys(self.palabras_suaves, TipoToken.PALABRA_CLAVE_SUAVE))
+        self._palabras_clave.update(dict.fromkeys(self.palabras_reservadas, TipoToken.PALABRA_RESERVADA))
         
         # Conjuntos de caracteres
         self.letras = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
         self.digitos = set('0123456789')
+        self.espacios = set('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003'
+                            '\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
         self.operadores = {'+', '-', '*', '/', '%', '=', '<', '>', '!', '&', '|'}
+        self.operadores_dobles = ['==', '!=', '<=', '>=', '&&', '||', '++', '--']
+        self.operadores_invalidos = {
+            '=<': "Operador inválido '=<', ¿querías decir '<='?",
+            '+*': "Operadores juntos inválidos '+*'",
+            '*+': "Operadores juntos inválidos '*+'",
+            '+-': "Operadores juntos inválidos '+-'",
+            '-+': "Operadores juntos inválidos '-+'",
+            '>>>': "Operador '>>>' no existe en Kotlin",
+        }
         self.delimitadores = {'(', ')', '{', '}', ',', ';', ':'}
         
         # Estado del analizador
         self.posicion = 0
-        self.linea = 1
-        self.columna = 1
         self.codigo = ""
+        self.lineas = IndiceLineas(self.codigo)
         self.tokens = []
+        self.columnar = False
         
         # Inicializar AFNDs
+        self.minimizar = minimizar
+        self.cache_afd = None if cache_afd is None else os.fspath(cache_afd)
         self._inicializar_afnds()
+        
+        # Patrón maestro equivalente para el backend 'regex'. El margen es el
+        # lookahead que puede necesitar una alternativa más larga que la
+        # elegida (p. ej. '>>>' frente a '>'): el operador más largo menos uno
+        self.patron_maestro = self._construir_patron_maestro()
+        self.margen_regex = max(len(op) for op in list(self.operadores_invalidos) + self.operadores_dobles) - 1
+        self.backend = backend
+        if backend == 'regex':
+            self._reconocer = self._reconocer_regex
+        elif backend == 'perezoso':
+            self.afd_perezoso = AFDPerezoso(self.afnd_lexico)
+            self._reconocer = self._reconocer_perezoso
+        elif backend == 'generado':
+            self.escaner = self._cargar_escaner()
+            self._codigo_generado = None
+            self._clases_generadas = b''
+            self._reconocer = self._reconocer_generado
+        else:
+            self._reconocer = self._reconocer_afd
+        
+        # Mediciones del modo de perfilado, o None si está desactivado
+        self.perfil = None
+        if perfilar:
+            self.activar_perfilado()
+
+    def huella(self) -> str:
+        """
+        Identifica la gramática y la versión del analizador.
+        
+        Returns:
+            str: Hash SHA-256 (hexadecimal) de VERSION y de la definición de
+            la gramática: palabras reservadas, conjuntos de caracteres,
+            operadores, delimitadores y las expresiones regulares de las que
+            se construyen los autómatas (tabla_patrones y las de
+            identificadores y números). Dos analizadores con la misma huella
+            producen los mismos tokens; el backend y la minimización no
+            cambian el resultado y no forman parte de ella
+        """
+        definicion = repr((
+            self.VERSION,
+            sorted(self.palabras_reservadas),
+            sorted(self.palabras_suaves),
+            sorted(self.modificadores),
+            sorted(self.letras),
+            sorted(self.digitos),
+            sorted(self.espacios),
+            sorted(self.operadores),
+            self.operadores_dobles,
+            sorted(self.operadores_invalidos.items()),
+            sorted(self.delimitadores),
+            self._expresion_identificador(),
+            self._expresion_numero(),
+            self.tabla_patrones(),
+        ))
+        return hashlib.sha256(definicion.encode('utf-8')).hexdigest()
 
     def _inicializar_afnds(self):
         """
@@ -60,8 +212,68 @@ class AnalizadorLexico:
         Crea y configura:
         - AFND para identificadores: reconoce patrones (letra|_)(letra|digito|_)*
         - AFND para números: reconoce patrones digito+(.digito+)?
+        - AFND léxico unificado con todos los patrones del lenguaje
+        
+        Los AFNDs son convertidos a AFDs y compilados a tablas de transiciones
+        densas (ver AFDCompilado). El AFD unificado es el que recorre el
+        análisis; los de identificadores y números se conservan para las
+        pruebas de probar_afnd.
+        
+        Los autómatas se construyen una sola vez por huella y minimización y
+        se comparten, sin modificarse, entre las instancias del proceso. Con
+        cache_afd se buscan además en disco antes de construirlos.
+        """
+        clave = (self.huella(), self.minimizar)
+        automatas = self._automatas.get(clave)
+        if automatas is None and self.cache_afd is not None:
+            automatas = self._cargar_automatas(clave)
+        if automatas is None:
+            automatas = self._construir_automatas()
+            if self.cache_afd is not None:
+                self._guardar_automatas(clave, automatas)
+        self._automatas[clave] = automatas
+        (self.afnd_identificador, self.afnd_numero, self.afnd_lexico,
+         self.afd_identificador, self.afd_numero, self.afd_lexico) = automatas
+        
+        # Clase de cada byte ASCII, para recorrer el AFD sobre UTF-8
+        self.clases_ascii = [self.afd_lexico.clase(chr(byte)) for byte in range(128)]
+        
+        # Tramos que se consumen de una vez con `re` en lugar de carácter por
+        # carácter: en cada estado del AFD con ciclo (cuerpos de comentarios
+        # y cadenas, identificadores...) y las secuencias de espacios
+        self._tramos = [None] * self.afd_lexico.n_estados
+        for estado in range(1, self.afd_lexico.n_estados):
+            expresion = self.afd_lexico.expresion_ciclo(estado)
+            if expresion is not None:
+                self._tramos[estado] = re.compile(expresion + '+').match
+        self._tramo_espacios = re.compile(escapar_clase(self.espacios) + '+').match
+        
+        # Acción asociada a cada tipo de estado final del AFD unificado
+        self._acciones = {
+            'ESPACIO': self._analizar_espacio,
+            'COMENTARIO_LINEA': self._analizar_comentario,
+            'COMENTARIO_BLOQUE': self._analizar_comentario,
+            'COMENTARIO_SIN_CERRAR': self._analizar_comentario,
+            'IDENTIFICADOR': self._analizar_identificador,
+            'NUMERO_NATURAL': self._analizar_numero,
+            'NUMERO_REAL': self._analizar_numero,
+            'NUMERO_INVALIDO': self._analizar_numero,
+            'OPERADOR': self._analizar_operador,
+            'OPERADOR_INVALIDO': self._analizar_operador,
+            'DELIMITADOR': self._analizar_delimitador,
+            'CADENA': self._analizar_cadena,
+            'CADENA_SIN_CERRAR': self._analizar_cadena,
+            'CADENA_INCOMPLETA': self._analizar_cadena,
+            'ESCAPE_FINAL': self._analizar_cadena,
+        }
+
+    def _construir_automatas(self) -> tuple:
+        """
+        Construye los AFNDs de la gramática y los compila.
         
-        Los AFNDs son convertidos a AFDs para su uso en el análisis.
+        Returns:
+            tuple: (afnd_identificador, afnd_numero, afnd_lexico,
+                    afd_identificador, afd_numero, afd_lexico)
         """
         # AFND para identificadores
         self.afnd_identificador = AFND()
@@ -71,231 +283,1040 @@ class AnalizadorLexico:
         self.afnd_numero = AFND()
         self._construir_afnd_numero()
         
-        # Convertir AFNDs a AFDs para su uso
-        self.afd_identificador = self.afnd_identificador.convertir_a_afd()
-        self.afd_numero = self.afnd_numero.convertir_a_afd()
+        # AFND unificado con todos los patrones
+        self.afnd_lexico = AFND()
+        self._construir_afnd_lexico()
+        
+        return (
+            self.afnd_identificador, self.afnd_numero, self.afnd_lexico,
+            self.afnd_identificador.compilar(self.minimizar),
+            self.afnd_numero.compilar(self.minimizar),
+            self.afnd_lexico.compilar(self.minimizar),
+        )
+
+    def _ruta_automatas(self, clave: tuple) -> str:
+        """
+        Args:
+            clave (tuple): (huella, minimizar)
+        
+        Returns:
+            str: Ruta del archivo de cache_afd para esa clave; incluye
+                 AFDCompilado.FORMATO para no leer representaciones viejas
+        """
+        huella, minimizar = clave
+        nombre = f"automatas-{huella}-{'min' if minimizar else 'afd'}-f{AFDCompilado.FORMATO}.pickle"
+        return os.path.join(self.cache_afd, nombre)
+
+    def _cargar_automatas(self, clave: tuple):
+        """
+        Lee los autómatas guardados en cache_afd.
+        
+        Args:
+            clave (tuple): (huella, minimizar)
+        
+        Returns:
+            tuple | None: Los autómatas, o None si no están o no se pueden leer
+        
+        El archivo se lee con pickle: cache_afd debe ser un directorio en el
+        que solo escriba el propio usuario.
+        """
+        try:
+            with open(self._ruta_automatas(clave), 'rb') as archivo:
+                automatas = pickle.load(archivo)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+            return None
+        if not isinstance(automatas, tuple) or len(automatas) != 6:
+            return None
+        return automatas
+
+    def _guardar_automatas(self, clave: tuple, automatas: tuple):
+        """
+        Guarda los autómatas en cache_afd de forma atómica (archivo temporal
+        y os.replace), de modo que varios procesos pueden compartir el
+        directorio. Un fallo de escritura no impide seguir con el análisis.
+        
+        Args:
+            clave (tuple): (huella, minimizar)
+            automatas (tuple): Resultado de _construir_automatas
+        """
+        ruta = self._ruta_automatas(clave)
+        temporal = None
+        try:
+            os.makedirs(self.cache_afd, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=self.cache_afd, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as archivo:
+                pickle.dump(automatas, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta)
+        except OSError:
+            if temporal is not None:
+                try:
+                    os.remove(temporal)
+                except OSError:
+                    pass
+
 
     def _construir_afnd_identificador(self):
         """
         Construye el AFND para reconocer identificadores válidos en Kotlin.
         
-        Patrón reconocido: (letra|_)(letra|digito|_)*
-        Estados:
-        - q0: Estado inicial
-        - q1: Estado final (identificador válido)
-        
-        Transiciones:
-        - De q0 a q1: letras y guión bajo
-        - De q1 a q1: letras, dígitos y guión bajo
-        """
-        self.afnd_identificador.establecer_estado_inicial('q0')
-        self.afnd_identificador.agregar_estado_final('q1')
-        
-        # Agregar transiciones para la primera letra o guión bajo
-        for letra in self.letras:
-            self.afnd_identificador.agregar_transicion('q0', letra, 'q1')
-        self.afnd_identificador.agregar_transicion('q0', '_', 'q1')
-        
-        # Agregar transiciones para el resto del identificador
-        for letra in self.letras:
-            self.afnd_identificador.agregar_transicion('q1', letra, 'q1')
-        for digito in self.digitos:
-            self.afnd_identificador.agregar_transicion('q1', digito, 'q1')
-        self.afnd_identificador.agregar_transicion('q1', '_', 'q1')
+        Patrón reconocido: (letra|_)(letra|digito|_)*, escrito como expresión
+        regular con las clases de self.letras y self.digitos y traducido con
+        la construcción de Thompson (ver expresiones.py)
+        """
+        afnd_desde_expresion(self._expresion_identificador(), self.afnd_identificador)
     
     def _construir_afnd_numero(self):
         """
         Construye el AFND para reconocer números (enteros y decimales).
         
-        Patrón reconocido: digito+(.digito+)?
-        Estados:
-        - q0: Estado inicial
-        - q1: Estado final (número entero)
-        - q2: Estado intermedio (después del punto decimal)
-        - q3: Estado final (número decimal)
+        Patrón reconocido: digito+(.digito+)?, traducido con la construcción
+        de Thompson como _construir_afnd_identificador
+        """
+        afnd_desde_expresion(self._expresion_numero(), self.afnd_numero)
+
+    def _expresion_identificador(self) -> str:
+        """
+        Expresión de los identificadores: (letra|_)(letra|digito|_)*
+        
+        Returns:
+            str: Expresión regular del AFND de identificadores
+        """
+        letra = escapar_clase(self.letras | {'_'})
+        resto = escapar_clase(self.letras | self.digitos | {'_'})
+        return f'{letra}{resto}*'
+
+    def _expresion_numero(self) -> str:
+        """
+        Expresión de los números: digito+(.digito+)?
+        
+        Returns:
+            str: Expresión regular del AFND de números
+        """
+        digito = escapar_clase(self.digitos)
+        return rf'{digito}+(?:\.{digito}+)?'
+
+    def tabla_patrones(self) -> list:
+        """
+        Declara los patrones léxicos de Kotlin como expresiones regulares.
         
-        Transiciones:
-        - De q0 a q1: dígitos (parte entera)
-        - De q1 a q2: punto decimal
-        - De q2 a q3: dígitos (parte decimal)
+        Returns:
+            list: Tuplas (tipo, expresión, prioridad). El tipo etiqueta el
+            estado final del patrón y la prioridad decide cuando un estado
+            del AFD contiene finales de varios tipos (gana la mayor):
+            - ESPACIO: (espacio)+
+            - COMENTARIO_LINEA: //[^\\n]*
+            - COMENTARIO_BLOQUE: /* ... */ (cierra en el primer */)
+            - COMENTARIO_SIN_CERRAR: /* sin */ hasta el final del código
+            - IDENTIFICADOR: (letra|_)(letra|digito|_)*
+            - NUMERO_NATURAL, NUMERO_REAL y NUMERO_INVALIDO (digito+ seguido de '.')
+            - OPERADOR y OPERADOR_INVALIDO (=<, +*, *+, +-, -+, >>>)
+            - DELIMITADOR
+            - CADENA, CADENA_SIN_CERRAR (llega a un salto de línea),
+              CADENA_INCOMPLETA (llega al final) y ESCAPE_FINAL (\\ al final)
+        
+        Como el AFD aplica la regla del máximo alcance, el orden de la tabla
+        no importa (a diferencia del patrón maestro del backend 'regex').
+        """
+        digito = escapar_clase(self.digitos)
+        cuerpo = r'(?:[^"\\\n]|\\[\s\S])*'
+        operadores = sorted(self.operadores | set(self.operadores_dobles))
+        return [
+            ('ESPACIO', escapar_clase(self.espacios) + '+', 1),
+            ('COMENTARIO_LINEA', r'//[^\n]*', 3),
+            ('COMENTARIO_BLOQUE', r'/\*[^*]*\*+(?:[^*/][^*]*\*+)*/', 3),
+            ('COMENTARIO_SIN_CERRAR', r'/\*(?:[^*]|\*+[^*/])*\**', 3),
+            ('IDENTIFICADOR', escapar_clase(self.letras | {'_'}) + escapar_clase(self.letras | self.digitos | {'_'}) + '*', 2),
+            ('NUMERO_NATURAL', f'{digito}+', 2),
+            ('NUMERO_INVALIDO', rf'{digito}+\.', 2),
+            ('NUMERO_REAL', rf'{digito}+\.{digito}+', 2),
+            ('OPERADOR', '|'.join(re.escape(op) for op in operadores), 1),
+            ('OPERADOR_INVALIDO', '|'.join(re.escape(op) for op in sorted(self.operadores_invalidos)), 1),
+            ('DELIMITADOR', escapar_clase(self.delimitadores), 1),
+            ('CADENA', f'"{cuerpo}"', 1),
+            ('CADENA_SIN_CERRAR', rf'"{cuerpo}\n', 1),
+            ('CADENA_INCOMPLETA', f'"{cuerpo}', 1),
+            ('ESCAPE_FINAL', rf'"{cuerpo}\\', 1),
+        ]
+
+    def _construir_afnd_lexico(self):
         """
-        self.afnd_numero.establecer_estado_inicial('q0')
-        self.afnd_numero.agregar_estado_final('q1')
-        self.afnd_numero.agregar_estado_final('q3')
+        Construye un único AFND que reúne todos los patrones léxicos de Kotlin.
         
-        # Parte entera
-        for digito in self.digitos:
-            self.afnd_numero.agregar_transicion('q0', digito, 'q1')
-            self.afnd_numero.agregar_transicion('q1', digito, 'q1')
+        Cada expresión de tabla_patrones se traduce con la construcción de
+        Thompson; desde el estado 'inicio' parte una transición epsilon hacia
+        cada una y su estado final queda etiquetado con el tipo de token (o
+        de error) y la prioridad.
         
-        # Punto decimal
-        self.afnd_numero.agregar_transicion('q1', '.', 'q2')
+        El AFND se convierte una sola vez en un AFD que recorre el bucle de
+        máximo alcance de _analizar_siguiente_token.
+        """
+        afnd_desde_tabla(self.tabla_patrones(), self.afnd_lexico)
+
+    def _construir_patron_maestro(self):
+        """
+        Construye la expresión regular maestra del backend 'regex'.
         
-        # Parte decimal
-        for digito in self.digitos:
-            self.afnd_numero.agregar_transicion('q2', digito, 'q3')
-            self.afnd_numero.agregar_transicion('q3', digito, 'q3')
+        Returns:
+            re.Pattern: Alternación con un grupo con nombre por cada tipo de
+            estado final del AFD unificado
+        
+        Como `re` elige la primera alternativa que coincide (y no la más
+        larga), las alternativas se ordenan para que el resultado coincida
+        con el máximo alcance del AFD: comentarios de bloque cerrados antes
+        que sin cerrar, números reales antes que naturales, operadores
+        inválidos antes que válidos y cadenas cerradas antes que sus errores.
+        """
+        clase = escapar_clase
+        digito = clase(self.digitos)
+        cuerpo = r'(?:[^"\\\n]|\\[\s\S])*'
+        invalidos = sorted(self.operadores_invalidos, key=len, reverse=True)
+        alternativas = [
+            ('ESPACIO', clase(self.espacios) + '+'),
+            ('COMENTARIO_BLOQUE', r'/\*[\s\S]*?\*/'),
+            ('COMENTARIO_SIN_CERRAR', r'/\*[\s\S]*'),
+            ('COMENTARIO_LINEA', r'//[^\n]*'),
+            ('IDENTIFICADOR', clase(self.letras | {'_'}) + clase(self.letras | self.digitos | {'_'}) + '*'),
+            ('NUMERO_REAL', rf'{digito}+\.{digito}+'),
+            ('NUMERO_INVALIDO', rf'{digito}+\.'),
+            ('NUMERO_NATURAL', f'{digito}+'),
+            ('OPERADOR_INVALIDO', '|'.join(re.escape(op) for op in invalidos)),
+            ('OPERADOR', '|'.join(re.escape(op) for op in self.operadores_dobles) + '|' + clase(self.operadores)),
+            ('DELIMITADOR', clase(self.delimitadores)),
+            ('CADENA', f'"{cuerpo}"'),
+            ('CADENA_SIN_CERRAR', rf'"{cuerpo}\n'),
+            ('ESCAPE_FINAL', rf'"{cuerpo}\\\Z'),
+            ('CADENA_INCOMPLETA', rf'"{cuerpo}\Z'),
+        ]
+        return re.compile('|'.join(f'(?P<{nombre}>{patron})' for nombre, patron in alternativas))
 
-    def analizar(self, codigo: str) -> list:
+    def analizar(self, codigo: str, columnar: bool = False):
         """
         Analiza el código fuente completo y genera una lista de tokens.
         
         Args:
             codigo (str): Código fuente en Kotlin a analizar
+            columnar (bool): Si es True, el resultado es un TokenArray que
+                             guarda los tokens en columnas compactas y
+                             recorta los lexemas del código al consultarlos
             
         Returns:
-            list: Lista de objetos Token encontrados en el código
+            list | TokenArray: Lista de objetos Token encontrados en el código,
+            o TokenArray si se pidió el resultado columnar
             
         El análisis se realiza token por token hasta procesar todo el código,
-        manteniendo un seguimiento de la posición, línea y columna actual.
+        manteniendo solo la posición actual: la fila y la columna de cada
+        token se obtienen de su posición con el índice de líneas del código
+        (ver IndiceLineas), construido una vez antes de empezar. Las
+        secuencias de espacios se consumen enteras con una expresión regular.
         """
         self.codigo = codigo
+        self._preparar_clases(codigo)
         self.posicion = 0
-        self.linea = 1
-        self.columna = 1
+        self.lineas = IndiceLineas(codigo)
+        self.columnar = columnar
+        if columnar:
+            self.tokens = TokenArray(codigo)
+            self.tokens.lineas = self.lineas
+        else:
+            self.tokens = []
+        
+        espacios = self.espacios
+        tramo_espacios = self._tramo_espacios
+        try:
+            while self.posicion < len(codigo):
+                if codigo[self.posicion] in espacios:
+                    # Una secuencia de espacios no produce tokens: se consume
+                    # entera sin pasar por el AFD
+                    inicio = self.posicion
+                    self._ejecutar('ESPACIO', inicio, tramo_espacios(codigo, inicio).end())
+                else:
+                    self._analizar_siguiente_token()
+        finally:
+            self.columnar = False
+            
+        return self.tokens
+
+    def analizar_incremental(self, codigo: str, al_avanzar=None) -> ResultadoIncremental:
+        """
+        Analiza el código completo guardando los puntos de reanudación.
+        
+        Args:
+            codigo (str): Código fuente en Kotlin a analizar
+            al_avanzar (callable): Opcional. Se llama cada PASO_PROGRESO
+                                   tokens como al_avanzar(primero, nuevos,
+                                   posicion) (ver reanalizar); si devuelve
+                                   False el análisis se cancela
+            
+        Returns:
+            ResultadoIncremental: Tokens del código junto con el estado del
+            analizador tras cada token, para actualizarlo luego con
+            reanalizar; None si al_avanzar canceló el análisis
+        """
+        self.codigo = codigo
+        self._preparar_clases(codigo)
+        self.posicion = 0
+        self.lineas = IndiceLineas(codigo)
+        self.columnar = False
         self.tokens = []
         
-        while self.posicion < len(self.codigo):
+        fines = array('Q')
+        if al_avanzar is not None:
+            avance = al_avanzar
+            al_avanzar = lambda nuevos, posicion: avance(0, nuevos, posicion)
+        if self._analizar_registrando(fines, al_avanzar=al_avanzar) is None:
+            return None
+        return ResultadoIncremental(codigo, self.tokens, fines, self.lineas, (0, 0, len(self.tokens)))
+
+    def reanalizar(self, anterior: ResultadoIncremental, inicio: int, borrados: int, insertado: str,
+                   al_avanzar=None) -> ResultadoIncremental:
+        """
+        Actualiza un análisis previo tras una edición, sin reanalizar todo el código.
+        
+        Args:
+            anterior (ResultadoIncremental): Resultado del código antes de la
+                                             edición (de analizar_incremental
+                                             o de un reanalizar previo)
+            inicio (int): Posición donde comienza la edición
+            borrados (int): Cantidad de caracteres eliminados desde `inicio`
+            insertado (str): Texto insertado en `inicio`
+            al_avanzar (callable): Opcional. Se llama cada PASO_PROGRESO
+                                   tokens nuevos como al_avanzar(primero,
+                                   nuevos, posicion): `nuevos` es la lista de
+                                   tokens reanalizados hasta el momento, que
+                                   ocuparán desde el índice `primero` del
+                                   resultado, y `posicion` la posición
+                                   alcanzada en el código. Si devuelve False
+                                   el análisis se cancela
+            
+        Returns:
+            ResultadoIncremental: Resultado para el código editado; su atributo
+            `cambio` indica el rango de tokens que se reemplazó. None si
+            al_avanzar canceló el análisis
+            
+        Raises:
+            ValueError: Si la edición no cae dentro del código analizado
+        
+        El análisis se retoma tras el último token cuyo reconocimiento no pudo
+        leer la zona editada (el autómata mira como mucho `margen_regex`
+        caracteres más allá del token) y se detiene en cuanto el analizador
+        vuelve al mismo estado que en el análisis anterior: misma posición
+        respecto del texto no editado y misma columna. Los tokens siguientes
+        se reutilizan, corrigiendo su línea si la edición agregó o quitó
+        saltos de línea.
+        
+        Un comentario de bloque sin cerrar se reconoce leyendo hasta el final
+        del código, igual que una cadena sin cerrar al final: cualquier
+        edición posterior lo vuelve a analizar desde su inicio, y al abrir o
+        cerrar uno el análisis nuevo no coincide con el anterior hasta el final.
+        """
+        if inicio < 0 or borrados < 0 or inicio + borrados > len(anterior.codigo):
+            raise ValueError("La edición no cae dentro del código analizado")
+        
+        self.codigo = anterior.codigo[:inicio] + insertado + anterior.codigo[inicio + borrados:]
+        self.lineas = anterior.lineas.editar(inicio, borrados, insertado)
+        self._preparar_clases(insertado)
+        self.columnar = False
+        self.tokens = []
+        desplazamiento = len(insertado) - borrados
+        
+        # Primer token cuyo reconocimiento pudo leer la zona editada
+        primero = bisect_left(anterior.fines, inicio - self.margen_regex)
+        self.posicion = anterior.fines[primero - 1] if primero else 0
+        
+        fines = anterior.fines[:primero]
+        if al_avanzar is not None:
+            avance = al_avanzar
+            al_avanzar = lambda nuevos, posicion: avance(primero, nuevos, posicion)
+        sincronizado = self._analizar_registrando(
+            fines, anterior, desplazamiento, inicio + len(insertado), al_avanzar
+        )
+        if sincronizado is None:
+            return None
+        nuevos = self.tokens
+        tokens = anterior.tokens[:primero] + nuevos
+        
+        if sincronizado < 0:
+            fin_anterior = len(anterior.tokens)
+        else:
+            # Reutilizar los tokens que siguen al punto de coincidencia
+            fin_anterior = sincronizado + 1
+            diferencia_lineas = (self.lineas.fila_de(self.posicion)
+                                 - anterior.lineas.fila_de(anterior.fines[sincronizado]))
+            if diferencia_lineas:
+                tokens += [
+                    Token(token.lexema, token.tipo, token.fila + diferencia_lineas, token.columna)
+                    for token in anterior.tokens[fin_anterior:]
+                ]
+            else:
+                tokens += anterior.tokens[fin_anterior:]
+            if desplazamiento:
+                fines.extend(map(desplazamiento.__add__, anterior.fines[fin_anterior:]))
+            else:
+                fines.extend(anterior.fines[fin_anterior:])
+        
+        self.tokens = tokens
+        return ResultadoIncremental(
+            self.codigo, tokens, fines, self.lineas,
+            (primero, fin_anterior, primero + len(nuevos))
+        )
+
+    def _analizar_registrando(self, fines, anterior=None, desplazamiento: int = 0, limite: int = 0,
+                              al_avanzar=None) -> int:
+        """
+        Analiza desde el estado actual registrando la posición tras cada token.
+        
+        Args:
+            fines (array): Recibe la posición tras cada token
+            anterior (ResultadoIncremental): Análisis previo con el que buscar
+                                             coincidencia, o None
+            desplazamiento (int): Diferencia de longitud entre el código
+                                  actual y el de `anterior`
+            limite (int): Posición a partir de la cual el código coincide con
+                          el de `anterior` (desplazado)
+            al_avanzar (callable): Opcional, se llama como al_avanzar(tokens,
+                                   posicion) cada PASO_PROGRESO tokens; si
+                                   devuelve False se cancela el análisis
+            
+        Returns:
+            int: Índice del token de `anterior` tras el cual el analizador
+            quedó en el mismo estado, -1 si se analizó hasta el final o None
+            si se canceló
+        """
+        tokens = self.tokens
+        codigo = self.codigo
+        espacios = self.espacios
+        j = 0
+        proximo_aviso = self.PASO_PROGRESO
+        while self.posicion < len(codigo):
+            if codigo[self.posicion] in espacios:
+                # Como en analizar(): los espacios no producen tokens
+                inicio = self.posicion
+                self._ejecutar('ESPACIO', inicio, self._tramo_espacios(codigo, inicio).end())
+                continue
+            cantidad = len(tokens)
             self._analizar_siguiente_token()
+            if len(tokens) == cantidad:
+                continue
+            fines.append(self.posicion)
+            if al_avanzar is not None and len(tokens) >= proximo_aviso:
+                proximo_aviso += self.PASO_PROGRESO
+                if al_avanzar(tokens, self.posicion) is False:
+                    return None
+            if anterior is None or self.posicion < limite:
+                continue
             
-        return self.tokens
+            # ¿Terminó algún token anterior en la misma posición y columna?
+            objetivo = self.posicion - desplazamiento
+            j = bisect_left(anterior.fines, objetivo, j)
+            if (j < len(anterior.fines) and anterior.fines[j] == objetivo
+                    and anterior.lineas.columna_de(objetivo) == self.lineas.columna_de(self.posicion)):
+                return j
+        return -1
 
-    def _analizar_siguiente_token(self):
+    @staticmethod
+    def calcular_edicion(anterior: str, nuevo: str) -> tuple:
         """
-        Analiza y extrae el siguiente token del código fuente.
+        Calcula una edición única que transforma un texto en otro.
         
-        Este método es el núcleo del analizador, determina el tipo de token
-        basándose en el carácter actual y delega el análisis al método
-        específico correspondiente.
-        
-        Maneja:
-        - Espacios en blanco y saltos de línea
-        - Comentarios (// y /* */)
-        - Identificadores y palabras reservadas
-        - Números
-        - Operadores
-        - Delimitadores
-        - Cadenas
-        - Caracteres no reconocidos
-        """
-        char = self.codigo[self.posicion]
-        
-        # Ignorar espacios en blanco
-        if char.isspace():
-            if char == '\n':
-                self.linea += 1
-                self.columna = 1
+        Args:
+            anterior (str): Texto original
+            nuevo (str): Texto editado
+            
+        Returns:
+            tuple: (inicio, borrados, insertado) listos para reanalizar
+        
+        Busca el prefijo y el sufijo comunes más largos por bisección,
+        comparando recortes en lugar de carácter por carácter.
+        """
+        limite = min(len(anterior), len(nuevo))
+        bajo, alto = 0, limite
+        while bajo < alto:
+            medio = (bajo + alto + 1) // 2
+            if anterior[:medio] == nuevo[:medio]:
+                bajo = medio
             else:
-                self.columna += 1
-            self.posicion += 1
-            return
-        
-        # Comentarios - Importante: verificar esto antes que operadores
-        if char == '/' and self.posicion + 1 < len(self.codigo):
-            siguiente = self.codigo[self.posicion + 1]
-            if siguiente in ['/', '*']:
-                self._analizar_comentario()
-                return
+                alto = medio - 1
+        inicio = bajo
+        
+        bajo, alto = 0, limite - inicio
+        while bajo < alto:
+            medio = (bajo + alto + 1) // 2
+            if anterior[len(anterior) - medio:] == nuevo[len(nuevo) - medio:]:
+                bajo = medio
+            else:
+                alto = medio - 1
+        return inicio, len(anterior) - inicio - bajo, nuevo[inicio:len(nuevo) - bajo]
+
+    def iter_tokens(self, fuente, tamano_bloque: int = 65536, posiciones: bool = False):
+        """
+        Analiza el código de forma incremental y produce los tokens a medida
+        que se reconocen.
         
-        # Identificadores y palabras reservadas
-        if char in self.letras or char == '_':
-            self._analizar_identificador()
+        Args:
+            fuente: Código a analizar. Puede ser:
+                    - str: el código completo
+                    - un archivo abierto (objeto con método read), en modo
+                      texto o binario (UTF-8)
+                    - un iterable de trozos de texto (str o bytes UTF-8)
+            tamano_bloque (int): Caracteres a leer por llamada cuando la
+                                 fuente es un archivo
+            posiciones (bool): Si es True, cada token se acompaña de las
+                               posiciones en caracteres del texto reconocido
+        
+        Yields:
+            Token: Cada token en el mismo orden y con la misma posición
+            que produciría analizar() sobre el código completo. Con
+            posiciones=True, tuplas (token, inicio, fin) donde [inicio, fin)
+            es el texto del código que produjo el token (para un error, el
+            texto reconocido o el carácter inválido)
+        
+        Solo se conserva en memoria el texto desde el inicio del token en
+        curso: un token que cruza el borde entre dos trozos (un comentario
+        de bloque, una cadena o un operador como >>>) se vuelve a reconocer
+        cuando llega el trozo siguiente. Mientras un token siga abierto se
+        espera a que el texto pendiente duplique su tamaño antes de volver a
+        escanearlo, de modo que el costo total sigue siendo lineal.
+        """
+        trozos = self._trozos(fuente, tamano_bloque)
+        self.codigo = ''
+        self.posicion = 0
+        self.lineas = IndiceLineas(self.codigo)
+        self.tokens = []
         
-        # Números
-        elif char in self.digitos:
-            self._analizar_numero()
+        # Posición en el código completo del inicio de self.codigo
+        base = 0
+        pendientes = []
+        longitud_pendiente = 0
+        fuente_agotada = False
+        while not fuente_agotada:
+            trozo = next(trozos, None)
+            if trozo is None:
+                fuente_agotada = True
+            else:
+                pendientes.append(trozo)
+                longitud_pendiente += len(trozo)
+                if longitud_pendiente < len(self.codigo) - self.posicion:
+                    continue
+            
+            # Descartar lo ya consumido y agregar el texto nuevo; el índice
+            # de líneas del texto pendiente empieza en la fila y la columna
+            # de lo consumido
+            base += self.posicion
+            fila, columna = self.lineas.posicion(self.posicion)
+            nuevo = ''.join(pendientes)
+            self._preparar_clases(nuevo)
+            self.codigo = self.codigo[self.posicion:] + nuevo
+            self.lineas = IndiceLineas(self.codigo, fila, columna)
+            self.posicion = 0
+            pendientes = []
+            longitud_pendiente = 0
+            
+            while self.posicion < len(self.codigo):
+                inicio = self.posicion
+                tipo, fin, agotado = self._reconocer(inicio)
+                if agotado and not fuente_agotada:
+                    # El token podría continuar en el próximo trozo
+                    break
+                self._ejecutar(tipo, inicio, fin)
+                if self.tokens:
+                    if posiciones:
+                        # Cada paso produce a lo sumo un token; un carácter
+                        # no reconocido ocupa al menos ese carácter
+                        yield self.tokens[0], base + inicio, base + max(fin, inicio + 1)
+                    else:
+                        yield from self.tokens
+                    self.tokens = []
+
+    def _trozos(self, fuente, tamano_bloque: int):
+        """
+        Normaliza la fuente de iter_tokens a un iterador de trozos de texto.
         
-        # Operadores
-        elif char in self.operadores:
-            self._analizar_operador()
+        Args:
+            fuente: str, archivo abierto o iterable de trozos
+            tamano_bloque (int): Tamaño de lectura para archivos
+            
+        Yields:
+            str: Trozos no vacíos de texto; los trozos en bytes se decodifican
+            como UTF-8 de forma incremental (un carácter multibyte puede
+            quedar partido entre dos trozos)
+        """
+        if isinstance(fuente, str):
+            trozos = (fuente,)
+        elif hasattr(fuente, 'read'):
+            trozos = iter(lambda: fuente.read(tamano_bloque), fuente.read(0))
+        else:
+            trozos = fuente
+        
+        decodificador = None
+        for trozo in trozos:
+            if isinstance(trozo, (bytes, bytearray, memoryview)):
+                if decodificador is None:
+                    decodificador = codecs.getincrementaldecoder('utf-8')()
+                trozo = decodificador.decode(trozo)
+            if trozo:
+                yield trozo
+        if decodificador is not None:
+            resto = decodificador.decode(b'', final=True)
+            if resto:
+                yield resto
+
+    def analizar_archivo(self, ruta, mmap: bool = True) -> list:
+        """
+        Analiza un archivo de código Kotlin codificado en UTF-8.
         
-        # Delimitadores
-        elif char in self.delimitadores:
-            self._analizar_delimitador()
+        Args:
+            ruta: Ruta del archivo a analizar
+            mmap (bool): Si es True, el archivo se mapea en memoria y se
+                         analiza directamente sobre sus bytes, sin cargarlo
+                         completo como str; si es False se lee y se usa analizar()
+            
+        Returns:
+            list: Lista de objetos Token, iguales a los que produce analizar()
+                  sobre el contenido decodificado del archivo
+        
+        Con mmap el AFD unificado avanza por posiciones en bytes: los bytes
+        ASCII se clasifican con una tabla y cada carácter multibyte se
+        decodifica solo para obtener su clase. Únicamente el lexema
+        reconocido se decodifica a str, de modo que la fila y la columna
+        se cuentan en caracteres (una 'í' ocupa dos bytes y una columna).
+        Siempre se usa el AFD, sea cual sea el backend elegido.
+        """
+        if not mmap:
+            with open(ruta, encoding='utf-8', newline='') as archivo:
+                return self.analizar(archivo.read())
+        
+        with open(ruta, 'rb') as archivo:
+            if os.fstat(archivo.fileno()).st_size == 0:
+                # mmap no admite archivos vacíos
+                self.tokens = []
+                return self.tokens
+            with mmap_modulo.mmap(archivo.fileno(), 0, access=mmap_modulo.ACCESS_READ) as datos:
+                tokens = list(self._iter_tokens_bytes(datos))
+        
+        self.tokens = tokens
+        return tokens
+
+    def _iter_tokens_bytes(self, datos):
+        """
+        Produce los tokens de un buffer UTF-8 (bytes o mmap) por posiciones en bytes.
         
-        # Cadenas
-        elif char == '"':
-            self._analizar_cadena()
+        Args:
+            datos: Buffer con el código codificado en UTF-8
+            
+        Yields:
+            Token: Tokens en el mismo orden y posición que analizar()
         
-        # Caracteres no reconocidos
-        else:
-            self._error_lexico(f"Carácter no reconocido: {char}")
+        Cada lexema reconocido se decodifica y se entrega a la acción de su
+        tipo como si fuera todo el código; los caracteres adicionales que
+        descarta la recuperación de errores se saltan luego en bytes.
+        """
+        self.tokens = []
+        posicion = 0
+        fila, columna = 1, 1
+        
+        while posicion < len(datos):
+            tipo, fin = self._reconocer_bytes(datos, posicion)
+            self.codigo = datos[posicion:fin].decode('utf-8', 'replace')
+            self.lineas = IndiceLineas(self.codigo, fila, columna)
+            self.posicion = 0
+            self._ejecutar(tipo, 0, len(self.codigo))
+            fila, columna = self.lineas.posicion(len(self.codigo))
+            
+            # Saltar los caracteres descartados más allá del lexema
+            posicion = fin
+            for _ in range(self.posicion - len(self.codigo)):
+                caracter, largo = self._caracter_utf8(datos, posicion) if posicion < len(datos) else ('', 1)
+                posicion += largo
+                if caracter == '\n':
+                    fila, columna = fila + 1, 1
+                else:
+                    columna += 1
+            
+            if self.tokens:
+                yield from self.tokens
+                self.tokens = []
 
-    def _analizar_identificador(self):
+    def _caracter_utf8(self, datos, indice: int):
         """
-        Analiza identificadores usando el AFD generado del AFND.
+        Decodifica el carácter UTF-8 que comienza en una posición en bytes.
         
-        Proceso:
-        1. Lee caracteres válidos (letras, dígitos, guión bajo)
-        2. Verifica la longitud máxima (10 caracteres)
-        3. Determina si es palabra reservada o identificador
-        4. Genera el token correspondiente
+        Args:
+            datos: Buffer UTF-8
+            indice (int): Posición del primer byte del carácter
+            
+        Returns:
+            tuple: (caracter, largo_en_bytes); un byte inválido se devuelve
+            como '\ufffd' de largo 1
+        """
+        byte = datos[indice]
+        if byte < 0x80:
+            return chr(byte), 1
+        largo = 2 if 0xC0 <= byte < 0xE0 else 3 if 0xE0 <= byte < 0xF0 else 4 if 0xF0 <= byte < 0xF8 else 1
+        try:
+            return datos[indice:indice + largo].decode('utf-8'), largo
+        except UnicodeDecodeError:
+            return '\ufffd', 1
+
+    def _reconocer_bytes(self, datos, inicio: int):
+        """
+        Reconoce el lexema más largo desde `inicio` recorriendo el AFD sobre bytes UTF-8.
         
-        Restricciones:
-        - Longitud máxima: 10 caracteres
-        - Debe comenzar con letra o guión bajo
+        Args:
+            datos: Buffer UTF-8
+            inicio (int): Posición en bytes desde donde reconocer
+            
+        Returns:
+            tuple: (tipo, fin) con el tipo del último estado final visitado
+            (None si no hubo ninguno) y la posición en bytes siguiente al
+            lexema; si no hubo estado final, `fin` salta un carácter
         """
-        inicio = self.posicion
-        col_inicio = self.columna
-        
-        # Leer el identificador completo
-        while self.posicion < len(self.codigo):
-            char = self.codigo[self.posicion]
-            if char in self.letras or char in self.digitos or char == '_':
-                self.posicion += 1
-                self.columna += 1
+        afd = self.afd_lexico
+        tabla, n_clases, tipos = afd.tabla, afd.n_clases, afd.tipos
+        clases_ascii = self.clases_ascii
+        estado = afd.estado_inicial
+        tipo = None
+        fin = None
+        indice = inicio
+        
+        while indice < len(datos):
+            byte = datos[indice]
+            if byte < 0x80:
+                clase = clases_ascii[byte]
+                siguiente = indice + 1
             else:
+                caracter, largo = self._caracter_utf8(datos, indice)
+                clase = afd.clase(caracter)
+                siguiente = indice + largo
+            if fin is None:
+                fin = siguiente
+            estado = tabla[estado * n_clases + clase]
+            if not estado:
                 break
+            indice = siguiente
+            if tipos[estado] is not None:
+                tipo = tipos[estado]
+                fin = indice
+        return tipo, fin
+
+    def _preparar_clases(self, texto: str):
+        """
+        Resuelve de antemano la clase de los caracteres de un texto.
         
-        lexema = self.codigo[inicio:self.posicion]
-        
-        # Verificar longitud máxima
-        if len(lexema) > 10:
-            self._error_lexico(f"Identificador '{lexema}' excede el límite de 10 caracteres")
-            return
+        Args:
+            texto (str): Texto que se va a recorrer con el AFD unificado
         
-        # Determinar si es palabra reservada o identificador
-        tipo = 'PALABRA_RESERVADA' if lexema in self.palabras_reservadas else 'IDENTIFICADOR'
-        self.tokens.append(Token(lexema, tipo, self.linea, col_inicio))
+        Los recorridos del AFD buscan la clase de cada carácter con
+        `clases.get(caracter, 0)`, el acceso más rápido. Eso es correcto
+        mientras las clases de caracteres del AFD estén expandidas a claves;
+        si tiene clases grandes guardadas como intervalos (ver TablaClases),
+        se memorizan antes los caracteres distintos del texto.
+        """
+        clases = self.afd_lexico.clases
+        if clases.intervalos:
+            clases.resolver(texto)
 
-    def _analizar_numero(self):
+    def _analizar_siguiente_token(self):
         """
-        Analiza números usando el AFD generado del AFND.
-        
-        Reconoce:
-        - Números naturales: secuencia de dígitos
-        - Números reales: parte entera + punto decimal + parte decimal
+        Analiza y extrae el siguiente token del código fuente.
         
-        El análisis utiliza el AFD convertido del AFND para números,
-        siguiendo las transiciones según los caracteres encontrados.
+        Este método es el núcleo del analizador: reconoce el lexema más
+        largo desde la posición actual con el backend elegido y ejecuta la
+        acción asociada a su tipo.
         """
-        estados_afd, estado_inicial, transiciones, estados_finales = self.afd_numero
-        estado_actual = estado_inicial
         inicio = self.posicion
-        col_inicio = self.columna
-        es_real = False
-        
-        while self.posicion < len(self.codigo):
-            char = self.codigo[self.posicion]
-            if (estado_actual, char) in transiciones:
-                if char == '.':
-                    es_real = True
-                estado_actual = transiciones[(estado_actual, char)]
-                self.posicion += 1
-                self.columna += 1
-            else:
-                break
+        tipo, fin, _ = self._reconocer(inicio)
+        self._ejecutar(tipo, inicio, fin)
+
+    def _ejecutar(self, tipo, inicio: int, fin: int):
+        """
+        Ejecuta la acción asociada al tipo reconocido.
         
-        if estado_actual in estados_finales:
-            lexema = self.codigo[inicio:self.posicion]
-            tipo = 'NUMERO_REAL' if es_real else 'NUMERO_NATURAL'
-            self.tokens.append(Token(lexema, tipo, self.linea, col_inicio))
+        Args:
+            tipo (str): Tipo del estado final reconocido, o None si ningún
+                        patrón reconoce el carácter actual
+            inicio (int): Posición inicial del lexema
+            fin (int): Posición final (exclusiva) del lexema
+        """
+        if tipo is None:
+            self._error_lexico(f"Carácter no reconocido: {self.codigo[inicio]}")
         else:
+            self._acciones[tipo](inicio, fin, tipo)
+
+    def _reconocer_afd(self, inicio: int):
+        """
+        Reconoce el lexema más largo desde `inicio` recorriendo el AFD unificado.
+        
+        Args:
+            inicio (int): Posición desde donde reconocer
+            
+        Returns:
+            tuple: (tipo, fin, agotado) donde `tipo` es el tipo del último
+            estado final visitado (None si no hubo ninguno), `fin` la
+            posición siguiente a ese lexema y `agotado` indica que el código
+            terminó antes de que el AFD llegara al estado muerto (con más
+            texto el lexema podría ser más largo)
+        
+        Aplica la regla del máximo alcance: se avanza mientras haya
+        transición y se recuerda el último estado final visitado. Al llegar
+        a un estado con ciclo, el tramo de caracteres que lo mantiene en ese
+        estado (el cuerpo de un comentario o de una cadena) se consume de
+        una vez con la expresión de `_tramos`.
+        """
+        codigo = self.codigo
+        afd = self.afd_lexico
+        tabla, n_clases, clases, tipos = afd.tabla, afd.n_clases, afd.clases, afd.tipos
+        tramos = self._tramos
+        estado = afd.estado_inicial
+        tipo = None
+        fin = inicio
+        
+        indice = inicio
+        longitud = len(codigo)
+        while indice < longitud:
+            estado = tabla[estado * n_clases + clases.get(codigo[indice], 0)]
+            if not estado:
+                return tipo, fin, False
+            indice += 1
+            tramo = tramos[estado]
+            if tramo is not None:
+                coincidencia = tramo(codigo, indice)
+                if coincidencia is not None:
+                    indice = coincidencia.end()
+            if tipos[estado] is not None:
+                tipo = tipos[estado]
+                fin = indice
+        return tipo, fin, True
+
+    def _reconocer_regex(self, inicio: int):
+        """
+        Reconoce el siguiente lexema usando el patrón maestro.
+        
+        Args:
+            inicio (int): Posición desde donde reconocer
+            
+        Returns:
+            tuple: (tipo, fin, agotado) como en _reconocer_afd; el tipo es el
+            nombre del grupo que coincide. Como `re` no indica si necesitó
+            llegar al final del texto, se considera agotado todo lexema que
+            termine a menos de `margen_regex` caracteres del final
+        
+        Equivale a _reconocer_afd, pero el lexema lo reconoce `re` en C.
+        """
+        coincidencia = self.patron_maestro.match(self.codigo, inicio)
+        if coincidencia is None:
+            return None, inicio + 1, inicio + 1 + self.margen_regex > len(self.codigo)
+        fin = coincidencia.end()
+        return coincidencia.lastgroup, fin, fin + self.margen_regex > len(self.codigo)
+
+    def _reconocer_perezoso(self, inicio: int):
+        """
+        Reconoce el lexema más largo desde `inicio` con el AFD perezoso.
+        
+        Args:
+            inicio (int): Posición desde donde reconocer
+            
+        Returns:
+            tuple: (tipo, fin, agotado) como en _reconocer_afd
+        
+        Equivale a _reconocer_afd, pero los estados del AFD se calculan a
+        medida que el código los visita (ver AFDPerezoso).
+        """
+        return self.afd_perezoso.reconocer(self.codigo, inicio)
+
+    def _reconocer_generado(self, inicio: int):
+        """
+        Reconoce el lexema más largo desde `inicio` con el escáner generado.
+        
+        Args:
+            inicio (int): Posición desde donde reconocer
+            
+        Returns:
+            tuple: (tipo, fin, agotado) como en _reconocer_afd
+        
+        El escáner recorre las clases de los caracteres ya traducidas a
+        bytes; se traducen de nuevo cada vez que cambia el código.
+        """
+        if self.codigo is not self._codigo_generado:
+            self._codigo_generado = self.codigo
+            self._clases_generadas = self.escaner.preparar(self.codigo)
+        return self.escaner.reconocer(self._clases_generadas, inicio)
+
+    def _cargar_escaner(self):
+        """
+        Genera y carga el escáner especializado del AFD unificado.
+        
+        Returns:
+            module: Módulo generado por generar_escaner, memorizado por
+            huella y minimización como los autómatas
+        """
+        clave = (self.huella(), self.minimizar)
+        escaner = self._escaneres.get(clave)
+        if escaner is None:
+            escaner = cargar_escaner(generar_escaner(self.afd_lexico, clave[0]))
+            self._escaneres[clave] = escaner
+        return escaner
+
+    def activar_perfilado(self) -> PerfilAnalisis:
+        """
+        Activa el modo de perfilado con mediciones vacías.
+        
+        Returns:
+            PerfilAnalisis: Mediciones, que se acumulan en todos los análisis
+            siguientes (analizar, iter_tokens, analizar_incremental...)
+            hasta desactivar_perfilado
+        
+        El modo se activa reemplazando _reconocer, _ejecutar y _emitir de
+        esta instancia por versiones que miden cada paso; al desactivarlo
+        se restauran los métodos originales, así que un analizador sin
+        perfilado no ejecuta ninguna comprobación adicional.
+        """
+        if self.perfil is not None:
+            self.desactivar_perfilado()
+        funciones = {tipo: accion.__func__ for tipo, accion in self._acciones.items()}
+        self.perfil = PerfilAnalisis(funciones, self._reconocer.__func__)
+        self._reconocer_sin_medir = self._reconocer
+        self._reconocer = self._reconocer_medido
+        self._ejecutar = self._ejecutar_medido
+        self._emitir = self._emitir_medido
+        return self.perfil
+
+    def desactivar_perfilado(self) -> PerfilAnalisis:
+        """
+        Desactiva el modo de perfilado.
+        
+        Returns:
+            PerfilAnalisis: Mediciones acumuladas, o None si no estaba activo
+        """
+        perfil = self.perfil
+        if perfil is not None:
+            self._reconocer = self._reconocer_sin_medir
+            del self._reconocer_sin_medir, self._ejecutar, self._emitir
+            self.perfil = None
+        return perfil
+
+    def _reconocer_medido(self, inicio: int):
+        """
+        Reconoce con el backend elegido midiendo el tiempo (modo de perfilado).
+        
+        Args:
+            inicio (int): Posición desde donde reconocer
+            
+        Returns:
+            tuple: (tipo, fin, agotado) como en _reconocer_afd
+        
+        Si el paso continúa al anterior (mismo código, desde donde terminó
+        la última acción), el tiempo transcurrido desde esa acción se
+        acumula como despacho.
+        """
+        perfil = self.perfil
+        comienzo = time.perf_counter_ns()
+        if perfil.fin_ns is not None and inicio == perfil.posicion and self.codigo is perfil.codigo:
+            perfil.despacho_ns += comienzo - perfil.fin_ns
+            perfil.pasos += 1
+            perfil.fin_ns = None
+        resultado = self._reconocer_sin_medir(inicio)
+        perfil.pendiente_ns += time.perf_counter_ns() - comienzo
+        return resultado
+
+    def _ejecutar_medido(self, tipo, inicio: int, fin: int):
+        """
+        Ejecuta la acción del tipo reconocido midiéndola (modo de perfilado).
+        
+        Args:
+            tipo (str): Tipo reconocido, o None
+            inicio (int): Posición inicial del lexema
+            fin (int): Posición final (exclusiva) del lexema
+        """
+        perfil = self.perfil
+        posicion = self.posicion
+        errores = perfil.errores_en_curso
+        comienzo = time.perf_counter_ns()
+        AnalizadorLexico._ejecutar(self, tipo, inicio, fin)
+        duracion = time.perf_counter_ns() - comienzo
+        perfil.registrar(tipo, self.posicion - posicion, duracion, perfil.errores_en_curso - errores)
+        perfil.codigo = self.codigo
+        perfil.posicion = self.posicion
+        perfil.fin_ns = time.perf_counter_ns()
+
+    def _emitir_medido(self, tipo: TipoToken, inicio: int, fin: int, lexema: str = None):
+        """
+        Emite un token contando los errores léxicos (modo de perfilado).
+        
+        Args:
+            Los mismos que _emitir
+        """
+        if tipo is TipoToken.ERROR_LEXICO:
+            self.perfil.errores_en_curso += 1
+        AnalizadorLexico._emitir(self, tipo, inicio, fin, lexema)
+
+    def _analizar_espacio(self, inicio: int, fin: int, tipo: str):
+        """
+        Consume una secuencia de espacios en blanco y saltos de línea.
+        
+        Args:
+            inicio (int): Posición inicial de la secuencia
+            fin (int): Posición final (exclusiva) de la secuencia
+            tipo (str): Tipo reconocido por el AFD ('ESPACIO')
+        
+        Los saltos de línea no se cuentan aquí: la fila de cada token sale
+        del índice de líneas del código.
+        """
+        self.posicion = fin
+
+    def _analizar_identificador(self, inicio: int, fin: int, tipo: str):
+        """
+        Procesa un identificador reconocido por el AFD.
+        
+        Args:
+            inicio (int): Posición inicial del lexema
+            fin (int): Posición final (exclusiva) del lexema
+            tipo (str): Tipo reconocido por el AFD ('IDENTIFICADOR')
+        
+        Proceso:
+        1. Busca el lexema entre las palabras clave (ver _palabras_clave)
+        2. Si no lo es, verifica la longitud máxima de los identificadores
+           (10 caracteres); las palabras clave más largas, como
+           'crossinline', no son identificadores y no tienen ese límite
+        3. Genera el token correspondiente
+        """
+        lexema = self.codigo[inicio:fin]
+        self.posicion = fin
+        
+        tipo = self._palabras_clave.get(lexema)
+        if tipo is None:
+            # Verificar longitud máxima
+            if len(lexema) > 10:
+                self._error_lexico(f"Identificador '{lexema}' excede el límite de 10 caracteres")
+                return
+            tipo = TipoToken.IDENTIFICADOR
+        self._emitir(tipo, inicio, fin)
+
+    def _analizar_numero(self, inicio: int, fin: int, tipo: str):
+        """
+        Procesa un número reconocido por el AFD.
+        
+        Args:
+            inicio (int): Posición inicial del lexema
+            fin (int): Posición final (exclusiva) del lexema
+            tipo (str): 'NUMERO_NATURAL', 'NUMERO_REAL' o 'NUMERO_INVALIDO'
+        
+        Un número terminado en punto sin parte decimal es un error.
+        """
+        self.posicion = fin
+        
+        if tipo == 'NUMERO_INVALIDO':
             self._error_lexico("Número inválido")
+        else:
+            self._emitir(TipoToken[tipo], inicio, fin)
 
-    def _analizar_operador(self):
+    def _analizar_operador(self, inicio: int, fin: int, tipo: str):
         """
-        Implementa el AFD para operadores, incluyendo detección de operadores inválidos.
+        Procesa un operador reconocido por el AFD, incluidos los inválidos.
+        
+        Args:
+            inicio (int): Posición inicial del lexema
+            fin (int): Posición final (exclusiva) del lexema
+            tipo (str): 'OPERADOR' u 'OPERADOR_INVALIDO'
         
         Reconoce:
         - Operadores simples: +, -, *, /, %, =, <, >, !, &, |
@@ -306,56 +1327,21 @@ class AnalizadorLexico:
         - Operadores juntos inválidos (+*, *+, +-, -+)
         - Operadores no existentes en Kotlin (>>>)
         """
-        inicio = self.posicion
-        col_inicio = self.columna
-        
-        # Verificar operadores inválidos de dos o más caracteres
-        if self.posicion + 1 < len(self.codigo):
-            op_doble = self.codigo[self.posicion:self.posicion + 2]
-            op_triple = self.codigo[self.posicion:self.posicion + 3] if self.posicion + 2 < len(self.codigo) else ''
-            
-            # Detectar operadores mal escritos
-            if op_doble == '=<':
-                self._error_lexico("Operador inválido '=<', ¿querías decir '<='?")
-                self.posicion += 2
-                self.columna += 2
-                return
-            
-            # Detectar operadores juntos inválidos
-            elif op_doble == '+*' or op_doble == '*+' or op_doble == '+-' or op_doble == '-+':
-                self._error_lexico(f"Operadores juntos inválidos '{op_doble}'")
-                self.posicion += 2
-                self.columna += 2
-                return
-            
-            # Detectar operador >>> que no existe en Kotlin
-            elif op_triple == '>>>':
-                self._error_lexico("Operador '>>>' no existe en Kotlin")
-                self.posicion += 3
-                self.columna += 3
-                return
-            
-            # Operadores válidos de dos caracteres
-            elif op_doble in ['==', '!=', '<=', '>=', '&&', '||', '++', '--']:
-                self.tokens.append(Token(op_doble, 'OPERADOR', self.linea, col_inicio))
-                self.posicion += 2
-                self.columna += 2
-                return
-        
-        # Operadores de un carácter
-        op_simple = self.codigo[self.posicion]
-        if op_simple in self.operadores:
-            self.tokens.append(Token(op_simple, 'OPERADOR', self.linea, col_inicio))
-            self.posicion += 1
-            self.columna += 1
+        if tipo == 'OPERADOR_INVALIDO':
+            # El error descarta además el carácter siguiente al operador
+            self._error_lexico(self.operadores_invalidos[self.codigo[inicio:fin]])
         else:
-            self._error_lexico(f"Operador inválido '{op_simple}'")
-            self.posicion += 1
-            self.columna += 1
+            self._emitir(TipoToken.OPERADOR, inicio, fin)
+        self.posicion += fin - inicio
 
-    def _analizar_delimitador(self):
+    def _analizar_delimitador(self, inicio: int, fin: int, tipo: str):
         """
-        Implementa el AFD para delimitadores.
+        Procesa un delimitador reconocido por el AFD.
+        
+        Args:
+            inicio (int): Posición del delimitador
+            fin (int): Posición siguiente al delimitador
+            tipo (str): Tipo reconocido por el AFD ('DELIMITADOR')
         
         Reconoce los siguientes delimitadores:
         - Paréntesis: ( )
@@ -364,125 +1350,87 @@ class AnalizadorLexico:
         - Punto y coma: ;
         - Dos puntos: :
         """
-        delim = self.codigo[self.posicion]
-        self.tokens.append(Token(delim, 'DELIMITADOR', self.linea, self.columna))
-        self.posicion += 1
-        self.columna += 1
-
-    def _analizar_cadena(self):
+        self._emitir(TipoToken.DELIMITADOR, inicio, fin)
+        self.posicion = fin
 
+    def _analizar_cadena(self, inicio: int, fin: int, tipo: str):
         """
-        Implementa el AFD para cadenas de texto.
+        Procesa una cadena de texto reconocida por el AFD.
+        
+        Args:
+            inicio (int): Posición de la comilla inicial
+            fin (int): Posición final (exclusiva) de lo reconocido
+            tipo (str): 'CADENA', 'CADENA_SIN_CERRAR', 'CADENA_INCOMPLETA'
+                        o 'ESCAPE_FINAL'
         
         Características:
         - Reconoce cadenas delimitadas por comillas dobles
-        - Maneja caracteres escapados = (\)
-        - Detecta cadenas sin cerrar
-        - Maneja saltos de línea dentro de cadenas
+        - Maneja caracteres escapados = (\\)
         
         Errores detectados:
         - Carácter de escape al final de la cadena
-        - Cadena sin cerrar (falta comilla final)
+        - Cadena sin cerrar (salto de línea o fin del código antes de la comilla)
         """
-
-        inicio = self.posicion
-        col_inicio = self.columna
-        self.posicion += 1  # Saltar la comilla inicial
-        self.columna += 1
-        
-        while self.posicion < len(self.codigo):
-            if self.codigo[self.posicion] == '\\':
-                # Manejar caracteres escapados
-                if self.posicion + 1 < len(self.codigo):
-                    self.posicion += 2
-                    self.columna += 2
-                else:
-                    self._error_lexico("Carácter de escape al final de la cadena")
-                    return
-            elif self.codigo[self.posicion] == '"':
-                # Fin de la cadena
-                self.posicion += 1
-                self.columna += 1
-                lexema = self.codigo[inicio:self.posicion]
-                self.tokens.append(Token(lexema, 'CADENA', self.linea, col_inicio))
-                return
-            elif self.codigo[self.posicion] == '\n':
-                self._error_lexico("Cadena sin cerrar")
-                return
+        if tipo == 'CADENA':
+            self._emitir(TipoToken.CADENA, inicio, fin)
+            self.posicion = fin
+        elif tipo == 'CADENA_INCOMPLETA':
+            self.posicion = fin
+            self._error_lexico("Cadena sin cerrar")
+        else:
+            # El error se señala sobre el salto de línea o la barra invertida
+            self.posicion = fin - 1
+            if tipo == 'ESCAPE_FINAL':
+                self._error_lexico("Carácter de escape al final de la cadena")
             else:
-                self.posicion += 1
-                self.columna += 1
-        
-        self._error_lexico("Cadena sin cerrar")
+                self._error_lexico("Cadena sin cerrar")
 
-    def _analizar_comentario(self):
+    def _analizar_comentario(self, inicio: int, fin: int, tipo: str):
         """
-        Implementa el AFD para comentarios de línea (//) y de bloque (/* */).
-        
-        Tipos de comentarios:
-        1. Comentarios de línea (//):
-           - Consume todo hasta el fin de línea
-           - No requiere cierre explícito
+        Procesa un comentario de línea (//) o de bloque (/* */) reconocido por el AFD.
         
-        2. Comentarios de bloque (/* */):
-           - Puede abarcar múltiples líneas
-           - Requiere cierre explícito con */
-           - Detecta comentarios sin cerrar
-        
-        Manejo de errores:
-        - Detecta y reporta comentarios de bloque sin cerrar
-        - Evita el procesamiento del contenido como tokens en caso de error
+        Args:
+            inicio (int): Posición inicial del comentario
+            fin (int): Posición final (exclusiva) del comentario
+            tipo (str): 'COMENTARIO_LINEA', 'COMENTARIO_BLOQUE' o
+                        'COMENTARIO_SIN_CERRAR'
+        
+        Los comentarios de bloque pueden abarcar múltiples líneas. Un
+        comentario de bloque sin cerrar llega hasta el final del código y
+        se reporta como error en la posición donde se abre, sin procesar su
+        contenido como tokens.
         """
-        inicio = self.posicion
-        col_inicio = self.columna
-        
-        # Ya sabemos que tenemos '/' y hay un siguiente carácter
-        siguiente = self.codigo[self.posicion + 1]
-        
-        if siguiente == '/':  # Comentario de línea
-            # Consumir todo hasta el fin de línea
-            self.posicion += 2  # Saltar '//'
-            self.columna += 2
-            
-            while self.posicion < len(self.codigo) and self.codigo[self.posicion] != '\n':
-                self.posicion += 1
-                self.columna += 1
-            
-            lexema = self.codigo[inicio:self.posicion]
-            self.tokens.append(Token(lexema, 'COMENTARIO_LINEA', self.linea, col_inicio))
-            return
+        self.posicion = fin
+        if tipo == 'COMENTARIO_SIN_CERRAR':
+            self._emitir(TipoToken.ERROR_LEXICO, inicio, fin, "ERROR: Comentario de bloque sin cerrar")
+        else:
+            self._emitir(TipoToken[tipo], inicio, fin)
+
+    def _emitir(self, tipo: TipoToken, inicio: int, fin: int, lexema: str = None):
+        """
+        Agrega un token al resultado del análisis.
         
-        elif siguiente == '*':  # Comentario de bloque
-            self.posicion += 2  # Saltar '/*'
-            self.columna += 2
-            
-            # Buscar el cierre '*/'
-            while self.posicion < len(self.codigo) - 1:
-                if self.codigo[self.posicion] == '*' and self.posicion + 1 < len(self.codigo) and self.codigo[self.posicion + 1] == '/':
-                    # Encontramos el cierre
-                    self.posicion += 2  # Saltar '*/'
-                    self.columna += 2
-                    lexema = self.codigo[inicio:self.posicion]
-                    self.tokens.append(Token(lexema, 'COMENTARIO_BLOQUE', self.linea, col_inicio))
-                    return
-                
-                if self.codigo[self.posicion] == '\n':
-                    self.linea += 1
-                    self.columna = 1
-                else:
-                    self.columna += 1
-                
-                self.posicion += 1
-            
-            # Si llegamos aquí, no se encontró el cierre
-            self.tokens.append(Token(
-                f"ERROR: Comentario de bloque sin cerrar",
-                'ERROR_LEXICO',
-                self.linea,
-                col_inicio
-            ))
-            # Importante: avanzar hasta el final para no procesar el contenido como tokens
-            self.posicion = len(self.codigo)
+        Args:
+            tipo (TipoToken): Categoría del token
+            inicio (int): Posición inicial del lexema en el código, que da
+                          la fila y la columna del token
+            fin (int): Posición final (exclusiva) del lexema
+            lexema (str): Lexema explícito (mensajes de error); si se omite
+                          se usa el recorte del código entre inicio y fin
+        
+        En modo columnar el token se agrega a las columnas del TokenArray
+        sin crear un objeto ni copiar el lexema, y su fila y columna se
+        calculan recién cuando se consultan.
+        """
+        if self.columnar:
+            self.tokens.agregar(tipo, inicio, fin, lexema)
+        else:
+            if lexema is None:
+                lexema = self.codigo[inicio:fin]
+            lineas = self.lineas
+            if not lineas.desde <= inicio < lineas.hasta:
+                lineas.situar(inicio)
+            self.tokens.append(Token(lexema, tipo, lineas.fila_actual, inicio - lineas.origen))
 
     def _error_lexico(self, mensaje: str):
         """
@@ -493,17 +1441,17 @@ class AnalizadorLexico:
         
         Genera un token de error con:
         - Mensaje descriptivo del error
-        - Tipo 'ERROR_LEXICO'
+        - Tipo TipoToken.ERROR_LEXICO
         - Posición exacta (línea y columna) donde ocurrió el error
+        
+        El carácter en la posición del error se descarta.
         """
-        self.tokens.append(Token(
-            f"ERROR: {mensaje}",
-            'ERROR_LEXICO',
-            self.linea,
-            self.columna
-        ))
+        self._emitir(TipoToken.ERROR_LEXICO, self.posicion, self.posicion, f"ERROR: {mensaje}")
         self.posicion += 1
-        self.columna += 1
+
+    # Casos de prueba de los AFND: (válidos, inválidos)
+    CASOS_IDENTIFICADOR = (["variable", "_test", "x1"], ["1variable", "@var"])
+    CASOS_NUMERO = (["123", "123.456"], ["12.34.56", ".123", "123."])
 
     def probar_afnd(self):
         """
@@ -523,27 +1471,222 @@ class AnalizadorLexico:
         print("\n=== Pruebas del AFND para Identificadores ===")
         self.afnd_identificador.depurar_afnd()
         
+        validos, invalidos = self.CASOS_IDENTIFICADOR
+        
         # Probar casos válidos de identificadores
         print("\nPruebas de identificadores válidos:")
-        self.afnd_identificador.probar_cadena("variable")
-        self.afnd_identificador.probar_cadena("_test")
-        self.afnd_identificador.probar_cadena("x1")
+        for cadena in validos:
+            self.afnd_identificador.probar_cadena(cadena)
         
         # Probar casos inválidos de identificadores
         print("\nPruebas de identificadores inválidos:")
-        self.afnd_identificador.probar_cadena("1variable")  # No puede empezar con número
-        self.afnd_identificador.probar_cadena("@var")      # Carácter inválido
+        for cadena in invalidos:
+            self.afnd_identificador.probar_cadena(cadena)
         
         print("\n=== Pruebas del AFND para Números ===")
         self.afnd_numero.depurar_afnd()
         
+        validos, invalidos = self.CASOS_NUMERO
+        
         # Probar casos válidos de números
         print("\nPruebas de números válidos:")
-        self.afnd_numero.probar_cadena("123")
-        self.afnd_numero.probar_cadena("123.456")
+        for cadena in validos:
+            self.afnd_numero.probar_cadena(cadena)
         
         # Probar casos inválidos de números
         print("\nPruebas de números inválidos:")
-        self.afnd_numero.probar_cadena("12.34.56")  # Múltiples puntos
-        self.afnd_numero.probar_cadena(".123")      # Punto al inicio
-        self.afnd_numero.probar_cadena("123.")      # Punto al final 
\ No newline at end of file
+        for cadena in invalidos:
+            self.afnd_numero.probar_cadena(cadena)
+
+    def probar_minimizacion(self, cantidad_aleatorias: int = 2000, semilla: int = 0) -> bool:
+        """
+        Verifica que la minimización de Hopcroft conserva el lenguaje aceptado.
+        
+        Args:
+            cantidad_aleatorias (int): Número de cadenas aleatorias a probar por autómata
+            semilla (int): Semilla del generador aleatorio (para reproducibilidad)
+            
+        Returns:
+            bool: True si el AFD sin minimizar y el minimizado aceptan
+                  exactamente las mismas cadenas en todas las pruebas
+        
+        Para cada AFND (identificadores y números) compara ambos AFDs sobre:
+        - Los casos de prueba de probar_afnd
+        - Cadenas aleatorias construidas con el alfabeto del AFND y
+          algunos símbolos ajenos a él
+        
+        Muestra el número de estados antes y después de minimizar.
+        """
+        generador = random.Random(semilla)
+        correcto = True
+        automatas = [
+            ("Identificadores", self.afnd_identificador, self.CASOS_IDENTIFICADOR),
+            ("Números", self.afnd_numero, self.CASOS_NUMERO),
+            ("Analizador completo", self.afnd_lexico, ([], [])),
+        ]
+        
+        for nombre, afnd, (validos, invalidos) in automatas:
+            completo = afnd.compilar()
+            minimo = completo.minimizar()
+            print(f"\n=== Minimización del AFD de {nombre} ===")
+            print(f"Estados: {completo.n_estados} -> {minimo.n_estados} "
+                  f"(clases: {completo.n_clases} -> {minimo.n_clases})")
+            
+            simbolos = sorted(afnd.alfabeto) + ['@', ' ', '.', 'ñ']
+            for salidas in afnd.transiciones_clase.values():
+                for clase, _ in salidas:
+                    simbolos += clase.extremos()
+            cadenas = validos + invalidos + [
+                ''.join(generador.choice(simbolos) for _ in range(generador.randint(0, 12)))
+                for _ in range(cantidad_aleatorias)
+            ]
+            diferencias = [c for c in cadenas if completo.acepta(c) != minimo.acepta(c)]
+            
+            for cadena in diferencias[:5]:
+                print(f"Diferencia en '{cadena}'")
+            print(f"{len(cadenas)} cadenas probadas, {len(diferencias)} diferencias")
+            correcto = correcto and not diferencias
+        
+        return correcto
+
+    # Expresiones que probar_expresiones compara con `re` además de las de
+    # tabla_patrones: literales de Kotlin que la gramática aún no reconoce
+    EXPRESIONES_PRUEBA = [
+        r'0[xX][0-9a-fA-F](?:_?[0-9a-fA-F])*[uU]?[lL]?',
+        r'0[bB][01](?:_?[01])*[uU]?[lL]?',
+        r'\d(?:_?\d)*(?:\.\d(?:_?\d)*)?(?:[eE][+-]?\d+)?[fF]?',
+        r"'(?:[^'\\\n]|\\[tbnr'\"\\$]|\\u[0-9a-fA-F]{4})'",
+        r'`[^`\n]+`',
+        r'"""[\s\S]*?"""',
+    ]
+    
+    # Piezas con las que se arman expresiones aleatorias de prueba
+    ATOMOS_EXPRESION = ['a', 'b', 'c', '.', '[ab]', '[^a]', '[a-c]', r'\d', r'\w', r'\s', r'\.', 'ñ']
+    CUANTIFICADORES_EXPRESION = ['*', '+', '?', '{2}', '{1,3}', '{,2}', '{2,}', '*?']
+
+    def _expresion_aleatoria(self, generador, profundidad: int = 3) -> str:
+        """
+        Arma una expresión regular al azar.
+        
+        Args:
+            generador (random.Random): Generador de números aleatorios
+            profundidad (int): Anidamiento máximo de grupos
+            
+        Returns:
+            str: Expresión con concatenaciones, alternativas, grupos y
+                 cuantificadores sobre ATOMOS_EXPRESION
+        """
+        if profundidad == 0 or generador.random() < 0.3:
+            return generador.choice(self.ATOMOS_EXPRESION)
+        partes = [self._expresion_aleatoria(generador, profundidad - 1) for _ in range(generador.randint(1, 3))]
+        opcion = generador.randrange(3)
+        if opcion == 0:
+            return ''.join(partes)
+        if opcion == 1:
+            return '(?:' + '|'.join(partes) + ')'
+        return '(' + ''.join(partes) + ')' + generador.choice(self.CUANTIFICADORES_EXPRESION)
+
+    def probar_expresiones(self, cantidad_aleatorias: int = 300, cadenas_por_expresion: int = 300,
+                           semilla: int = 0) -> bool:
+        """
+        Verifica que los AFDs construidos desde expresiones regulares
+        reconocen lo mismo que el módulo `re`.
+        
+        Args:
+            cantidad_aleatorias (int): Número de expresiones aleatorias a probar
+            cadenas_por_expresion (int): Número de cadenas aleatorias por expresión
+            semilla (int): Semilla del generador aleatorio (para reproducibilidad)
+            
+        Returns:
+            bool: True si, para todas las expresiones y cadenas probadas, el
+                  AFD acepta la cadena exactamente cuando re.fullmatch coincide
+        
+        Prueba las expresiones de tabla_patrones, EXPRESIONES_PRUEBA y
+        expresiones aleatorias, con cadenas armadas con los símbolos de cada
+        AFND, los extremos de sus clases de caracteres y algunos caracteres
+        ajenos a él.
+        """
+        generador = random.Random(semilla)
+        expresiones = [patron for _, patron, _ in self.tabla_patrones()] + self.EXPRESIONES_PRUEBA
+        expresiones += [self._expresion_aleatoria(generador) for _ in range(cantidad_aleatorias)]
+        
+        diferencias = 0
+        for patron in expresiones:
+            afnd = afnd_desde_expresion(patron)
+            afd = afnd.compilar()
+            compilada = re.compile(patron)
+            
+            simbolos = sorted(s for s in afnd.alfabeto if s != afnd.otro) + ['@', ' ', '\n', 'ñ', '٣']
+            for salidas in afnd.transiciones_clase.values():
+                for clase, _ in salidas:
+                    simbolos += clase.extremos()
+            for _ in range(cadenas_por_expresion):
+                cadena = ''.join(generador.choice(simbolos) for _ in range(generador.randint(0, 12)))
+                if afd.acepta(cadena) != (compilada.fullmatch(cadena) is not None):
+                    diferencias += 1
+                    if diferencias <= 5:
+                        print(f"Diferencia en {patron!r} con {cadena!r}")
+        
+        print("\n=== Comparación de expresiones regulares con re ===")
+        print(f"{len(expresiones)} expresiones y {len(expresiones) * cadenas_por_expresion} "
+              f"cadenas probadas, {diferencias} diferencias")
+        return not diferencias
+
+    # Fragmentos con los que se arman códigos aleatorios de prueba
+    FRAGMENTOS_PRUEBA = [
+        'fun ', 'val ', 'x', '_y1', 'variable_larga', 'abc', ' ', '  ', '\t', '\n', '\r\n',
+        '0', '42', '3.14', '123.', '1.2.3', '.', '+', '-', '*', '/', '%', '=', '<', '>',
+        '!', '&', '|', '==', '<=', '=<', '+*', '-+', '>>>', '&&', '(', ')', '{', '}',
+        ',', ';', ':', '"', '"hola"', '"a\\"b"', '\\', '//', '// nota\n', '/*', '*/',
+        '/* bloque */', '@', '#', 'á', 'ñ', '　',
+    ]
+
+    def _codigo_aleatorio(self, generador, max_fragmentos: int = 40) -> str:
+        """
+        Arma un código de prueba concatenando fragmentos al azar.
+        
+        Args:
+            generador (random.Random): Generador de números aleatorios
+            max_fragmentos (int): Cantidad máxima de fragmentos a concatenar
+            
+        Returns:
+            str: Código con mezcla de tokens válidos, errores y casos límite
+        """
+        cantidad = generador.randint(0, max_fragmentos)
+        return ''.join(generador.choice(self.FRAGMENTOS_PRUEBA) for _ in range(cantidad))
+
+    def probar_backends(self, cantidad_aleatorias: int = 2000, semilla: int = 0) -> bool:
+        """
+        Verifica que los backends 'afd' y 'regex' producen los mismos tokens.
+        
+        Args:
+            cantidad_aleatorias (int): Número de códigos aleatorios a comparar
+            semilla (int): Semilla del generador aleatorio (para reproducibilidad)
+            
+        Returns:
+            bool: True si ambos backends generan exactamente la misma secuencia
+                  de tokens (lexema, tipo, fila y columna) en todas las pruebas
+        
+        Compara el archivo tests/ejemplos.kt (si existe) y códigos aleatorios
+        armados con FRAGMENTOS_PRUEBA, que incluyen errores léxicos, cadenas y
+        comentarios sin cerrar.
+        """
+        codigos = []
+        ejemplos = Path(__file__).resolve().parent.parent / 'tests' / 'ejemplos.kt'
+        if ejemplos.exists():
+            codigos.append(ejemplos.read_text(encoding='utf-8'))
+        generador = random.Random(semilla)
+        codigos += [self._codigo_aleatorio(generador) for _ in range(cantidad_aleatorias)]
+        
+        analizadores = [AnalizadorLexico(self.minimizar, backend) for backend in self.BACKENDS]
+        diferencias = 0
+        for codigo in codigos:
+            resultados = [[str(token) for token in a.analizar(codigo)] for a in analizadores]
+            if any(resultado != resultados[0] for resultado in resultados[1:]):
+                diferencias += 1
+                if diferencias <= 5:
+                    print(f"Diferencia en {codigo!r}")
+        
+        print(f"\n=== Comparación de backends {', '.join(self.BACKENDS)} ===")
+        print(f"{len(codigos)} códigos probados, {diferencias} diferencias")
+        return not diferencias
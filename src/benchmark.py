@@ -0,0 +1,1222 @@
+"""
+Módulo de mediciones de rendimiento.
+Este módulo compara los formatos de serialización de tokens (tiempo de
+escritura y de lectura, y tamaño del archivo resultante), mide el costo de
+crear un analizador con y sin los autómatas memorizados, el de la
+construcción por subconjuntos sobre un AFND sintético grande, el de un AFD
+de identificadores con todas las letras Unicode, el de compilar cada
+expresión regular de la gramática, el del AFD perezoso frente a la
+construcción completa en un AFND cuyo AFD crece exponencialmente y el del
+escáner generado frente al recorrido interpretado del mismo AFD, el
+costo del modo de perfilado del analizador, activo y desactivado, y el de
+clasificar lexemas como palabras clave con distintas estructuras.
+
+La suite mide el análisis completo sobre corpus sintéticos (ver corpus.py)
+de varios tamaños y perfiles con cada backend, guarda los resultados en
+JSON y `comparar` falla si un resultado nuevo empeora más que un umbral.
+
+    python -m src.benchmark serializacion [archivo.kt] [--repeticiones N] [--copias N]
+    python -m src.benchmark arranque [--repeticiones N]
+    python -m src.benchmark subconjuntos [--palabras N] [--simbolos N] [--referencia]
+    python -m src.benchmark clases [--por-caracter]
+    python -m src.benchmark expresiones [--repeticiones N] [--minimizar]
+    python -m src.benchmark perezoso [--n N] [--caracteres N] [--capacidad N] [--proporcion-a P] [--completo]
+    python -m src.benchmark generado [archivo.kt] [--copias N] [--repeticiones N] [--minimizar]
+    python -m src.benchmark perfilado [archivo.kt] [--copias N] [--repeticiones N] [--backend B] [--volcar RUTA]
+    python -m src.benchmark palabras [--cantidad N] [--proporcion P] [--repeticiones N]
+    python -m src.benchmark suite [--tamanos 1K,1M,...] [--perfiles ...] [--backends ...] [-o resultados.json]
+    python -m src.benchmark comparar <base.json> <nuevo.json> [--umbral 0.1]
+"""
+
+import argparse
+import contextlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from .afnd import AFND
+from .afd_perezoso import AFDPerezoso
+from .caracteres import ClaseCaracteres
+from .analizador_lexico import AnalizadorLexico
+from .expresiones import afnd_desde_expresion, afnd_desde_tabla
+from .generador import cargar_escaner, generar_escaner
+from .corpus import PERFILES, generar_corpus, leer_tamano
+from .token import TipoToken
+from . import serializacion
+
+try:
+    import resource
+except ImportError:  # Windows: sin memoria residente máxima
+    resource = None
+
+# Código de ejemplo que se usa si no se indica un archivo
+EJEMPLO = Path(__file__).resolve().parent.parent / 'tests' / 'ejemplos.kt'
+
+def medir_serializacion(codigo: str, repeticiones: int = 3) -> list:
+    """
+    Mide la escritura y la lectura de los tokens de un código en cada formato.
+
+    Args:
+        codigo (str): Código Kotlin cuyos tokens se serializan
+        repeticiones (int): Veces que se repite cada medición; se informa la
+                            más rápida
+
+    Returns:
+        list: Un diccionario por formato con las claves 'formato', 'tokens',
+              'bytes', 'escritura_s', 'lectura_s' y 'tokens_por_s' (de escritura)
+
+    Los registros se calculan una sola vez antes de medir, para que el
+    tiempo de escritura no incluya el análisis léxico.
+    """
+    registros = list(AnalizadorLexico().iter_tokens(codigo, posiciones=True))
+    resultados = []
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato, (escribir, leer, _) in serializacion.FORMATOS.items():
+            ruta = os.path.join(directorio, f'tokens.{formato}')
+            
+            escritura = lectura = float('inf')
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                with serializacion.abrir(ruta, formato, 'w') as archivo:
+                    escribir(registros, archivo)
+                escritura = min(escritura, time.perf_counter() - inicio)
+                
+                inicio = time.perf_counter()
+                with serializacion.abrir(ruta, formato) as archivo:
+                    leidos = sum(1 for _ in leer(archivo))
+                lectura = min(lectura, time.perf_counter() - inicio)
+            
+            if leidos != len(registros):
+                raise RuntimeError(f"El formato {formato} leyó {leidos} de {len(registros)} registros")
+            
+            resultados.append({
+                'formato': formato,
+                'tokens': len(registros),
+                'bytes': os.path.getsize(ruta),
+                'escritura_s': escritura,
+                'lectura_s': lectura,
+                'tokens_por_s': len(registros) / max(escritura, 1e-9),
+            })
+    return resultados
+
+def imprimir_serializacion(resultados: list):
+    """
+    Imprime una tabla con los resultados de medir_serializacion.
+
+    Args:
+        resultados (list): Resultados de medir_serializacion
+    """
+    print(f"{'Formato':<10}{'Tokens':>10}{'Bytes':>12}{'B/token':>9}"
+          f"{'Escritura (s)':>15}{'Lectura (s)':>13}{'Tokens/s':>12}")
+    for fila in resultados:
+        print(f"{fila['formato']:<10}{fila['tokens']:>10}{fila['bytes']:>12}"
+              f"{fila['bytes'] / max(fila['tokens'], 1):>9.1f}{fila['escritura_s']:>15.4f}"
+              f"{fila['lectura_s']:>13.4f}{fila['tokens_por_s']:>12.0f}")
+
+def _vaciar_automatas():
+    """
+    Descarta los autómatas memorizados en el proceso, como al arrancar.
+    """
+    AnalizadorLexico._automatas.clear()
+    AFND.vaciar_cache()
+
+def medir_arranque(repeticiones: int = 5, minimizar: bool = False) -> list:
+    """
+    Mide el tiempo de crear un AnalizadorLexico según de dónde salgan sus autómatas.
+
+    Args:
+        repeticiones (int): Veces que se repite cada medición; se informa la
+                            más rápida
+        minimizar (bool): Se pasa a AnalizadorLexico
+
+    Returns:
+        list: Un diccionario por modo con las claves 'modo', 'segundos' y
+              'aceleracion' (respecto de construirlos desde cero). Los modos son:
+              - 'construccion': sin autómatas memorizados, como el primer
+                analizador de un proceso sin cache_afd
+              - 'cache_afd': leyéndolos de un directorio cache_afd, como el
+                primer analizador de un proceso de trabajo
+              - 'memoria': memorizados en el proceso, como los siguientes
+              - 'probar_cadena': una llamada a AFND.probar_cadena sobre el
+                AFND de números, con su AFD ya memorizado
+    """
+    tiempos = dict.fromkeys(('construccion', 'cache_afd', 'memoria', 'probar_cadena'), float('inf'))
+
+    def medir(modo, funcion):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos[modo] = min(tiempos[modo], time.perf_counter() - inicio)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        _vaciar_automatas()
+        analizador = AnalizadorLexico(minimizar, cache_afd=directorio)
+        for _ in range(repeticiones):
+            _vaciar_automatas()
+            medir('construccion', lambda: AnalizadorLexico(minimizar))
+            _vaciar_automatas()
+            medir('cache_afd', lambda: AnalizadorLexico(minimizar, cache_afd=directorio))
+            medir('memoria', lambda: AnalizadorLexico(minimizar))
+            
+            # probar_cadena imprime el recorrido; se descarta la salida
+            with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+                medir('probar_cadena', lambda: analizador.afnd_numero.probar_cadena('123.45'))
+
+    base = tiempos['construccion']
+    return [
+        {'modo': modo, 'segundos': segundos, 'aceleracion': base / max(segundos, 1e-9)}
+        for modo, segundos in tiempos.items()
+    ]
+
+def imprimir_arranque(resultados: list):
+    """
+    Imprime una tabla con los resultados de medir_arranque.
+
+    Args:
+        resultados (list): Resultados de medir_arranque
+    """
+    print(f"{'Modo':<16}{'Tiempo (ms)':>13}{'Aceleración':>13}")
+    for fila in resultados:
+        print(f"{fila['modo']:<16}{fila['segundos'] * 1000:>13.3f}{fila['aceleracion']:>12.1f}x")
+
+def afnd_sintetico(palabras: int = 300, simbolos: int = 2000, semilla: int = 0) -> AFND:
+    """
+    Construye un AFND grande para medir la construcción por subconjuntos.
+
+    Args:
+        palabras (int): Cantidad de palabras que reconoce
+        simbolos (int): Tamaño del alfabeto; se toman caracteres CJK
+                        consecutivos a partir de U+4E00
+        semilla (int): Semilla de las palabras aleatorias
+
+    Returns:
+        AFND: Reconoce una o más palabras seguidas (w1|w2|...)+, con un
+              estado por carácter unido por transiciones epsilon al
+              siguiente, como en una construcción de Thompson. Tiene del
+              orden de 10 estados por palabra
+    """
+    generador = random.Random(semilla)
+    alfabeto = [chr(0x4E00 + indice) for indice in range(simbolos)]
+    afnd = AFND()
+    afnd.establecer_estado_inicial('q0')
+    estados = 0
+    for _ in range(palabras):
+        anterior = 'q0'
+        for caracter in generador.choices(alfabeto, k=generador.randint(2, 8)):
+            origen, destino = f'q{estados + 1}', f'q{estados + 2}'
+            estados += 2
+            afnd.agregar_transicion(anterior, afnd.epsilon, origen)
+            afnd.agregar_transicion(origen, caracter, destino)
+            anterior = destino
+        afnd.agregar_estado_final(anterior, 'PALABRA')
+        afnd.agregar_transicion(anterior, afnd.epsilon, 'q0')
+    for caracter in alfabeto:
+        afnd.agregar_simbolo(caracter)
+    return afnd
+
+def _subconjuntos_por_simbolo(afnd: AFND) -> tuple:
+    """
+    Construcción por subconjuntos directa, de referencia: prueba cada
+    símbolo del alfabeto con mover y epsilon_clausura desde cada estado.
+
+    Args:
+        afnd (AFND): Autómata a convertir
+
+    Returns:
+        tuple: El mismo resultado que AFND.convertir_a_afd
+    """
+    estado_inicial_afd = frozenset(afnd.epsilon_clausura(afnd.estado_inicial))
+    estados_afd = {estado_inicial_afd}
+    estados_por_procesar = [estado_inicial_afd]
+    transiciones_afd = {}
+    estados_finales_afd = set()
+    if any(estado in afnd.estados_finales for estado in estado_inicial_afd):
+        estados_finales_afd.add(estado_inicial_afd)
+
+    while estados_por_procesar:
+        estado_actual = estados_por_procesar.pop()
+        for simbolo in afnd.alfabeto:
+            siguiente = set()
+            for estado in estado_actual:
+                siguiente.update(afnd.mover(estado, simbolo))
+            siguiente = frozenset(afnd.epsilon_clausura(siguiente))
+            if siguiente:
+                transiciones_afd[(estado_actual, simbolo)] = siguiente
+                if siguiente not in estados_afd:
+                    estados_afd.add(siguiente)
+                    estados_por_procesar.append(siguiente)
+                if any(estado in afnd.estados_finales for estado in siguiente):
+                    estados_finales_afd.add(siguiente)
+    return estados_afd, estado_inicial_afd, transiciones_afd, estados_finales_afd
+
+def medir_subconjuntos(palabras: int = 300, simbolos: int = 2000, referencia: bool = False) -> dict:
+    """
+    Mide la construcción por subconjuntos y la compilación sobre afnd_sintetico.
+
+    Args:
+        palabras (int): Se pasa a afnd_sintetico
+        simbolos (int): Se pasa a afnd_sintetico
+        referencia (bool): Si es True también se mide _subconjuntos_por_simbolo
+                           y se verifica que dé el mismo AFD
+
+    Returns:
+        dict: Claves 'estados_afnd', 'simbolos', 'estados_afd',
+              'subconjuntos_s', 'compilacion_s' y, con referencia,
+              'referencia_s' y 'aceleracion'
+
+    Raises:
+        RuntimeError: Si la referencia no coincide con convertir_a_afd
+    """
+    afnd = afnd_sintetico(palabras, simbolos)
+    AFND.vaciar_cache()
+
+    inicio = time.perf_counter()
+    afd = afnd.convertir_a_afd()
+    subconjuntos = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    afnd.compilar()
+    compilacion = time.perf_counter() - inicio
+
+    resultado = {
+        'estados_afnd': len(afnd.estados),
+        'simbolos': len(afnd.alfabeto),
+        'estados_afd': len(afd[0]),
+        'subconjuntos_s': subconjuntos,
+        'compilacion_s': compilacion,
+    }
+    if referencia:
+        inicio = time.perf_counter()
+        esperado = _subconjuntos_por_simbolo(afnd)
+        resultado['referencia_s'] = time.perf_counter() - inicio
+        resultado['aceleracion'] = resultado['referencia_s'] / max(subconjuntos, 1e-9)
+        if esperado != afd:
+            raise RuntimeError("La construcción por subconjuntos no coincide con la de referencia")
+    return resultado
+
+def imprimir_subconjuntos(resultado: dict):
+    """
+    Imprime los resultados de medir_subconjuntos.
+
+    Args:
+        resultado (dict): Resultado de medir_subconjuntos
+    """
+    print(f"AFND: {resultado['estados_afnd']} estados, {resultado['simbolos']} símbolos; "
+          f"AFD: {resultado['estados_afd']} estados")
+    print(f"Construcción por subconjuntos: {resultado['subconjuntos_s']:.3f} s")
+    print(f"Compilación (con el AFD memorizado): {resultado['compilacion_s']:.3f} s")
+    if 'referencia_s' in resultado:
+        print(f"Referencia símbolo por símbolo: {resultado['referencia_s']:.3f} s "
+              f"({resultado['aceleracion']:.1f}x)")
+
+def afnd_identificador_unicode(por_caracter: bool = False) -> AFND:
+    """
+    Construye el AFND de identificadores con letras y dígitos Unicode.
+
+    Args:
+        por_caracter (bool): Si es True agrega una transición por carácter,
+                             como antes de las clases de caracteres. En ese
+                             caso se omite la letra 'ε', que el AFND tomaría
+                             como transición epsilon
+
+    Returns:
+        AFND: Reconoce (letra|_)(letra|dígito|_)*, donde las letras son las
+              categorías L* y Nl y los dígitos la categoría Nd
+    """
+    primeros = ClaseCaracteres.categorias('L', 'Nl') | ClaseCaracteres('_')
+    siguientes = primeros | ClaseCaracteres.categorias('Nd')
+    afnd = AFND()
+    afnd.establecer_estado_inicial('q0')
+    afnd.agregar_estado_final('q1', 'IDENTIFICADOR')
+    if not por_caracter:
+        afnd.agregar_transicion('q0', primeros, 'q1')
+        afnd.agregar_transicion('q1', siguientes, 'q1')
+        return afnd
+    for origen, clase in (('q0', primeros), ('q1', siguientes)):
+        for inicio, fin in clase.intervalos:
+            for punto in range(inicio, fin + 1):
+                if chr(punto) != afnd.epsilon:
+                    afnd.agregar_transicion(origen, chr(punto), 'q1')
+    return afnd
+
+def medir_clases(por_caracter: bool = False) -> list:
+    """
+    Mide la construcción y compilación del AFND de afnd_identificador_unicode.
+
+    Args:
+        por_caracter (bool): Si es True también se mide la variante con una
+                             transición por carácter
+
+    Returns:
+        list: Un diccionario por variante ('intervalos' y, si se pidió,
+              'por_caracter') con las claves 'variante', 'segundos',
+              'memoria_pico' (bytes, con tracemalloc), 'clases_afd',
+              'claves' (entradas del diccionario de clases) e 'intervalos'
+
+    Raises:
+        RuntimeError: Si las variantes no aceptan las mismas cadenas de prueba
+    """
+    ClaseCaracteres.categorias('L')  # la tabla de categorías se calcula una vez por proceso
+    muestras = ['x', 'número', 'переменная', '変数1', '_', '1a', 'a-b', 'ǅx٣', '']
+    resultados = []
+    aceptadas = None
+    for variante in ('intervalos', 'por_caracter')[:2 if por_caracter else 1]:
+        AFND.vaciar_cache()
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        afd = afnd_identificador_unicode(variante == 'por_caracter').compilar()
+        segundos = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        aceptacion = [afd.acepta(muestra) for muestra in muestras]
+        if aceptadas is not None and aceptacion != aceptadas:
+            raise RuntimeError("Las variantes del AFD de identificadores no coinciden")
+        aceptadas = aceptacion
+        resultados.append({
+            'variante': variante,
+            'segundos': segundos,
+            'memoria_pico': pico,
+            'clases_afd': afd.n_clases,
+            'claves': len(afd.clases),
+            'intervalos': len(afd.clases.intervalos),
+        })
+    return resultados
+
+def imprimir_clases(resultados: list):
+    """
+    Imprime una tabla con los resultados de medir_clases.
+
+    Args:
+        resultados (list): Resultados de medir_clases
+    """
+    print(f"{'Variante':<14}{'Tiempo (s)':>12}{'Memoria (MB)':>14}{'Clases':>8}{'Claves':>9}{'Intervalos':>12}")
+    for fila in resultados:
+        print(f"{fila['variante']:<14}{fila['segundos']:>12.3f}{fila['memoria_pico'] / 1e6:>14.2f}"
+              f"{fila['clases_afd']:>8}{fila['claves']:>9}{fila['intervalos']:>12}")
+
+def medir_expresiones(repeticiones: int = 5, minimizar: bool = False) -> list:
+    """
+    Mide el costo de compilar cada expresión regular de la gramática.
+
+    Args:
+        repeticiones (int): Veces que se repite cada medición; se informa la
+                            más rápida
+        minimizar (bool): Se pasa a AFND.compilar
+
+    Returns:
+        list: Un diccionario por expresión (las de tabla_patrones, con su
+              tipo como nombre, y las de EXPRESIONES_PRUEBA) y uno final
+              'tabla' con el AFND unificado, con las claves 'nombre',
+              'construccion' (segundos de leer la expresión y construir el
+              AFND con Thompson), 'compilacion' (segundos de convertirlo en
+              AFD, sin memorizar), 'estados_afnd' y 'estados_afd'
+    """
+    analizador = AnalizadorLexico()
+    tabla = analizador.tabla_patrones()
+    expresiones = [(tipo, patron) for tipo, patron, _ in tabla]
+    expresiones += [(f"prueba {indice}", patron) for indice, patron in enumerate(analizador.EXPRESIONES_PRUEBA, 1)]
+    expresiones.append(('tabla', None))
+
+    resultados = []
+    for nombre, patron in expresiones:
+        construccion = compilacion = float('inf')
+        for _ in range(repeticiones):
+            AFND.vaciar_cache()
+            inicio = time.perf_counter()
+            afnd = afnd_desde_tabla(tabla) if patron is None else afnd_desde_expresion(patron)
+            medio = time.perf_counter()
+            afd = afnd.compilar(minimizar)
+            fin = time.perf_counter()
+            construccion = min(construccion, medio - inicio)
+            compilacion = min(compilacion, fin - medio)
+        resultados.append({
+            'nombre': nombre,
+            'construccion': construccion,
+            'compilacion': compilacion,
+            'estados_afnd': len(afnd.estados),
+            'estados_afd': afd.n_estados,
+        })
+    return resultados
+
+def imprimir_expresiones(resultados: list):
+    """
+    Imprime una tabla con los resultados de medir_expresiones.
+
+    Args:
+        resultados (list): Resultados de medir_expresiones
+    """
+    print(f"{'Expresión':<24}{'Thompson (ms)':>15}{'Compilación (ms)':>18}{'AFND':>7}{'AFD':>6}")
+    for fila in resultados:
+        print(f"{fila['nombre']:<24}{fila['construccion'] * 1e3:>15.3f}{fila['compilacion'] * 1e3:>18.3f}"
+              f"{fila['estados_afnd']:>7}{fila['estados_afd']:>6}")
+
+def medir_perezoso(n: int = 14, caracteres: int = 200000, capacidad: int = None,
+                   completo: bool = False, proporcion_a: float = 0.02, semilla: int = 0) -> list:
+    """
+    Compara el AFD perezoso con la construcción por subconjuntos completa.
+
+    Args:
+        n (int): El AFND reconoce (a|b)*a(a|b){n}, cuyo AFD tiene 2^(n+1)
+                 estados: recuerda los últimos n+1 caracteres
+        caracteres (int): Longitud del texto aleatorio de a y b recorrido
+        proporcion_a (float): Probabilidad de cada 'a' del texto. Con pocas,
+                              como en un código real, el texto visita una
+                              fracción pequeña de los estados; con 0.5
+                              los visita todos y la caché se agota
+        capacidad (int): Capacidad del AFD perezoso (por defecto, la de AFDPerezoso)
+        completo (bool): Si es True también se construye el AFD completo,
+                         que tarda y ocupa memoria exponencial en n
+        semilla (int): Semilla del texto aleatorio
+
+    Returns:
+        list: Un diccionario por variante ('perezoso' y, si se pidió,
+              'completo') con las claves 'variante', 'construccion' y
+              'recorrido' (segundos), 'estados' (materializados o totales) y,
+              para el perezoso, 'estadisticas' (ver AFDPerezoso.estadisticas)
+
+    Raises:
+        RuntimeError: Si alguna variante no reconoce el lexema esperado
+    """
+    afnd = afnd_desde_tabla([('A', f'(?:a|b)*a(?:a|b){{{n}}}', 0)])
+    generador = random.Random(semilla)
+    texto = ''.join('a' if generador.random() < proporcion_a else 'b' for _ in range(caracteres))
+    ultima_a = texto.rfind('a', 0, max(len(texto) - n, 0))
+    esperado = ultima_a + n + 1 if ultima_a >= 0 else None
+
+    resultados = []
+    inicio = time.perf_counter()
+    perezoso = AFDPerezoso(afnd, capacidad)
+    medio = time.perf_counter()
+    tipo, fin, _ = perezoso.reconocer(texto, 0)
+    final = time.perf_counter()
+    if (fin if tipo is not None else None) != esperado:
+        raise RuntimeError("El AFD perezoso no reconoce el lexema esperado")
+    resultados.append({
+        'variante': 'perezoso',
+        'construccion': medio - inicio,
+        'recorrido': final - medio,
+        'estados': perezoso.estadisticas()['estados'],
+        'estadisticas': perezoso.estadisticas(),
+    })
+
+    if completo:
+        AFND.vaciar_cache()
+        inicio = time.perf_counter()
+        afd = afnd.compilar()
+        medio = time.perf_counter()
+        tabla, n_clases, clases = afd.tabla, afd.n_clases, afd.clases
+        estado = afd.estado_inicial
+        fin = None
+        for indice, caracter in enumerate(texto):
+            estado = tabla[estado * n_clases + clases.get(caracter, 0)]
+            if afd.es_final(estado):
+                fin = indice + 1
+        final = time.perf_counter()
+        if fin != esperado:
+            raise RuntimeError("El AFD completo no reconoce el lexema esperado")
+        resultados.append({
+            'variante': 'completo',
+            'construccion': medio - inicio,
+            'recorrido': final - medio,
+            'estados': afd.n_estados,
+        })
+    return resultados
+
+def imprimir_perezoso(resultados: list):
+    """
+    Imprime una tabla con los resultados de medir_perezoso.
+
+    Args:
+        resultados (list): Resultados de medir_perezoso
+    """
+    print(f"{'Variante':<12}{'Construcción (s)':>18}{'Recorrido (s)':>15}{'Estados':>10}")
+    for fila in resultados:
+        print(f"{fila['variante']:<12}{fila['construccion']:>18.3f}{fila['recorrido']:>15.3f}{fila['estados']:>10}")
+    for fila in resultados:
+        if 'estadisticas' in fila:
+            print("Caché del AFD perezoso: " + ", ".join(f"{clave} {valor}" for clave, valor in fila['estadisticas'].items()))
+
+def escanear_interpretado(afd, codigo: str):
+    """
+    Recorre todo el código con el AFD compilado, como el escáner generado.
+
+    Args:
+        afd (AFDCompilado): AFD unificado del analizador
+        codigo (str): Código a recorrer
+
+    Yields:
+        tuple: (tipo, inicio, fin) como `escanear` del módulo generado
+    """
+    tabla, n_clases, clases, tipos = afd.tabla, afd.n_clases, afd.clases, afd.tipos
+    clases.resolver(codigo)
+    n = len(codigo)
+    posicion = 0
+    while posicion < n:
+        estado = afd.estado_inicial
+        tipo = None
+        fin = posicion
+        for indice in range(posicion, n):
+            estado = tabla[estado * n_clases + clases.get(codigo[indice], 0)]
+            if not estado:
+                break
+            if tipos[estado] is not None:
+                tipo = tipos[estado]
+                fin = indice + 1
+        if tipo is None or fin == posicion:
+            yield None, posicion, posicion + 1
+            posicion += 1
+        else:
+            yield tipo, posicion, fin
+            posicion = fin
+
+def medir_generado(codigo: str, repeticiones: int = 1, minimizar: bool = False) -> list:
+    """
+    Compara el escáner generado con el recorrido interpretado del AFD.
+
+    Args:
+        codigo (str): Código Kotlin a recorrer
+        repeticiones (int): Repeticiones de cada medición; se toma la mejor
+        minimizar (bool): Si es True se usa el AFD minimizado
+
+    Returns:
+        list: Un diccionario por variante ('interpretado' y 'generado') con
+              las claves 'variante', 'segundos', 'tokens' y 'mb_por_segundo'.
+              El del generado incluye 'generacion': segundos para generar y
+              cargar el módulo
+
+    Raises:
+        RuntimeError: Si las dos variantes no producen los mismos lexemas
+    """
+    analizador = AnalizadorLexico(minimizar=minimizar)
+    afd = analizador.afd_lexico
+    inicio = time.perf_counter()
+    escaner = cargar_escaner(generar_escaner(afd, analizador.huella()))
+    generacion = time.perf_counter() - inicio
+    megabytes = len(codigo.encode('utf-8')) / 1e6
+
+    resultados = []
+    resumenes = []
+    for variante, escanear in (('interpretado', lambda: escanear_interpretado(afd, codigo)),
+                               ('generado', lambda: escaner.escanear(codigo))):
+        mejor = float('inf')
+        for _ in range(repeticiones):
+            # Se resume cada recorrido (tokens por tipo y suma de los finales)
+            # para compararlos sin guardar millones de tuplas
+            tipos = Counter()
+            suma = 0
+            inicio = time.perf_counter()
+            for tipo, _, fin in escanear():
+                tipos[tipo] += 1
+                suma += fin
+            mejor = min(mejor, time.perf_counter() - inicio)
+        resumenes.append((tipos, suma))
+        resultados.append({
+            'variante': variante,
+            'segundos': mejor,
+            'tokens': sum(tipos.values()),
+            'mb_por_segundo': megabytes / max(mejor, 1e-9),
+        })
+    if resumenes[0] != resumenes[1]:
+        raise RuntimeError("El escáner generado no reconoce los mismos lexemas que el AFD")
+    resultados[1]['generacion'] = generacion
+    return resultados
+
+def imprimir_generado(resultados: list):
+    """
+    Imprime una tabla con los resultados de medir_generado.
+
+    Args:
+        resultados (list): Resultados de medir_generado
+    """
+    print(f"{'Variante':<14}{'Tiempo (s)':>12}{'Tokens':>12}{'MB/s':>10}{'Aceleración':>14}")
+    base = resultados[0]['segundos']
+    for fila in resultados:
+        print(f"{fila['variante']:<14}{fila['segundos']:>12.3f}{fila['tokens']:>12}"
+              f"{fila['mb_por_segundo']:>10.2f}{base / max(fila['segundos'], 1e-9):>13.2f}x")
+    for fila in resultados:
+        if 'generacion' in fila:
+            print(f"Generación y carga del módulo: {fila['generacion'] * 1e3:.1f} ms")
+
+def medir_perfilado(codigo: str, repeticiones: int = 5, backend: str = 'afd') -> tuple:
+    """
+    Mide el costo del modo de perfilado de AnalizadorLexico.
+
+    Args:
+        codigo (str): Código Kotlin a analizar
+        repeticiones (int): Repeticiones de cada medición; se toma la mejor
+        backend (str): Backend del analizador
+
+    Returns:
+        tuple: (resultados, perfil). `resultados` tiene un diccionario por
+        variante con las claves 'variante', 'segundos' y 'sobrecosto'
+        (relativo a 'sin perfilado'):
+        - 'sin perfilado': un analizador que nunca lo activó
+        - 'desactivado': un analizador que lo activó y lo desactivó, que
+          debe costar lo mismo
+        - 'activo': con el perfilado activo
+        `perfil` es el PerfilAnalisis de un análisis con el perfilado activo
+    """
+    base = AnalizadorLexico(backend=backend)
+    desactivado = AnalizadorLexico(backend=backend, perfilar=True)
+    desactivado.desactivar_perfilado()
+    activo = AnalizadorLexico(backend=backend, perfilar=True)
+
+    tiempos = {}
+    variantes = (('sin perfilado', base), ('desactivado', desactivado), ('activo', activo))
+    for _ in range(repeticiones):
+        # Alternar las variantes reparte entre ellas el ruido de la máquina
+        for variante, analizador in variantes:
+            if analizador is activo:
+                analizador.activar_perfilado()
+            inicio = time.perf_counter()
+            analizador.analizar(codigo)
+            duracion = time.perf_counter() - inicio
+            tiempos[variante] = min(tiempos.get(variante, float('inf')), duracion)
+    referencia = tiempos['sin perfilado']
+    resultados = [
+        {'variante': variante, 'segundos': segundos, 'sobrecosto': segundos / referencia - 1}
+        for variante, segundos in tiempos.items()
+    ]
+    return resultados, activo.perfil
+
+def imprimir_perfilado(resultados: list, perfil):
+    """
+    Imprime los resultados de medir_perfilado.
+
+    Args:
+        resultados (list): Resultados de medir_perfilado
+        perfil (PerfilAnalisis): Mediciones del análisis con perfilado
+    """
+    print(f"{'Variante':<16}{'Tiempo (s)':>12}{'Sobrecosto':>12}")
+    for fila in resultados:
+        print(f"{fila['variante']:<16}{fila['segundos']:>12.3f}{fila['sobrecosto'] * 100:>11.1f}%")
+    print()
+    print(perfil)
+
+def construir_hash_perfecto(palabras, intentos: int = 200, semilla: int = 0) -> tuple:
+    """
+    Busca una función de hash perfecta para un conjunto de palabras.
+
+    Args:
+        palabras: Palabras de al menos dos caracteres
+        intentos (int): Multiplicadores al azar que se prueban por cada
+                        tamaño de tabla antes de pasar al siguiente
+        semilla (int): Semilla del generador de multiplicadores
+
+    Returns:
+        tuple: (a, b, c, m) tales que
+        (len(p) + a * ord(p[0]) + b * ord(p[-2]) + c * ord(p[-1])) % m es
+        distinto para cada palabra, con m el primer tamaño de tabla (desde
+        la cantidad de palabras) para el que se encontraron multiplicadores
+
+    Raises:
+        ValueError: Si no se encontró ninguna con tablas de hasta 64 veces
+                    la cantidad de palabras
+
+    La clave son el largo y el primer, penúltimo y último carácter: con
+    solo el largo y los extremos 'private' y 'package' (y 'where' y
+    'while') chocan entre sí.
+    """
+    claves = [(len(palabra), ord(palabra[0]), ord(palabra[-2]), ord(palabra[-1])) for palabra in palabras]
+    generador = random.Random(semilla)
+    for m in range(len(claves), 64 * len(claves)):
+        for _ in range(intentos):
+            a, b, c = (generador.randrange(1, m) for _ in range(3))
+            indices = {(largo + a * primero + b * penultimo + c * ultimo) % m
+                       for largo, primero, penultimo, ultimo in claves}
+            if len(indices) == len(claves):
+                return a, b, c, m
+    raise ValueError("No se encontró una función de hash perfecta")
+
+def texto_palabras_clave(analizador: AnalizadorLexico, cantidad: int = 200000, proporcion: float = 0.7,
+                         semilla: int = 0) -> list:
+    """
+    Genera una secuencia de lexemas densa en palabras clave.
+
+    Args:
+        analizador (AnalizadorLexico): Analizador del que se toman las palabras clave
+        cantidad (int): Cantidad de lexemas
+        proporcion (float): Proporción de palabras clave; el resto son identificadores
+        semilla (int): Semilla del generador aleatorio
+
+    Returns:
+        list: Lexemas, como los que recibe _analizar_identificador
+    """
+    generador = random.Random(semilla)
+    palabras = sorted(analizador._palabras_clave)
+    nombres = ['x', 'i', 'valor', 'total', 'lista', 'nombre', 'usuario', 'resultado', 'getX', 'dato1']
+    return [generador.choice(palabras) if generador.random() < proporcion else generador.choice(nombres)
+            for _ in range(cantidad)]
+
+def medir_palabras_clave(cantidad: int = 200000, proporcion: float = 0.7, repeticiones: int = 5) -> list:
+    """
+    Compara estructuras para clasificar un lexema como palabra clave.
+
+    Args:
+        cantidad (int): Lexemas clasificados en cada medición
+        proporcion (float): Proporción de palabras clave entre los lexemas
+        repeticiones (int): Repeticiones de cada medición; se toma la mejor
+
+    Returns:
+        list: Un diccionario por variante con las claves 'variante',
+        'segundos' y 'ns_por_lexema':
+        - 'conjuntos': pertenencia a los conjuntos de palabras duras,
+          suaves y modificadores, en ese orden
+        - 'diccionario': una búsqueda en {palabra: TipoToken}, la que usa
+          el analizador
+        - 'hash perfecto': índice calculado con construir_hash_perfecto y
+          una comparación de cadenas; incluye además 'tabla' (su tamaño) y
+          'palabras'
+
+    Raises:
+        AssertionError: Si las variantes no clasifican igual
+    """
+    analizador = AnalizadorLexico()
+    lexemas = texto_palabras_clave(analizador, cantidad, proporcion)
+    reservadas, suaves, modificadores = (analizador.palabras_reservadas, analizador.palabras_suaves,
+                                         analizador.modificadores)
+    palabras_clave = analizador._palabras_clave
+    a, b, c, m = construir_hash_perfecto(palabras_clave)
+    tabla = [None] * m
+    for palabra, tipo in palabras_clave.items():
+        tabla[(len(palabra) + a * ord(palabra[0]) + b * ord(palabra[-2]) + c * ord(palabra[-1])) % m] = (palabra, tipo)
+
+    def con_conjuntos():
+        tipos = []
+        for lexema in lexemas:
+            if lexema in reservadas:
+                tipos.append(TipoToken.PALABRA_RESERVADA)
+            elif lexema in suaves:
+                tipos.append(TipoToken.PALABRA_CLAVE_SUAVE)
+            elif lexema in modificadores:
+                tipos.append(TipoToken.MODIFICADOR)
+            else:
+                tipos.append(None)
+        return tipos
+
+    def con_diccionario():
+        buscar = palabras_clave.get
+        return [buscar(lexema) for lexema in lexemas]
+
+    def con_hash_perfecto():
+        tipos = []
+        for lexema in lexemas:
+            tipo = None
+            if len(lexema) > 1:
+                entrada = tabla[(len(lexema) + a * ord(lexema[0]) + b * ord(lexema[-2]) + c * ord(lexema[-1])) % m]
+                if entrada is not None and entrada[0] == lexema:
+                    tipo = entrada[1]
+            tipos.append(tipo)
+        return tipos
+
+    variantes = (('conjuntos', con_conjuntos), ('diccionario', con_diccionario), ('hash perfecto', con_hash_perfecto))
+    esperado = con_conjuntos()
+    tiempos = {}
+    for _ in range(repeticiones):
+        for variante, clasificar in variantes:
+            inicio = time.perf_counter()
+            tipos = clasificar()
+            tiempos[variante] = min(tiempos.get(variante, float('inf')), time.perf_counter() - inicio)
+            assert tipos == esperado, f"La variante '{variante}' clasifica distinto"
+    resultados = [
+        {'variante': variante, 'segundos': segundos, 'ns_por_lexema': segundos / len(lexemas) * 1e9}
+        for variante, segundos in tiempos.items()
+    ]
+    resultados[-1].update(tabla=m, palabras=len(palabras_clave))
+    return resultados
+
+def imprimir_palabras_clave(resultados: list):
+    """
+    Imprime los resultados de medir_palabras_clave.
+
+    Args:
+        resultados (list): Resultados de medir_palabras_clave
+    """
+    base = resultados[0]['segundos']
+    print(f"{'Variante':<16}{'Tiempo (s)':>12}{'ns/lexema':>12}{'Relativo':>10}")
+    for fila in resultados:
+        print(f"{fila['variante']:<16}{fila['segundos']:>12.4f}{fila['ns_por_lexema']:>12.1f}"
+              f"{fila['segundos'] / base:>9.2f}x")
+    for fila in resultados:
+        if 'tabla' in fila:
+            print(f"Tabla del hash perfecto: {fila['tabla']} entradas para {fila['palabras']} palabras")
+
+# Versión del formato del archivo JSON de la suite
+FORMATO_SUITE = 1
+
+# Tamaños de la suite por defecto; se admiten hasta cientos de MB
+TAMANOS_SUITE = '1K,64K,1M'
+
+# Tamaño máximo (en caracteres) de los corpus en los que se miden las
+# asignaciones: tracemalloc hace el análisis varias veces más lento
+LIMITE_ASIGNACIONES = 8 << 20
+
+# Métricas que compara `comparar`: +1 si un valor mayor es mejor, -1 si
+# un valor menor es mejor
+METRICAS_SUITE = {
+    'tokens_por_segundo': 1,
+    'mb_por_segundo': 1,
+    'rss_pico': -1,
+    'asignacion_por_token': -1,
+}
+
+def _rss_pico():
+    """
+    Returns:
+        int: Memoria residente máxima del proceso en bytes, o None si la
+             plataforma no la informa
+    """
+    if resource is None:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la informa en KB y macOS en bytes
+    return maximo if sys.platform == 'darwin' else maximo * 1024
+
+def medir_caso(perfil: str, tamano: int, backend: str, repeticiones: int = 3,
+               columnar: bool = False, semilla: int = 0) -> dict:
+    """
+    Mide AnalizadorLexico.analizar sobre un corpus sintético.
+
+    Args:
+        perfil (str): Perfil del corpus (ver corpus.PERFILES)
+        tamano (int): Caracteres del corpus
+        backend (str): Backend del analizador
+        repeticiones (int): Veces que se repite el análisis; se informa el más rápido
+        columnar (bool): Si es True se pide el resultado como TokenArray,
+                         necesario para los corpus de cientos de MB
+        semilla (int): Semilla del corpus
+
+    Returns:
+        dict: Claves 'perfil', 'tamano', 'backend', 'bytes', 'tokens',
+        'segundos', 'tokens_por_segundo', 'mb_por_segundo', 'rss_previo' y
+        'rss_pico' (bytes de memoria residente máxima antes y después de
+        analizar) y 'asignacion_por_token' (pico de memoria asignada durante
+        el análisis dividido por los tokens, medido con tracemalloc en los
+        corpus de hasta LIMITE_ASIGNACIONES caracteres; None en los demás)
+
+    Conviene llamarla en un proceso propio (ver medir_suite) para que la
+    memoria residente máxima sea la de este caso.
+    """
+    codigo = generar_corpus(tamano, perfil, semilla)
+    megabytes = len(codigo.encode('utf-8')) / 1e6
+    analizador = AnalizadorLexico(backend=backend)
+    analizador.analizar(codigo[:4096])
+    rss_previo = _rss_pico()
+
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        tokens = len(analizador.analizar(codigo, columnar=columnar))
+        mejor = min(mejor, time.perf_counter() - inicio)
+    rss_pico = _rss_pico()
+
+    asignacion = None
+    if tamano <= LIMITE_ASIGNACIONES:
+        tracemalloc.start()
+        try:
+            analizador.analizar(codigo, columnar=columnar)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        asignacion = pico / max(tokens, 1)
+
+    return {
+        'perfil': perfil,
+        'tamano': tamano,
+        'backend': backend,
+        'bytes': round(megabytes * 1e6),
+        'tokens': tokens,
+        'segundos': mejor,
+        'tokens_por_segundo': tokens / max(mejor, 1e-9),
+        'mb_por_segundo': megabytes / max(mejor, 1e-9),
+        'rss_previo': rss_previo,
+        'rss_pico': rss_pico,
+        'asignacion_por_token': asignacion,
+    }
+
+def medir_suite(tamanos, perfiles=None, backends=None, repeticiones: int = 3,
+                columnar: bool = False, aislar: bool = True, semilla: int = 0) -> dict:
+    """
+    Mide todas las combinaciones de tamaño, perfil y backend.
+
+    Args:
+        tamanos: Tamaños de los corpus en caracteres
+        perfiles: Perfiles de corpus; None usa todos los de corpus.PERFILES
+        backends: Backends del analizador; None usa AnalizadorLexico.BACKENDS
+        repeticiones (int): Se pasa a medir_caso
+        columnar (bool): Se pasa a medir_caso
+        aislar (bool): Si es True cada caso se mide en un proceso nuevo,
+                       para que la memoria de un caso no se sume a la del
+                       siguiente
+        semilla (int): Se pasa a medir_caso
+
+    Returns:
+        dict: {'formato': FORMATO_SUITE, 'entorno': {...}, 'resultados':
+        [resultado de medir_caso, ...]}, listo para guardar como JSON
+    """
+    perfiles = list(PERFILES) if perfiles is None else perfiles
+    backends = list(AnalizadorLexico.BACKENDS) if backends is None else backends
+    resultados = []
+    for tamano in tamanos:
+        for perfil in perfiles:
+            for backend in backends:
+                argumentos = (perfil, tamano, backend, repeticiones, columnar, semilla)
+                if aislar:
+                    with ProcessPoolExecutor(max_workers=1) as ejecutor:
+                        resultado = ejecutor.submit(medir_caso, *argumentos).result()
+                else:
+                    resultado = medir_caso(*argumentos)
+                print(f"{perfil}/{tamano}/{backend}: {resultado['tokens_por_segundo']:.0f} tokens/s", file=sys.stderr)
+                resultados.append(resultado)
+    return {
+        'formato': FORMATO_SUITE,
+        'entorno': {
+            'python': platform.python_version(),
+            'implementacion': platform.python_implementation(),
+            'plataforma': platform.platform(),
+            'huella': AnalizadorLexico().huella(),
+        },
+        'resultados': resultados,
+    }
+
+def imprimir_suite(suite: dict):
+    """
+    Imprime una tabla con los resultados de medir_suite.
+
+    Args:
+        suite (dict): Resultado de medir_suite
+    """
+    def megas(valor):
+        return '-' if valor is None else f"{valor / 1e6:.1f}"
+
+    print(f"{'Perfil':<16}{'Tamaño':>11}{'Backend':>10}{'Tokens':>11}{'Tokens/s':>11}"
+          f"{'MB/s':>8}{'RSS (MB)':>10}{'B/token':>9}")
+    for fila in suite['resultados']:
+        asignacion = fila['asignacion_por_token']
+        print(f"{fila['perfil']:<16}{fila['tamano']:>11}{fila['backend']:>10}{fila['tokens']:>11}"
+              f"{fila['tokens_por_segundo']:>11.0f}{fila['mb_por_segundo']:>8.2f}{megas(fila['rss_pico']):>10}"
+              f"{'-' if asignacion is None else f'{asignacion:.0f}':>9}")
+
+def comparar_suites(base: dict, nueva: dict, umbral: float = 0.1) -> list:
+    """
+    Compara dos resultados de medir_suite caso por caso.
+
+    Args:
+        base (dict): Resultados de referencia
+        nueva (dict): Resultados a evaluar
+        umbral (float): Empeoramiento relativo tolerado (0.1 es un 10 %)
+
+    Returns:
+        list: Un diccionario por caso y métrica de METRICAS_SUITE presentes
+        en ambos, con las claves 'caso', 'metrica', 'base', 'nuevo',
+        'cambio' (relativo, positivo si mejora) y 'regresion'. Un caso cuya
+        cantidad de tokens cambió se informa con la métrica 'tokens' y
+        siempre es una regresión: el analizador ya no hace lo mismo. Un
+        caso de la base que falta en los resultados nuevos se informa con
+        la métrica 'faltante' (con 'base' y 'nuevo' en None) y también es
+        una regresión, para que no pase el control un backend o un tamaño
+        que dejó de medirse
+
+    Raises:
+        ValueError: Si algún archivo no tiene el formato FORMATO_SUITE
+    """
+    for suite in (base, nueva):
+        if suite.get('formato') != FORMATO_SUITE:
+            raise ValueError(f"Formato de resultados no soportado: {suite.get('formato')!r}")
+
+    def clave(fila):
+        return fila['perfil'], fila['tamano'], fila['backend']
+
+    anteriores = {clave(fila): fila for fila in base['resultados']}
+    comparaciones = []
+    for fila in nueva['resultados']:
+        anterior = anteriores.pop(clave(fila), None)
+        if anterior is None:
+            continue
+        caso = '/'.join(map(str, clave(fila)))
+        if fila['tokens'] != anterior['tokens']:
+            comparaciones.append({'caso': caso, 'metrica': 'tokens', 'base': anterior['tokens'],
+                                  'nuevo': fila['tokens'], 'cambio': None, 'regresion': True})
+        for metrica, sentido in METRICAS_SUITE.items():
+            valor_base, valor_nuevo = anterior.get(metrica), fila.get(metrica)
+            if not valor_base or valor_nuevo is None:
+                continue
+            cambio = sentido * (valor_nuevo - valor_base) / valor_base
+            comparaciones.append({'caso': caso, 'metrica': metrica, 'base': valor_base, 'nuevo': valor_nuevo,
+                                  'cambio': cambio, 'regresion': cambio < -umbral})
+    for caso in anteriores:
+        comparaciones.append({'caso': '/'.join(map(str, caso)), 'metrica': 'faltante', 'base': None,
+                              'nuevo': None, 'cambio': None, 'regresion': True})
+    return comparaciones
+
+def imprimir_comparacion(comparaciones: list):
+    """
+    Imprime las comparaciones de comparar_suites, marcando las regresiones.
+
+    Args:
+        comparaciones (list): Resultado de comparar_suites
+    """
+    def valor(numero):
+        return '-' if numero is None else f'{numero:.6g}'
+
+    ancho = max([len('Caso')] + [len(fila['caso']) for fila in comparaciones]) + 2
+    print(f"{'Caso':<{ancho}}{'Métrica':<22}{'Base':>14}{'Nuevo':>14}{'Cambio':>9}")
+    for fila in comparaciones:
+        cambio = '-' if fila['cambio'] is None else f"{fila['cambio'] * 100:+.1f}%"
+        marca = '  REGRESIÓN' if fila['regresion'] else ''
+        print(f"{fila['caso']:<{ancho}}{fila['metrica']:<22}{valor(fila['base']):>14}{valor(fila['nuevo']):>14}"
+              f"{cambio:>9}{marca}")
+    regresiones = sum(fila['regresion'] for fila in comparaciones)
+    print(f"{len(comparaciones)} comparaciones, {regresiones} regresiones")
+
+def main(argv=None):
+    """
+    Ejecuta las mediciones desde la línea de comandos.
+
+    Args:
+        argv (list): Argumentos; None usa sys.argv
+
+    Returns:
+        int: Código de salida: 1 si `comparar` encontró regresiones, 0 si no
+    """
+    parser = argparse.ArgumentParser(prog='python -m src.benchmark', description="Mediciones de rendimiento")
+    subcomandos = parser.add_subparsers(dest='medicion', required=True)
+
+    formatos = subcomandos.add_parser('serializacion', help="Compara los formatos de tokens")
+    formatos.add_argument('archivo', nargs='?', default=str(EJEMPLO), help="Código Kotlin a serializar")
+    formatos.add_argument('--repeticiones', type=int, default=3, help="Repeticiones de cada medición")
+    formatos.add_argument('--copias', type=int, default=100, help="Veces que se concatena el código")
+
+    arranque = subcomandos.add_parser('arranque', help="Mide la creación del analizador y de sus autómatas")
+    arranque.add_argument('--repeticiones', type=int, default=5, help="Repeticiones de cada medición")
+    arranque.add_argument('--minimizar', action='store_true', help="Minimiza los AFDs")
+
+    subconjuntos = subcomandos.add_parser('subconjuntos', help="Mide la construcción por subconjuntos")
+    subconjuntos.add_argument('--palabras', type=int, default=300, help="Palabras del AFND sintético")
+    subconjuntos.add_argument('--simbolos', type=int, default=2000, help="Tamaño del alfabeto")
+    subconjuntos.add_argument('--referencia', action='store_true',
+                              help="Mide también la construcción símbolo por símbolo (lenta) y la compara")
+
+    clases = subcomandos.add_parser('clases', help="Mide un AFD de identificadores con letras Unicode")
+    clases.add_argument('--por-caracter', action='store_true',
+                        help="Mide también la variante con una transición por carácter (lenta)")
+
+    expresiones = subcomandos.add_parser('expresiones', help="Mide la compilación de cada expresión regular")
+    expresiones.add_argument('--repeticiones', type=int, default=5, help="Repeticiones de cada medición")
+    expresiones.add_argument('--minimizar', action='store_true', help="Minimiza los AFDs")
+
+    perezoso = subcomandos.add_parser('perezoso', help="Compara el AFD perezoso con la construcción completa")
+    perezoso.add_argument('--n', type=int, default=14, help="El AFND reconoce (a|b)*a(a|b){n}")
+    perezoso.add_argument('--caracteres', type=int, default=200000, help="Longitud del texto recorrido")
+    perezoso.add_argument('--capacidad', type=int, default=None, help="Estados del AFD perezoso como máximo")
+    perezoso.add_argument('--proporcion-a', type=float, default=0.02, help="Probabilidad de 'a' en el texto")
+    perezoso.add_argument('--completo', action='store_true',
+                          help="Construye también el AFD completo (exponencial en n)")
+
+    generado = subcomandos.add_parser('generado', help="Compara el escáner generado con el AFD interpretado")
+    generado.add_argument('archivo', nargs='?', default=str(EJEMPLO), help="Código Kotlin a recorrer")
+    generado.add_argument('--copias', type=int, default=10000, help="Veces que se concatena el código")
+    generado.add_argument('--repeticiones', type=int, default=1, help="Repeticiones de cada medición")
+    generado.add_argument('--minimizar', action='store_true', help="Minimiza el AFD")
+
+    perfilado = subcomandos.add_parser('perfilado', help="Mide el costo del modo de perfilado del analizador")
+    perfilado.add_argument('archivo', nargs='?', default=str(EJEMPLO), help="Código Kotlin a analizar")
+    perfilado.add_argument('--copias', type=int, default=200, help="Veces que se concatena el código")
+    perfilado.add_argument('--repeticiones', type=int, default=5, help="Repeticiones de cada medición")
+    perfilado.add_argument('--backend', choices=AnalizadorLexico.BACKENDS, default='afd',
+                           help="Motor de reconocimiento del analizador")
+    perfilado.add_argument('--volcar', default=None,
+                           help="Archivo donde guardar el perfil en el formato de cProfile (se lee con pstats)")
+
+    palabras = subcomandos.add_parser('palabras', help="Compara estructuras para clasificar palabras clave")
+    palabras.add_argument('--cantidad', type=int, default=200000, help="Lexemas clasificados")
+    palabras.add_argument('--proporcion', type=float, default=0.7, help="Proporción de palabras clave")
+    palabras.add_argument('--repeticiones', type=int, default=5, help="Repeticiones de cada medición")
+
+    suite = subcomandos.add_parser('suite', help="Mide el analizador sobre corpus sintéticos y guarda JSON")
+    suite.add_argument('--tamanos', default=TAMANOS_SUITE,
+                       help="Tamaños de los corpus separados por comas (1K, 64K, 1M, 500M...)")
+    suite.add_argument('--perfiles', default=','.join(PERFILES), help="Perfiles de corpus separados por comas")
+    suite.add_argument('--backends', default=','.join(AnalizadorLexico.BACKENDS),
+                       help="Backends separados por comas")
+    suite.add_argument('--repeticiones', type=int, default=3, help="Repeticiones de cada medición")
+    suite.add_argument('--columnar', action='store_true',
+                       help="Pide los tokens como TokenArray (necesario para cientos de MB)")
+    suite.add_argument('--sin-aislar', action='store_true',
+                       help="Mide todos los casos en este proceso (la memoria máxima se acumula)")
+    suite.add_argument('-o', '--salida', default=None, help="Archivo JSON donde guardar los resultados")
+
+    comparar = subcomandos.add_parser('comparar', help="Compara dos resultados de la suite")
+    comparar.add_argument('base', help="Resultados JSON de referencia")
+    comparar.add_argument('nuevo', help="Resultados JSON a evaluar")
+    comparar.add_argument('--umbral', type=float, default=0.1,
+                          help="Empeoramiento relativo tolerado antes de fallar (0.1 es un 10%%)")
+    argumentos = parser.parse_args(argv)
+
+    if argumentos.medicion == 'perfilado':
+        with open(argumentos.archivo, encoding='utf-8', newline='') as archivo:
+            codigo = archivo.read() * argumentos.copias
+        resultados, perfil = medir_perfilado(codigo, argumentos.repeticiones, argumentos.backend)
+        imprimir_perfilado(resultados, perfil)
+        if argumentos.volcar is not None:
+            perfil.volcar(argumentos.volcar)
+        return 0
+    if argumentos.medicion == 'suite':
+        resultado = medir_suite(
+            [leer_tamano(tamano) for tamano in argumentos.tamanos.split(',')],
+            argumentos.perfiles.split(','), argumentos.backends.split(','),
+            argumentos.repeticiones, argumentos.columnar, not argumentos.sin_aislar
+        )
+        imprimir_suite(resultado)
+        if argumentos.salida is not None:
+            with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, indent=2)
+        return 0
+    if argumentos.medicion == 'comparar':
+        with open(argumentos.base, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        with open(argumentos.nuevo, encoding='utf-8') as archivo:
+            nuevo = json.load(archivo)
+        comparaciones = comparar_suites(base, nuevo, argumentos.umbral)
+        imprimir_comparacion(comparaciones)
+        return 1 if any(fila['regresion'] for fila in comparaciones) else 0
+
+    if argumentos.medicion == 'palabras':
+        imprimir_palabras_clave(medir_palabras_clave(argumentos.cantidad, argumentos.proporcion,
+                                                     argumentos.repeticiones))
+        return 0
+    if argumentos.medicion == 'arranque':
+        imprimir_arranque(medir_arranque(argumentos.repeticiones, argumentos.minimizar))
+        return
+    if argumentos.medicion == 'generado':
+        with open(argumentos.archivo, encoding='utf-8', newline='') as archivo:
+            codigo = archivo.read() * argumentos.copias
+        imprimir_generado(medir_generado(codigo, argumentos.repeticiones, argumentos.minimizar))
+        return
+    if argumentos.medicion == 'perezoso':
+        imprimir_perezoso(medir_perezoso(argumentos.n, argumentos.caracteres, argumentos.capacidad,
+                                         argumentos.completo, argumentos.proporcion_a))
+        return
+    if argumentos.medicion == 'expresiones':
+        imprimir_expresiones(medir_expresiones(argumentos.repeticiones, argumentos.minimizar))
+        return
+    if argumentos.medicion == 'clases':
+        imprimir_clases(medir_clases(argumentos.por_caracter))
+        return
+    if argumentos.medicion == 'subconjuntos':
+        imprimir_subconjuntos(medir_subconjuntos(argumentos.palabras, argumentos.simbolos,
+                                                 argumentos.referencia))
+        return
+    with open(argumentos.archivo, encoding='utf-8', newline='') as archivo:
+        codigo = archivo.read() * argumentos.copias
+    imprimir_serializacion(medir_serializacion(codigo, argumentos.repeticiones))
+
+if __name__ == '__main__':
+    sys.exit(main())
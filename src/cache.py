@@ -0,0 +1,307 @@
+"""
+Módulo de caché de tokens en disco.
+Este módulo guarda el resultado del análisis léxico de cada contenido en un
+directorio, indexado por un hash del contenido y de la huella del
+analizador, para no volver a analizar archivos que no cambiaron.
+"""
+
+import hashlib
+import os
+import tempfile
+from .analizador_lexico import AnalizadorLexico
+from . import serializacion
+
+class CacheTokens:
+    """
+    Caché de tokens en disco direccionada por contenido.
+
+    Cada entrada es un archivo en el formato binario de serializacion cuyo
+    nombre es el SHA-256 del contenido analizado junto con la huella del
+    analizador, de modo que un cambio en la gramática o en VERSION no
+    reutiliza resultados viejos.
+
+    Características:
+    - Un acierto lee los tokens guardados sin escanear el código
+    - Escrituras atómicas (archivo temporal y os.replace), por lo que varios
+      procesos pueden compartir el mismo directorio
+    - Tamaño acotado: al superar `tamano_maximo` se eliminan las entradas
+      usadas hace más tiempo (se toma la fecha de modificación, que se
+      actualiza en cada acierto). El directorio se vuelve a recorrer cada
+      vez que lo escrito por el proceso desde el último recorrido supera la
+      mitad del margen que quedaba, así que el límite vale aunque lo
+      compartan varios procesos
+    - Contadores de aciertos y fallos
+    """
+
+    # Extensión de las entradas de la caché
+    EXTENSION = '.ktok'
+
+    # Al desalojar, se baja hasta esta fracción del tamaño máximo
+    FRACCION_DESALOJO = 0.9
+
+    def __init__(self, directorio, tamano_maximo: int = 256 << 20, analizador: AnalizadorLexico = None):
+        """
+        Abre (o crea) una caché en un directorio.
+        
+        Args:
+            directorio: Directorio donde se guardan las entradas
+            tamano_maximo (int): Bytes máximos que ocupan las entradas
+            analizador (AnalizadorLexico): Analizador para los fallos; por
+                                           defecto se crea uno
+        """
+        self.directorio = os.fspath(directorio)
+        self.tamano_maximo = tamano_maximo
+        self.analizador = analizador if analizador is not None else AnalizadorLexico()
+        self.huella = self.analizador.huella()
+        self.aciertos = 0
+        self.fallos = 0
+        
+        os.makedirs(self.directorio, exist_ok=True)
+        # Tamaño del directorio en el último recorrido y bytes escritos por
+        # este proceso desde entonces
+        self.tamano_escaneado = sum(tamano for _, _, tamano in self._entradas())
+        self.escrito = 0
+
+    def clave(self, datos: bytes) -> str:
+        """
+        Calcula la clave de un contenido.
+        
+        Args:
+            datos (bytes): Contenido del archivo
+        
+        Returns:
+            str: SHA-256 hexadecimal del contenido y la huella del analizador
+        """
+        resumen = hashlib.sha256(self.huella.encode('ascii'))
+        resumen.update(datos)
+        return resumen.hexdigest()
+
+    def analizar(self, codigo: str) -> list:
+        """
+        Analiza un código usando la caché.
+        
+        Args:
+            codigo (str): Código fuente en Kotlin
+        
+        Returns:
+            list: Lista de objetos Token, igual a la de AnalizadorLexico.analizar
+        """
+        return self.analizar_bytes(codigo.encode('utf-8'), codigo)
+
+    def analizar_archivo(self, ruta) -> list:
+        """
+        Analiza un archivo UTF-8 usando la caché.
+        
+        Args:
+            ruta: Ruta del archivo
+        
+        Returns:
+            list: Lista de objetos Token, igual a la de AnalizadorLexico.analizar
+                  sobre el contenido del archivo
+        
+        Raises:
+            UnicodeDecodeError: Si el contenido no es UTF-8 válido y no estaba en caché
+        """
+        with open(ruta, 'rb') as archivo:
+            datos = archivo.read()
+        return self.analizar_bytes(datos)
+
+    def analizar_bytes(self, datos: bytes, codigo: str = None) -> list:
+        """
+        Busca un contenido en la caché y, si no está, lo analiza y lo guarda.
+        
+        Args:
+            datos (bytes): Contenido codificado en UTF-8 (define la clave)
+            codigo (str): El mismo contenido decodificado, si ya se tiene
+        
+        Returns:
+            list: Lista de objetos Token
+        """
+        clave = self.clave(datos)
+        tokens = self.obtener(clave)
+        if tokens is not None:
+            self.aciertos += 1
+            return tokens
+        
+        self.fallos += 1
+        if codigo is None:
+            codigo = datos.decode('utf-8')
+        registros = list(self.analizador.iter_tokens(codigo, posiciones=True))
+        self.guardar(clave, registros)
+        return [token for token, _, _ in registros]
+
+    def obtener(self, clave: str):
+        """
+        Lee una entrada de la caché.
+        
+        Args:
+            clave (str): Clave calculada con clave()
+        
+        Returns:
+            list | None: Lista de Token, o None si no está o es ilegible (en
+            ese caso se elimina)
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                tokens = [token for token, _, _ in serializacion.leer_binario(archivo)]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, IndexError):
+            self._eliminar(ruta)
+            return None
+        
+        # Marcar la entrada como usada recientemente
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return tokens
+
+    def guardar(self, clave: str, registros):
+        """
+        Guarda una entrada de forma atómica.
+        
+        Args:
+            clave (str): Clave calculada con clave()
+            registros: Iterable de tuplas (token, inicio, fin)
+        
+        El contenido se escribe en un archivo temporal del mismo directorio
+        y se renombra sobre el destino: otro proceso ve la entrada completa
+        o no la ve. Si varios procesos guardan la misma clave, gana el
+        último, con el mismo contenido.
+        """
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                serializacion.escribir_binario(registros, archivo)
+            tamano = os.path.getsize(temporal)
+            os.replace(temporal, ruta)
+        except BaseException:
+            self._eliminar(temporal)
+            raise
+        
+        # Otros procesos pueden haber escrito lo mismo que este: antes de
+        # agotar el margen visto en el último recorrido se vuelve a medir
+        self.escrito += tamano
+        if self.escrito > (self.tamano_maximo - self.tamano_escaneado) / 2:
+            self.revisar_tamano()
+
+    @property
+    def tamano_estimado(self) -> int:
+        """
+        Returns:
+            int: Bytes ocupados según el último recorrido más lo escrito
+                 por este proceso desde entonces
+        """
+        return self.tamano_escaneado + self.escrito
+
+    def revisar_tamano(self):
+        """
+        Recorre el directorio y desaloja entradas si el total, contando lo
+        que guardaron otros procesos, supera el tamaño máximo.
+        """
+        entradas = sorted(self._entradas())
+        total = sum(tamano for _, _, tamano in entradas)
+        if total > self.tamano_maximo:
+            total = self._recortar(entradas, total)
+        self.tamano_escaneado = total
+        self.escrito = 0
+
+    def desalojar(self):
+        """
+        Elimina las entradas usadas hace más tiempo hasta bajar de
+        FRACCION_DESALOJO del tamaño máximo.
+        
+        Recalcula el tamaño ocupado recorriendo el directorio, de modo que
+        también cuenta lo que guardaron otros procesos.
+        """
+        entradas = sorted(self._entradas())
+        total = sum(tamano for _, _, tamano in entradas)
+        self.tamano_escaneado = self._recortar(entradas, total)
+        self.escrito = 0
+
+    def _recortar(self, entradas: list, total: int) -> int:
+        """
+        Elimina entradas, de la usada hace más tiempo en adelante, hasta
+        bajar de FRACCION_DESALOJO del tamaño máximo.
+        
+        Args:
+            entradas (list): Tuplas de _entradas ordenadas por fecha
+            total (int): Suma de sus tamaños
+        
+        Returns:
+            int: Tamaño que queda tras eliminar
+        """
+        limite = self.tamano_maximo * self.FRACCION_DESALOJO
+        for _, ruta, tamano in entradas:
+            if total <= limite:
+                break
+            if self._eliminar(ruta):
+                total -= tamano
+        return total
+
+    def vaciar(self):
+        """
+        Elimina todas las entradas y reinicia los contadores.
+        """
+        for _, ruta, _ in self._entradas():
+            self._eliminar(ruta)
+        self.tamano_escaneado = 0
+        self.escrito = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            dict: Contadores 'aciertos' y 'fallos' y el 'tamano' estimado en bytes
+        """
+        return {'aciertos': self.aciertos, 'fallos': self.fallos, 'tamano': self.tamano_estimado}
+
+    def _ruta(self, clave: str) -> str:
+        """
+        Args:
+            clave (str): Clave de la entrada
+        
+        Returns:
+            str: Ruta del archivo de la entrada, repartida en subdirectorios
+                 por los dos primeros caracteres de la clave
+        """
+        return os.path.join(self.directorio, clave[:2], clave + self.EXTENSION)
+
+    def _entradas(self):
+        """
+        Recorre las entradas guardadas.
+        
+        Yields:
+            tuple: (fecha_de_modificacion, ruta, tamano) de cada entrada
+        """
+        for directorio, _, nombres in os.walk(self.directorio):
+            for nombre in nombres:
+                if not nombre.endswith(self.EXTENSION):
+                    continue
+                ruta = os.path.join(directorio, nombre)
+                try:
+                    estado = os.stat(ruta)
+                except OSError:
+                    continue
+                yield estado.st_mtime, ruta, estado.st_size
+
+    def _eliminar(self, ruta) -> bool:
+        """
+        Elimina un archivo, ignorando que otro proceso ya lo haya hecho.
+        
+        Args:
+            ruta: Ruta del archivo
+        
+        Returns:
+            bool: True si se eliminó
+        """
+        try:
+            os.remove(ruta)
+            return True
+        except OSError:
+            return False
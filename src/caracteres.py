@@ -0,0 +1,281 @@
+"""
+Módulo de clases de caracteres.
+Este módulo representa conjuntos de caracteres como listas ordenadas de
+intervalos de puntos de código, para que los autómatas puedan tener una
+transición por rango (por ejemplo, todas las letras Unicode) en lugar de una
+por carácter, y los parte en piezas disjuntas para construir el AFD.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+
+# Mayor punto de código Unicode
+MAXIMO_UNICODE = 0x10FFFF
+
+class ClaseCaracteres:
+    """
+    Conjunto inmutable de caracteres guardado como intervalos.
+
+    Los intervalos son pares (inicio, fin) de puntos de código, inclusivos,
+    ordenados, disjuntos y no contiguos, de modo que dos clases con los
+    mismos caracteres son iguales y tienen el mismo hash. Una clase con
+    todas las letras Unicode ocupa unos pocos cientos de intervalos en lugar
+    de más de cien mil caracteres.
+    """
+
+    __slots__ = ('intervalos', '_inicios', '_hash')
+
+    def __init__(self, caracteres=(), intervalos=()):
+        """
+        Crea una clase a partir de caracteres sueltos y de intervalos.
+        
+        Args:
+            caracteres: Iterable de caracteres (cadenas de longitud 1)
+            intervalos: Iterable de pares (inicio, fin) de puntos de código
+                        o de caracteres, inclusivos
+        
+        Raises:
+            ValueError: Si un intervalo está invertido o fuera de Unicode
+        """
+        pares = [(ord(caracter), ord(caracter)) for caracter in caracteres]
+        for inicio, fin in intervalos:
+            inicio = ord(inicio) if isinstance(inicio, str) else inicio
+            fin = ord(fin) if isinstance(fin, str) else fin
+            if not 0 <= inicio <= fin <= MAXIMO_UNICODE:
+                raise ValueError(f"Intervalo de caracteres inválido: ({inicio}, {fin})")
+            pares.append((inicio, fin))
+        
+        # Ordenar y unir los intervalos que se solapan o se tocan
+        unidos = []
+        for inicio, fin in sorted(pares):
+            if unidos and inicio <= unidos[-1][1] + 1:
+                if fin > unidos[-1][1]:
+                    unidos[-1] = (unidos[-1][0], fin)
+            else:
+                unidos.append((inicio, fin))
+        self.intervalos = tuple(unidos)
+        self._inicios = [inicio for inicio, _ in unidos]
+        self._hash = hash(self.intervalos)
+
+    @classmethod
+    def rango(cls, desde, hasta) -> 'ClaseCaracteres':
+        """
+        Args:
+            desde: Primer carácter (o punto de código) del rango
+            hasta: Último carácter (o punto de código) del rango, inclusivo
+        
+        Returns:
+            ClaseCaracteres: Clase con los caracteres de `desde` a `hasta`
+        """
+        return cls(intervalos=[(desde, hasta)])
+
+    @classmethod
+    def categorias(cls, *nombres) -> 'ClaseCaracteres':
+        """
+        Clase con los caracteres de una o más categorías generales Unicode.
+        
+        Args:
+            *nombres: Categorías ('Lu', 'Nd', ...) o sus prefijos ('L' son
+                      todas las letras)
+        
+        Returns:
+            ClaseCaracteres: Unión de las categorías. Se calcula a partir de
+            los intervalos de unicodedata, sin guardar un predicado
+        """
+        tabla = _intervalos_por_categoria()
+        return cls(intervalos=[
+            intervalo
+            for categoria, intervalos in tabla.items()
+            if any(categoria.startswith(nombre) for nombre in nombres)
+            for intervalo in intervalos
+        ])
+
+    def __contains__(self, simbolo) -> bool:
+        """
+        Args:
+            simbolo: Símbolo a buscar
+        
+        Returns:
+            bool: True si es un carácter de la clase; los símbolos que no son
+                  un único carácter (como 'OTRO') nunca pertenecen
+        """
+        if not isinstance(simbolo, str) or len(simbolo) != 1:
+            return False
+        punto = ord(simbolo)
+        indice = bisect_right(self._inicios, punto) - 1
+        return indice >= 0 and punto <= self.intervalos[indice][1]
+
+    def __or__(self, otra: 'ClaseCaracteres') -> 'ClaseCaracteres':
+        """
+        Returns:
+            ClaseCaracteres: Unión de las dos clases
+        """
+        return ClaseCaracteres(intervalos=self.intervalos + otra.intervalos)
+
+    def complemento(self) -> 'ClaseCaracteres':
+        """
+        Returns:
+            ClaseCaracteres: Clase con todos los puntos de código Unicode que
+                             no están en esta
+        """
+        huecos = []
+        siguiente = 0
+        for inicio, fin in self.intervalos:
+            if inicio > siguiente:
+                huecos.append((siguiente, inicio - 1))
+            siguiente = fin + 1
+        if siguiente <= MAXIMO_UNICODE:
+            huecos.append((siguiente, MAXIMO_UNICODE))
+        return ClaseCaracteres(intervalos=huecos)
+
+    def caracteres(self):
+        """
+        Yields:
+            str: Cada carácter de la clase, en orden (conviene solo para
+                 clases pequeñas)
+        """
+        for inicio, fin in self.intervalos:
+            for punto in range(inicio, fin + 1):
+                yield chr(punto)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: Cantidad de caracteres de la clase
+        """
+        return sum(fin - inicio + 1 for inicio, fin in self.intervalos)
+
+    def __bool__(self) -> bool:
+        return bool(self.intervalos)
+
+    def __eq__(self, otra) -> bool:
+        return isinstance(otra, ClaseCaracteres) and self.intervalos == otra.intervalos
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __getstate__(self):
+        return self.intervalos
+
+    def __setstate__(self, intervalos):
+        self.intervalos = intervalos
+        self._inicios = [inicio for inicio, _ in intervalos]
+        self._hash = hash(intervalos)
+
+    def __repr__(self) -> str:
+        return f"ClaseCaracteres(intervalos={list(self.intervalos)!r})"
+
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: Notación de clase de las expresiones regulares, por ejemplo [a-z_]
+        """
+        partes = []
+        for inicio, fin in self.intervalos:
+            if inicio == fin:
+                partes.append(chr(inicio))
+            else:
+                partes.append(f"{chr(inicio)}-{chr(fin)}")
+        return '[' + ''.join(partes) + ']'
+
+    def expresion(self, negada: bool = False) -> str:
+        """
+        Args:
+            negada (bool): Si es True se escribe la clase de los caracteres
+                           que no están en esta
+        
+        Returns:
+            str: Clase [...] (o [^...]) escapada, válida para `re`
+        """
+        partes = []
+        for inicio, fin in self.intervalos:
+            partes.append(re.escape(chr(inicio)))
+            if fin > inicio:
+                partes.append('-' + re.escape(chr(fin)))
+        if not partes:
+            # Una clase vacía no se puede escribir con corchetes
+            return r'[^\s\S]' if not negada else r'[\s\S]'
+        return ('[^' if negada else '[') + ''.join(partes) + ']'
+
+    def extremos(self) -> list:
+        """
+        Returns:
+            list: El primer y el último carácter de cada intervalo, útiles
+                  como muestras en las pruebas
+        """
+        return [chr(punto) for intervalo in self.intervalos for punto in sorted(set(intervalo))]
+
+def particionar(etiquetadas, sueltos=()):
+    """
+    Parte la unión de varias clases en piezas disjuntas.
+
+    Args:
+        etiquetadas: Iterable de pares (clase, etiqueta), con ClaseCaracteres
+                     y etiquetas hashables
+        sueltos: Puntos de código que se separan en piezas propias de un
+                 carácter (los caracteres que el autómata ya trata uno a uno)
+
+    Returns:
+        tuple: (piezas, cubiertos). `piezas` es una lista de tuplas
+        (inicio, fin, etiquetas) con los intervalos maximales sin caracteres
+        sueltos en los que el conjunto de etiquetas de las clases que los
+        contienen es constante; `cubiertos` es un diccionario
+        {punto_suelto: etiquetas} con las etiquetas de las clases que
+        contienen a cada carácter suelto
+
+    Recorre los bordes de los intervalos en orden manteniendo las etiquetas
+    activas, en tiempo proporcional a la cantidad de intervalos.
+    """
+    eventos = {}
+    for clase, etiqueta in etiquetadas:
+        for inicio, fin in clase.intervalos:
+            eventos.setdefault(inicio, []).append((etiqueta, 1))
+            eventos.setdefault(fin + 1, []).append((etiqueta, -1))
+    sueltos = set(sueltos)
+    for punto in sueltos:
+        eventos.setdefault(punto, [])
+        eventos.setdefault(punto + 1, [])
+
+    piezas = []
+    cubiertos = {}
+    activas = Counter()
+    bordes = sorted(eventos)
+    for indice, borde in enumerate(bordes[:-1]):
+        for etiqueta, cambio in eventos[borde]:
+            activas[etiqueta] += cambio
+            if not activas[etiqueta]:
+                del activas[etiqueta]
+        if not activas:
+            continue
+        etiquetas = frozenset(activas)
+        if borde in sueltos:
+            cubiertos[borde] = etiquetas
+            continue
+        fin = bordes[indice + 1] - 1
+        if piezas and piezas[-1][1] == borde - 1 and piezas[-1][2] == etiquetas:
+            piezas[-1] = (piezas[-1][0], fin, etiquetas)
+        else:
+            piezas.append((borde, fin, etiquetas))
+    return piezas, cubiertos
+
+@lru_cache(maxsize=None)
+def _intervalos_por_categoria() -> dict:
+    """
+    Returns:
+        dict: {categoría: lista de intervalos (inicio, fin)} para todos los
+              puntos de código, calculado una vez por proceso
+    """
+    tabla = {}
+    anterior = None
+    inicio = 0
+    for punto in range(MAXIMO_UNICODE + 2):
+        categoria = unicodedata.category(chr(punto)) if punto <= MAXIMO_UNICODE else None
+        if categoria != anterior:
+            if anterior is not None:
+                tabla.setdefault(anterior, []).append((inicio, punto - 1))
+            anterior = categoria
+            inicio = punto
+    return tabla
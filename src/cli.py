@@ -0,0 +1,335 @@
+"""
+Módulo de línea de comandos del analizador léxico.
+Este módulo permite analizar archivos Kotlin sin interfaz gráfica, por
+ejemplo en integración continua:
+
+    python -m src lex <rutas...> [-j TRABAJADORES] [--lote BYTES] [--cache DIR]
+    python -m src tokens <archivo> [--formato jsonl|csv|binario] [-o SALIDA]
+    python -m src generar [-o SALIDA] [--minimizar]
+
+`lex` recorre los directorios buscando archivos *.kt y *.kts y los analiza
+en paralelo con un ProcessPoolExecutor. `tokens` escribe los tokens de un
+archivo en un formato de serialización a medida que se reconocen.
+`generar` escribe el escáner especializado del AFD (ver generador.py).
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .analizador_lexico import AnalizadorLexico
+from .cache import CacheTokens
+from .generador import generar_escaner
+from . import serializacion
+from .token import TipoToken, contar_por_tipo
+
+# Extensiones de los archivos que se buscan en los directorios
+EXTENSIONES = ('.kt', '.kts')
+
+# Analizador y caché de cada proceso de trabajo, creados una sola vez por proceso
+_analizador = None
+_cache = None
+
+def buscar_archivos(rutas) -> list:
+    """
+    Reúne los archivos a analizar a partir de archivos y directorios.
+
+    Args:
+        rutas: Rutas de archivos o directorios
+
+    Returns:
+        list: Rutas de los archivos, en orden. Los archivos indicados
+              explícitamente se incluyen siempre; de los directorios se
+              toman, recursivamente, los que tienen una extensión de EXTENSIONES
+    """
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for directorio, subdirectorios, nombres in os.walk(ruta):
+                subdirectorios.sort()
+                archivos.extend(
+                    os.path.join(directorio, nombre)
+                    for nombre in sorted(nombres)
+                    if nombre.endswith(EXTENSIONES)
+                )
+        else:
+            archivos.append(ruta)
+    return archivos
+
+def agrupar_en_lotes(archivos, tamano_lote: int) -> list:
+    """
+    Agrupa los archivos en lotes de aproximadamente `tamano_lote` bytes.
+
+    Args:
+        archivos (list): Rutas de los archivos, en orden
+        tamano_lote (int): Bytes a partir de los cuales se cierra un lote
+
+    Returns:
+        list: Lista de lotes (listas de rutas) que conservan el orden. Los
+              archivos pequeños se juntan en un mismo lote para no pagar
+              una comunicación entre procesos por cada uno; un archivo
+              grande forma un lote por sí solo
+    """
+    lotes = []
+    lote = []
+    acumulado = 0
+    for ruta in archivos:
+        try:
+            tamano = os.path.getsize(ruta)
+        except OSError:
+            tamano = 0
+        if lote and acumulado + tamano > tamano_lote:
+            lotes.append(lote)
+            lote = []
+            acumulado = 0
+        lote.append(ruta)
+        acumulado += tamano
+    if lote:
+        lotes.append(lote)
+    return lotes
+
+def _inicializar_trabajador(minimizar: bool, backend: str, directorio_cache=None, tamano_cache: int = 0):
+    """
+    Crea el analizador (y la caché, si se pidió) del proceso de trabajo.
+
+    Args:
+        minimizar (bool): Se pasa a AnalizadorLexico
+        backend (str): Se pasa a AnalizadorLexico
+        directorio_cache: Directorio de la caché de tokens, o None para no
+                          usarla. También guarda los autómatas compilados
+        tamano_cache (int): Bytes máximos de la caché
+    """
+    global _analizador, _cache
+    _analizador = AnalizadorLexico(minimizar=minimizar, backend=backend, cache_afd=directorio_cache)
+    _cache = None
+    if directorio_cache is not None:
+        _cache = CacheTokens(directorio_cache, tamano_cache, _analizador)
+
+def _analizar_lote(lote) -> list:
+    """
+    Analiza un lote de archivos en el proceso de trabajo.
+
+    Args:
+        lote (list): Rutas de los archivos del lote
+
+    Returns:
+        list: Una tupla (ruta, bytes, tokens, errores, falla, acierto) por
+              archivo: cantidad de bytes leídos, de tokens y de errores
+              léxicos, el mensaje si el archivo no se pudo leer (None si se
+              pudo) y si los tokens salieron de la caché (None sin caché)
+    """
+    resultados = []
+    for ruta in lote:
+        acierto = None
+        try:
+            with open(ruta, 'rb') as archivo:
+                datos = archivo.read()
+            if _cache is not None:
+                aciertos = _cache.aciertos
+                tokens = _cache.analizar_bytes(datos)
+                acierto = _cache.aciertos > aciertos
+            else:
+                tokens = _analizador.analizar(datos.decode('utf-8'), columnar=True)
+        except (OSError, UnicodeDecodeError) as error:
+            resultados.append((ruta, 0, 0, 0, str(error), None))
+            continue
+        contadores = contar_por_tipo(tokens)
+        resultados.append((ruta, len(datos), len(tokens), contadores[TipoToken.ERROR_LEXICO], None, acierto))
+    return resultados
+
+def analizar_rutas(rutas, trabajadores: int = None, tamano_lote: int = 1 << 20,
+                   minimizar: bool = False, backend: str = 'afd',
+                   directorio_cache=None, tamano_cache: int = 256 << 20):
+    """
+    Analiza en paralelo todos los archivos Kotlin de las rutas dadas.
+
+    Args:
+        rutas: Rutas de archivos o directorios
+        trabajadores (int): Cantidad de procesos; None usa os.cpu_count().
+                            Con 1 se analiza en el proceso actual
+        tamano_lote (int): Bytes aproximados de cada lote de archivos
+        minimizar (bool): Se pasa a AnalizadorLexico
+        backend (str): Se pasa a AnalizadorLexico
+        directorio_cache: Directorio de una CacheTokens compartida por los
+                          procesos, o None para no usar caché
+        tamano_cache (int): Bytes máximos de la caché
+
+    Yields:
+        tuple: (ruta, bytes, tokens, errores, falla, acierto) por archivo,
+               en el orden de buscar_archivos
+    """
+    lotes = agrupar_en_lotes(buscar_archivos(rutas), tamano_lote)
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+
+    if trabajadores <= 1:
+        _inicializar_trabajador(minimizar, backend, directorio_cache, tamano_cache)
+        for lote in lotes:
+            yield from _analizar_lote(lote)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=trabajadores,
+        initializer=_inicializar_trabajador,
+        initargs=(minimizar, backend, directorio_cache, tamano_cache)
+    ) as ejecutor:
+        for resultados in ejecutor.map(_analizar_lote, lotes):
+            yield from resultados
+
+def _comando_lex(argumentos) -> int:
+    """
+    Ejecuta el comando `lex` e informa los conteos por archivo y el total.
+
+    Args:
+        argumentos (argparse.Namespace): Argumentos del comando
+
+    Returns:
+        int: 0 si no hubo errores léxicos ni archivos ilegibles, 1 si los hubo
+    """
+    archivos = tokens_totales = errores_totales = bytes_totales = fallas = aciertos = 0
+    inicio = time.perf_counter()
+
+    for ruta, cantidad_bytes, tokens, errores, falla, acierto in analizar_rutas(
+        argumentos.rutas,
+        trabajadores=argumentos.trabajadores,
+        tamano_lote=argumentos.lote,
+        minimizar=argumentos.minimizar,
+        backend=argumentos.backend,
+        directorio_cache=argumentos.cache,
+        tamano_cache=argumentos.cache_max << 20
+    ):
+        archivos += 1
+        aciertos += bool(acierto)
+        if falla is not None:
+            fallas += 1
+            print(f"{ruta}: ERROR: {falla}", file=sys.stderr)
+            continue
+        tokens_totales += tokens
+        errores_totales += errores
+        bytes_totales += cantidad_bytes
+        if not argumentos.solo_errores or errores:
+            print(f"{ruta}: {tokens} tokens, {errores} errores")
+
+    duracion = max(time.perf_counter() - inicio, 1e-9)
+    print(
+        f"Total: {archivos} archivos, {tokens_totales} tokens, {errores_totales} errores "
+        f"en {duracion:.2f} s ({archivos / duracion:.1f} archivos/s, "
+        f"{bytes_totales / duracion / 1e6:.2f} MB/s)"
+    )
+    if argumentos.cache is not None:
+        print(f"Caché: {aciertos} aciertos, {archivos - fallas - aciertos} fallos")
+    return 1 if errores_totales or fallas else 0
+
+def _comando_tokens(argumentos) -> int:
+    """
+    Ejecuta el comando `tokens`: serializa los tokens de un archivo.
+
+    Args:
+        argumentos (argparse.Namespace): Argumentos del comando
+
+    Returns:
+        int: 0 si no hubo errores léxicos, 1 si los hubo o si el lector de
+        la salida estándar la cerró antes del final (p. ej. `| head`)
+    """
+    analizador = AnalizadorLexico(minimizar=argumentos.minimizar, backend=argumentos.backend)
+    escribir, _, binario = serializacion.FORMATOS[argumentos.formato]
+    errores = 0
+
+    def registros(archivo):
+        nonlocal errores
+        for registro in analizador.iter_tokens(archivo, posiciones=True):
+            if registro[0].tipo == TipoToken.ERROR_LEXICO:
+                errores += 1
+            yield registro
+
+    with open(argumentos.archivo, encoding='utf-8', newline='') as entrada:
+        if argumentos.salida is None:
+            salida = sys.stdout.buffer if binario else sys.stdout
+            try:
+                escribir(registros(entrada), salida)
+                salida.flush()
+            except BrokenPipeError:
+                # El lector terminó antes: se redirige la salida a devnull
+                # para que el vaciado al salir del intérprete no vuelva a fallar
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                return 1
+        else:
+            with serializacion.abrir(argumentos.salida, argumentos.formato, 'w') as salida:
+                escribir(registros(entrada), salida)
+    return 1 if errores else 0
+
+def _comando_generar(argumentos) -> int:
+    """
+    Ejecuta el comando `generar`: escribe el módulo del escáner generado.
+
+    Args:
+        argumentos (argparse.Namespace): Argumentos del comando
+
+    Returns:
+        int: 0
+    """
+    analizador = AnalizadorLexico(minimizar=argumentos.minimizar)
+    fuente = generar_escaner(analizador.afd_lexico, analizador.huella())
+    if argumentos.salida is None:
+        sys.stdout.write(fuente)
+    else:
+        with open(argumentos.salida, 'w', encoding='utf-8') as salida:
+            salida.write(fuente)
+    return 0
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Crea el parser de argumentos de la línea de comandos.
+
+    Returns:
+        argparse.ArgumentParser: Parser con los subcomandos `lex`, `tokens` y `generar`
+    """
+    parser = argparse.ArgumentParser(prog='python -m src', description="Analizador léxico de Kotlin")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    lex = subcomandos.add_parser('lex', help="Analiza archivos y directorios de código Kotlin")
+    lex.add_argument('rutas', nargs='+', help="Archivos o directorios (se buscan *.kt y *.kts)")
+    lex.add_argument('-j', '--trabajadores', type=int, default=None,
+                     help="Cantidad de procesos (por defecto, uno por núcleo)")
+    lex.add_argument('--lote', type=int, default=1 << 20,
+                     help="Bytes aproximados por lote de archivos enviado a cada proceso")
+    lex.add_argument('--backend', choices=AnalizadorLexico.BACKENDS, default='afd',
+                     help="Motor de reconocimiento del analizador")
+    lex.add_argument('--minimizar', action='store_true', help="Minimiza el AFD del analizador")
+    lex.add_argument('--solo-errores', action='store_true',
+                     help="Lista solo los archivos con errores léxicos")
+    lex.add_argument('--cache', default=None,
+                     help="Directorio de una caché de tokens para no reanalizar archivos sin cambios")
+    lex.add_argument('--cache-max', type=int, default=256,
+                     help="Tamaño máximo de la caché en MB")
+    lex.set_defaults(funcion=_comando_lex)
+
+    tokens = subcomandos.add_parser('tokens', help="Escribe los tokens de un archivo en un formato serializado")
+    tokens.add_argument('archivo', help="Archivo de código Kotlin")
+    tokens.add_argument('--formato', choices=tuple(serializacion.FORMATOS), default='jsonl',
+                        help="Formato de salida")
+    tokens.add_argument('-o', '--salida', default=None, help="Archivo de salida (por defecto, la salida estándar)")
+    tokens.add_argument('--backend', choices=AnalizadorLexico.BACKENDS, default='afd',
+                        help="Motor de reconocimiento del analizador")
+    tokens.add_argument('--minimizar', action='store_true', help="Minimiza el AFD del analizador")
+    tokens.set_defaults(funcion=_comando_tokens)
+
+    generar = subcomandos.add_parser('generar', help="Escribe un módulo de Python con el escáner especializado del AFD")
+    generar.add_argument('-o', '--salida', default=None, help="Archivo de salida (por defecto, la salida estándar)")
+    generar.add_argument('--minimizar', action='store_true', help="Minimiza el AFD antes de generar")
+    generar.set_defaults(funcion=_comando_generar)
+    return parser
+
+def main(argv=None) -> int:
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv (list): Argumentos; None usa sys.argv
+
+    Returns:
+        int: Código de salida
+    """
+    argumentos = crear_parser().parse_args(argv)
+    return argumentos.funcion(argumentos)
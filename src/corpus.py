@@ -0,0 +1,168 @@
+"""
+Módulo de corpus sintéticos.
+Este módulo arma código Kotlin sintético del tamaño que se pida a partir
+de un modelo de distribución de tokens: cada perfil asigna un peso a cada
+categoría de fragmento (identificadores, palabras reservadas, números,
+operadores, cadenas, comentarios, errores...), y las líneas se arman
+eligiendo fragmentos según esos pesos. Lo usan las mediciones de
+benchmark.py para comparar el analizador con mezclas de tokens distintas.
+
+Para los tamaños grandes se genera un bloque de hasta TAMANO_BLOQUE
+caracteres y se repite, así que generar 500 MB cuesta poco más que
+copiarlos.
+"""
+
+import random
+import re
+
+# Tamaño máximo del bloque que se genera al azar antes de repetirlo
+TAMANO_BLOQUE = 1 << 20
+
+# Largo máximo de los identificadores válidos del analizador
+LARGO_IDENTIFICADOR = 10
+
+# Palabras con las que se arman identificadores, cadenas y comentarios
+PALABRAS = (
+    'valor', 'total', 'lista', 'indice', 'nombre', 'resultado', 'contador', 'datos',
+    'usuario', 'precio', 'item', 'max', 'min', 'suma', 'tmp', 'buffer', 'estado', 'x', 'y', 'i',
+)
+
+# Palabras clave de Kotlin que aparecen en los corpus (duras y un
+# modificador, más los tipos básicos que el analizador reserva)
+PALABRAS_CLAVE = (
+    'fun', 'val', 'var', 'if', 'else', 'when', 'return', 'Int', 'Double', 'String',
+    'class', 'for', 'while', 'in', 'is', 'null', 'true', 'false', 'this', 'override',
+)
+
+OPERADORES = ('+', '-', '*', '/', '%', '=', '<', '>', '!', '==', '!=', '<=', '>=', '&&', '||', '++', '--')
+DELIMITADORES = ('(', ')', '{', '}', ',', ';', ':')
+
+# Fragmentos que producen errores léxicos: caracteres fuera del lenguaje,
+# operadores inválidos, números mal formados, identificadores demasiado
+# largos y cadenas sin cerrar al final de la línea
+ERRORES = ('@', '#', '$', '?', '`', '=<', '+*', '-+', '>>>', '1.2.3', 'nombreDemasiadoLargo', '"sin cerrar')
+
+# Modelos de distribución: {perfil: {categoría: peso}}
+PERFILES = {
+    'mixto': {
+        'identificador': 30, 'palabra_clave': 10, 'numero': 8, 'operador': 15,
+        'delimitador': 25, 'cadena': 4, 'comentario_linea': 3, 'comentario_bloque': 1, 'error': 0.2,
+    },
+    'comentarios': {
+        'identificador': 10, 'palabra_clave': 3, 'numero': 2, 'operador': 4,
+        'delimitador': 8, 'cadena': 1, 'comentario_linea': 25, 'comentario_bloque': 12, 'error': 0.1,
+    },
+    'cadenas': {
+        'identificador': 10, 'palabra_clave': 3, 'numero': 2, 'operador': 6,
+        'delimitador': 10, 'cadena': 40, 'comentario_linea': 1, 'comentario_bloque': 0.5, 'error': 0.1,
+    },
+    'identificadores': {
+        'identificador': 70, 'palabra_clave': 10, 'numero': 3, 'operador': 6,
+        'delimitador': 10, 'cadena': 0.5, 'comentario_linea': 0.5, 'comentario_bloque': 0, 'error': 0,
+    },
+    'errores': {
+        'identificador': 20, 'palabra_clave': 5, 'numero': 8, 'operador': 10,
+        'delimitador': 12, 'cadena': 3, 'comentario_linea': 1, 'comentario_bloque': 1, 'error': 25,
+    },
+}
+
+# Sufijos de tamaño aceptados por leer_tamano
+_UNIDADES = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+def leer_tamano(texto: str) -> int:
+    """
+    Convierte un tamaño como '1K', '64K', '500M' o '2048' a caracteres.
+
+    Args:
+        texto (str): Número con un sufijo opcional K, M o G (potencias de 1024)
+
+    Returns:
+        int: Tamaño en caracteres
+
+    Raises:
+        ValueError: Si el texto no es un tamaño válido
+    """
+    coincidencia = re.fullmatch(r'\s*(\d+)\s*([KMG]?)B?\s*', texto.upper())
+    if coincidencia is None:
+        raise ValueError(f"Tamaño inválido: '{texto}'")
+    return int(coincidencia.group(1)) * _UNIDADES[coincidencia.group(2)]
+
+def _identificador(generador) -> str:
+    """Nombre en camelCase de hasta LARGO_IDENTIFICADOR caracteres."""
+    palabras = generador.sample(PALABRAS, generador.randint(1, 3))
+    nombre = palabras[0] + ''.join(palabra.capitalize() for palabra in palabras[1:])
+    if generador.random() < 0.2:
+        nombre += str(generador.randint(0, 99))
+    return nombre[:LARGO_IDENTIFICADOR]
+
+def _numero(generador) -> str:
+    """Número natural o real."""
+    if generador.random() < 0.3:
+        return f"{generador.randint(0, 9999)}.{generador.randint(0, 99)}"
+    return str(generador.randint(0, 100000))
+
+def _cadena(generador) -> str:
+    """Cadena de palabras, a veces con escapes y caracteres no ASCII."""
+    partes = generador.choices(PALABRAS, k=generador.randint(0, 8))
+    if generador.random() < 0.2:
+        partes.append(generador.choice(('\\"', '\\\\', 'á', 'ñ', '¿', '%d')))
+    return '"' + ' '.join(partes) + '"'
+
+def _comentario_linea(generador) -> str:
+    """Comentario de línea, con su salto de línea."""
+    return '// ' + ' '.join(generador.choices(PALABRAS, k=generador.randint(2, 12))) + '\n'
+
+def _comentario_bloque(generador) -> str:
+    """Comentario de bloque de una o más líneas."""
+    lineas = [' '.join(generador.choices(PALABRAS, k=generador.randint(2, 10)))
+              for _ in range(generador.randint(1, 6))]
+    return '/* ' + '\n * '.join(lineas) + ' */'
+
+# Generador de cada categoría de fragmento
+_FRAGMENTOS = {
+    'identificador': _identificador,
+    'palabra_clave': lambda generador: generador.choice(PALABRAS_CLAVE),
+    'numero': _numero,
+    'operador': lambda generador: generador.choice(OPERADORES),
+    'delimitador': lambda generador: generador.choice(DELIMITADORES),
+    'cadena': _cadena,
+    'comentario_linea': _comentario_linea,
+    'comentario_bloque': _comentario_bloque,
+    'error': lambda generador: generador.choice(ERRORES),
+}
+
+def generar_corpus(tamano: int, perfil: str = 'mixto', semilla: int = 0) -> str:
+    """
+    Genera código Kotlin sintético con la distribución de tokens de un perfil.
+
+    Args:
+        tamano (int): Cantidad de caracteres del código (casi todo ASCII, así
+                      que son aproximadamente bytes)
+        perfil (str): Clave de PERFILES
+        semilla (int): Semilla del generador aleatorio (para reproducibilidad)
+
+    Returns:
+        str: Código de exactamente `tamano` caracteres, en líneas sangradas
+        de fragmentos separados por espacios. Si supera TAMANO_BLOQUE, es
+        un bloque generado al azar repetido y cortado
+
+    Raises:
+        ValueError: Si el perfil no existe
+    """
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil desconocido '{perfil}', se esperaba uno de {tuple(PERFILES)}")
+    generador = random.Random(f"{perfil}:{semilla}")
+    categorias = list(PERFILES[perfil])
+    pesos = list(PERFILES[perfil].values())
+
+    partes = []
+    longitud = 0
+    objetivo = min(tamano, TAMANO_BLOQUE)
+    while longitud < objetivo:
+        fragmentos = [_FRAGMENTOS[categoria](generador)
+                      for categoria in generador.choices(categorias, pesos, k=generador.randint(1, 10))]
+        linea = '    ' * generador.randint(0, 3) + ' '.join(fragmentos).rstrip('\n') + '\n'
+        partes.append(linea)
+        longitud += len(linea)
+    bloque = ''.join(partes)
+    return (bloque * (tamano // len(bloque) + 1))[:tamano] if bloque else ''
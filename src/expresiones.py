@@ -0,0 +1,463 @@
+"""
+Módulo de expresiones regulares.
+Este módulo traduce expresiones regulares a AFNDs con la construcción de
+Thompson, para declarar los patrones léxicos como una tabla de expresiones
+en lugar de agregar cada estado y transición a mano.
+
+Sintaxis admitida (un subconjunto de la del módulo `re`):
+- Caracteres literales y escapes: \\n, \\t, \\r, \\f, \\v, \\a, \\0, \\xHH,
+  \\uHHHH, \\UHHHHHHHH y cualquier signo escapado (\\., \\*, ...)
+- Clases: [abc], [a-z], [^...], '.', \\d, \\D, \\w, \\W, \\s, \\S, con el
+  mismo significado Unicode que en `re`
+- Alternación |, concatenación, grupos (...), (?:...) y (?P<nombre>...)
+- Cuantificadores *, +, ?, {m}, {m,}, {,n} y {m,n}; las variantes perezosas
+  (*?, +?, ...) se aceptan y reconocen el mismo lenguaje
+
+No se admiten anclas (^, $, \\b, \\A, \\Z), referencias hacia atrás,
+búsquedas hacia adelante ni banderas, porque no describen lenguajes que un
+AFND pueda reconocer carácter a carácter.
+"""
+
+import re
+from functools import lru_cache
+from .afnd import AFND
+from .caracteres import ClaseCaracteres
+
+# Una clase cuyo complemento tiene a lo sumo esta cantidad de caracteres se
+# agrega como transición "excepto" (todo salvo esos caracteres), igual que
+# los patrones escritos a mano, en lugar de como intervalos
+LIMITE_EXCEPTO = 256
+
+# Escapes de un carácter
+ESCAPES = {'a': '\a', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
+# Cantidad de dígitos hexadecimales de los escapes \x, \u y \U
+ESCAPES_HEXADECIMALES = {'x': 2, 'u': 4, 'U': 8}
+
+# Repetición con llaves: {m}, {m,}, {,n} o {m,n}
+REPETICION = re.compile(r'\{(\d*)(,?)(\d*)\}')
+
+class ErrorExpresion(ValueError):
+    """
+    Error de sintaxis (o construcción no admitida) en una expresión regular.
+
+    Atributos:
+        patron (str): Expresión que se estaba analizando
+        posicion (int): Índice del carácter donde se detectó el error
+    """
+
+    def __init__(self, mensaje: str, patron: str, posicion: int):
+        super().__init__(f"{mensaje} en la posición {posicion} de {patron!r}")
+        self.patron = patron
+        self.posicion = posicion
+
+@lru_cache(maxsize=None)
+def clase_escape(letra: str) -> ClaseCaracteres:
+    """
+    Args:
+        letra (str): Letra de un escape de clase: d, D, w, W, s o S
+
+    Returns:
+        ClaseCaracteres: Los caracteres que reconoce el escape en `re` con
+        cadenas Unicode: \\d son los dígitos decimales (categoría Nd), \\w
+        las letras, los números y el guion bajo, \\s los caracteres de
+        str.isspace, y las mayúsculas sus complementos
+    """
+    minuscula = letra.lower()
+    if minuscula == 'd':
+        clase = ClaseCaracteres.categorias('Nd')
+    elif minuscula == 'w':
+        clase = ClaseCaracteres.categorias('L', 'N') | ClaseCaracteres('_')
+    else:
+        # Todos los espacios de Unicode están por debajo de U+3001
+        clase = ClaseCaracteres(c for c in map(chr, range(0x3001)) if c.isspace())
+    return clase.complemento() if letra.isupper() else clase
+
+def escapar_clase(caracteres) -> str:
+    """
+    Escribe un conjunto de caracteres como clase de una expresión regular.
+
+    Args:
+        caracteres: Iterable de caracteres
+
+    Returns:
+        str: Clase [...] con los caracteres ordenados y escapados, válida
+             tanto para `re` como para este módulo
+    """
+    return '[' + ''.join(re.escape(c) for c in sorted(caracteres)) + ']'
+
+class _Lector:
+    """
+    Analizador sintáctico descendente de expresiones regulares.
+
+    Produce un árbol de tuplas:
+    - ('clase', ClaseCaracteres): un carácter de la clase
+    - ('secuencia', [nodos]): concatenación (vacía: la cadena vacía)
+    - ('alternativa', [nodos]): unión
+    - ('repeticion', nodo, minimo, maximo): maximo es None si no hay tope
+    """
+
+    def __init__(self, patron: str):
+        self.patron = patron
+        self.posicion = 0
+
+    def error(self, mensaje: str, posicion: int = None):
+        return ErrorExpresion(mensaje, self.patron, self.posicion if posicion is None else posicion)
+
+    def ver(self):
+        return self.patron[self.posicion] if self.posicion < len(self.patron) else None
+
+    def tomar(self) -> str:
+        caracter = self.ver()
+        if caracter is None:
+            raise self.error("Fin inesperado de la expresión")
+        self.posicion += 1
+        return caracter
+
+    def leer(self):
+        nodo = self.alternativa()
+        if self.ver() is not None:
+            raise self.error("Paréntesis ')' sin abrir")
+        return nodo
+
+    def alternativa(self):
+        ramas = [self.secuencia()]
+        while self.ver() == '|':
+            self.posicion += 1
+            ramas.append(self.secuencia())
+        return ramas[0] if len(ramas) == 1 else ('alternativa', ramas)
+
+    def secuencia(self):
+        nodos = []
+        while self.ver() not in (None, '|', ')'):
+            nodos.append(self.repeticion())
+        return nodos[0] if len(nodos) == 1 else ('secuencia', nodos)
+
+    def repeticion(self):
+        inicio = self.posicion
+        nodo = self.atomo()
+        cuantificado = False
+        while True:
+            limites = self.cuantificador()
+            if limites is None:
+                return nodo
+            if cuantificado:
+                raise self.error("Cuantificador repetido", inicio)
+            cuantificado = True
+            nodo = ('repeticion', nodo) + limites
+            # Perezoso: mismo lenguaje. Posesivo: no admitido
+            if self.ver() == '?':
+                self.posicion += 1
+            elif self.ver() == '+':
+                raise self.error("Cuantificador posesivo no admitido")
+
+    def cuantificador(self):
+        caracter = self.ver()
+        if caracter in ('*', '+', '?'):
+            self.posicion += 1
+            return {'*': (0, None), '+': (1, None), '?': (0, 1)}[caracter]
+        if caracter != '{':
+            return None
+        
+        # {m}, {m,}, {,n} o {m,n}; cualquier otra cosa es una llave literal
+        if not self._es_repeticion(self.posicion):
+            return None
+        coincidencia = REPETICION.match(self.patron, self.posicion)
+        minimo = int(coincidencia[1] or 0)
+        if not coincidencia[2]:
+            maximo = minimo
+        else:
+            maximo = int(coincidencia[3]) if coincidencia[3] else None
+        if maximo is not None and maximo < minimo:
+            raise self.error("Repetición con mínimo mayor que el máximo")
+        self.posicion = coincidencia.end()
+        return minimo, maximo
+
+    def _es_repeticion(self, posicion: int) -> bool:
+        coincidencia = REPETICION.match(self.patron, posicion)
+        return coincidencia is not None and bool(coincidencia[1] or coincidencia[3])
+
+    def atomo(self):
+        posicion = self.posicion
+        caracter = self.tomar()
+        if caracter == '(':
+            nodo = self.grupo()
+            if self.ver() != ')':
+                raise self.error("Falta ')'", posicion)
+            self.posicion += 1
+            return nodo
+        if caracter == '[':
+            return ('clase', self.clase())
+        if caracter == '.':
+            return ('clase', ClaseCaracteres('\n').complemento())
+        if caracter == '\\':
+            return ('clase', self.escape(en_clase=False))
+        if caracter in '*+?' or (caracter == '{' and self._es_repeticion(posicion)):
+            raise self.error("Cuantificador sin nada que repetir", posicion)
+        if caracter in '^$':
+            raise self.error(f"Ancla '{caracter}' no admitida", posicion)
+        return ('clase', ClaseCaracteres(caracter))
+
+    def grupo(self):
+        if self.ver() == '?':
+            if self.patron.startswith('?:', self.posicion):
+                self.posicion += 2
+            elif self.patron.startswith('?P<', self.posicion):
+                cierre = self.patron.find('>', self.posicion)
+                if cierre < 0 or not self.patron[self.posicion + 3:cierre].isidentifier():
+                    raise self.error("Nombre de grupo inválido")
+                self.posicion = cierre + 1
+            else:
+                raise self.error("Grupo especial no admitido")
+        return self.alternativa()
+
+    def clase(self) -> ClaseCaracteres:
+        inicio = self.posicion - 1
+        negada = self.ver() == '^'
+        if negada:
+            self.posicion += 1
+        
+        intervalos = []
+        primero = True
+        while True:
+            if self.ver() is None:
+                raise self.error("Falta ']'", inicio)
+            if self.ver() == ']' and not primero:
+                self.posicion += 1
+                break
+            primero = False
+            desde = self.elemento_de_clase()
+            if self.ver() == '-' and self.patron[self.posicion + 1:self.posicion + 2] not in ('', ']'):
+                self.posicion += 1
+                hasta = self.elemento_de_clase()
+                if len(desde) != 1 or len(hasta) != 1:
+                    raise self.error("Rango de clase con un escape de clase")
+                desde, hasta = desde.intervalos[0][0], hasta.intervalos[0][0]
+                if hasta < desde:
+                    raise self.error("Rango de clase invertido")
+                intervalos.append((desde, hasta))
+            else:
+                intervalos.extend(desde.intervalos)
+        clase = ClaseCaracteres(intervalos=intervalos)
+        return clase.complemento() if negada else clase
+
+    def elemento_de_clase(self) -> ClaseCaracteres:
+        caracter = self.tomar()
+        if caracter == '\\':
+            return self.escape(en_clase=True)
+        return ClaseCaracteres(caracter)
+
+    def escape(self, en_clase: bool) -> ClaseCaracteres:
+        posicion = self.posicion - 1
+        letra = self.tomar()
+        if letra in 'dDwWsS':
+            return clase_escape(letra)
+        if letra in ESCAPES:
+            return ClaseCaracteres(ESCAPES[letra])
+        if letra == 'b' and en_clase:
+            return ClaseCaracteres('\b')
+        if letra in ESCAPES_HEXADECIMALES:
+            digitos = self.patron[self.posicion:self.posicion + ESCAPES_HEXADECIMALES[letra]]
+            if len(digitos) != ESCAPES_HEXADECIMALES[letra] or not all(c in '0123456789abcdefABCDEF' for c in digitos):
+                raise self.error(f"Escape \\{letra} incompleto", posicion)
+            self.posicion += len(digitos)
+            try:
+                return ClaseCaracteres(intervalos=[(int(digitos, 16),) * 2])
+            except ValueError:
+                raise self.error("Carácter fuera de Unicode", posicion) from None
+        if letra == '0':
+            octal = letra
+            while len(octal) < 3 and self.ver() is not None and self.ver() in '01234567':
+                octal += self.tomar()
+            return ClaseCaracteres(chr(int(octal, 8)))
+        if letra.isdigit():
+            raise self.error("Referencias hacia atrás no admitidas", posicion)
+        if letra.isascii() and letra.isalpha():
+            raise self.error(f"Escape \\{letra} no admitido", posicion)
+        return ClaseCaracteres(letra)
+
+def analizar_expresion(patron: str):
+    """
+    Analiza la sintaxis de una expresión regular.
+
+    Args:
+        patron (str): Expresión regular
+
+    Returns:
+        tuple: Árbol de la expresión (ver _Lector)
+
+    Raises:
+        ErrorExpresion: Si la expresión es inválida o usa algo no admitido
+    """
+    return _Lector(patron).leer()
+
+class _Thompson:
+    """
+    Agrega a un AFND los fragmentos de la construcción de Thompson.
+
+    Cada fragmento se construye a partir del estado en el que termina el
+    anterior, y solo se crean estados para los símbolos, los cierres y los
+    puntos donde se juntan las ramas; así el AFND de una tabla completa
+    tiene unos pocos estados por patrón y la clausura epsilon es corta.
+    Los estados se llaman prefijo + número, saltando los nombres que el
+    AFND ya usa.
+    """
+
+    def __init__(self, afnd: AFND, prefijo: str):
+        self.afnd = afnd
+        self.prefijo = prefijo
+        self.contador = 0
+
+    def nuevo(self):
+        estado = f"{self.prefijo}{self.contador}"
+        while estado in self.afnd.estados:
+            self.contador += 1
+            estado = f"{self.prefijo}{self.contador}"
+        self.contador += 1
+        self.afnd.agregar_estado(estado)
+        return estado
+
+    def epsilon(self, origen, destino):
+        self.afnd.agregar_transicion(origen, self.afnd.epsilon, destino)
+
+    def construir(self, nodo, entrada):
+        """
+        Args:
+            nodo (tuple): Árbol de analizar_expresion
+            entrada: Estado desde el que se reconoce el fragmento. No puede
+                     tener transiciones que vuelvan a él desde el fragmento
+        
+        Returns:
+            El estado al que se llega tras reconocer el fragmento. Los
+            cierres vuelven siempre a un estado nuevo, nunca a `entrada`
+        """
+        tipo = nodo[0]
+        if tipo == 'clase':
+            salida = self.nuevo()
+            self.transicion(entrada, nodo[1], salida)
+            return salida
+        if tipo == 'secuencia':
+            actual = entrada
+            for hijo in nodo[1]:
+                actual = self.construir(hijo, actual)
+            return actual
+        if tipo == 'alternativa':
+            salida = self.nuevo()
+            for hijo in nodo[1]:
+                self.epsilon(self.construir(hijo, entrada), salida)
+            return salida
+        
+        _, hijo, minimo, maximo = nodo
+        actual = entrada
+        # Copias obligatorias
+        for _ in range(minimo):
+            actual = self.construir(hijo, actual)
+        if maximo is None:
+            # Cierre de Kleene de una copia más
+            ciclo = self.nuevo()
+            self.epsilon(actual, ciclo)
+            self.epsilon(self.construir(hijo, ciclo), ciclo)
+            return ciclo
+        if maximo == minimo:
+            return actual
+        
+        # Copias opcionales, cada una puede saltarse hasta la salida
+        salida = self.nuevo()
+        for _ in range(maximo - minimo):
+            self.epsilon(actual, salida)
+            actual = self.construir(hijo, actual)
+        self.epsilon(actual, salida)
+        return salida
+
+    def transicion(self, origen, clase: ClaseCaracteres, destino):
+        """
+        Agrega la transición con una clase en la forma más compacta.
+        
+        Un solo carácter es un símbolo del alfabeto; una clase que excluye
+        pocos caracteres (como [^\\n] o '.') es una transición "excepto";
+        las demás se guardan como ClaseCaracteres. El carácter epsilon del
+        AFND nunca se agrega como símbolo, para no confundirlo con una
+        transición epsilon.
+        """
+        epsilon = self.afnd.epsilon
+        if len(clase.intervalos) == 1 and clase.intervalos[0][0] == clase.intervalos[0][1]:
+            caracter = chr(clase.intervalos[0][0])
+            if caracter != epsilon:
+                self.afnd.agregar_transicion(origen, caracter, destino)
+                return
+        complemento = clase.complemento()
+        if len(complemento) <= LIMITE_EXCEPTO and epsilon not in complemento:
+            self.afnd.agregar_transicion_excepto(origen, set(complemento.caracteres()), destino)
+        else:
+            self.afnd.agregar_transicion(origen, clase, destino)
+
+def agregar_expresion(afnd: AFND, patron: str, origen, tipo=None, prioridad: int = 0, prefijo: str = 'e'):
+    """
+    Agrega una expresión regular a un AFND con la construcción de Thompson.
+
+    Args:
+        afnd (AFND): Autómata al que se agrega la expresión
+        patron (str): Expresión regular
+        origen: Estado desde el que parte una transición epsilon hacia el
+                fragmento de la expresión
+        tipo: Tipo de token del estado final (opcional)
+        prioridad (int): Prioridad del tipo (ver AFND.agregar_estado_final)
+        prefijo (str): Prefijo de los nombres de los estados nuevos
+
+    Returns:
+        El estado final del fragmento
+
+    Raises:
+        ErrorExpresion: Si la expresión es inválida o usa algo no admitido
+    """
+    arbol = analizar_expresion(patron)
+    constructor = _Thompson(afnd, prefijo)
+    entrada = constructor.nuevo()
+    constructor.epsilon(origen, entrada)
+    salida = constructor.construir(arbol, entrada)
+    afnd.agregar_estado_final(salida, tipo, prioridad)
+    return salida
+
+def afnd_desde_tabla(tabla, afnd: AFND = None) -> AFND:
+    """
+    Construye un AFND a partir de una tabla de patrones.
+
+    Args:
+        tabla: Iterable de tuplas (tipo, patron, prioridad)
+        afnd (AFND): AFND vacío a completar; por defecto se crea uno
+
+    Returns:
+        AFND: Autómata con estado inicial 'inicio' y una transición epsilon
+        hacia cada patrón, cuyo estado final queda etiquetado con su tipo y
+        prioridad. Los estados de cada patrón usan el tipo en minúsculas
+        como prefijo
+
+    Raises:
+        ErrorExpresion: Si algún patrón es inválido
+    """
+    if afnd is None:
+        afnd = AFND()
+    afnd.establecer_estado_inicial('inicio')
+    for tipo, patron, prioridad in tabla:
+        agregar_expresion(afnd, patron, 'inicio', tipo, prioridad, prefijo=f"{str(tipo).lower()}_")
+    return afnd
+
+def afnd_desde_expresion(patron: str, afnd: AFND = None) -> AFND:
+    """
+    Construye un AFND que reconoce exactamente una expresión regular.
+
+    Args:
+        patron (str): Expresión regular
+        afnd (AFND): AFND vacío a completar; por defecto se crea uno
+
+    Returns:
+        AFND: Autómata equivalente a re.fullmatch(patron, cadena)
+
+    Raises:
+        ErrorExpresion: Si la expresión es inválida o usa algo no admitido
+    """
+    if afnd is None:
+        afnd = AFND()
+    afnd.establecer_estado_inicial('inicio')
+    agregar_expresion(afnd, patron, 'inicio', prefijo='q')
+    return afnd
@@ -0,0 +1,255 @@
+"""
+Módulo generador de escáneres.
+Este módulo escribe, a partir de un AFDCompilado, el código fuente de un
+módulo de Python independiente (sin importar este paquete) cuyo bucle de
+reconocimiento está especializado para ese AFD:
+
+- El texto se traduce una sola vez a un `bytes` con la clase de cada
+  carácter: si cabe en latin-1 con bytes.translate y una tabla de 256
+  clases, y si no con str.translate y un diccionario que resuelve por
+  intervalos las clases grandes. La clase de un carácter es así un acceso
+  por índice
+- Cada estado es un bloque de código con su número como constante; se
+  llega a él por un árbol de comparaciones `estado < k` en lugar de una
+  búsqueda en la tabla
+- Los estados con un ciclo sobre sí mismos (identificadores, espacios,
+  comentarios, cadenas) consumen los caracteres del ciclo en un `while`
+  propio que solo consulta una fila de `bytes`
+- La fila de transiciones de cada estado es un `bytes` indexado por clase
+
+El módulo generado expone `preparar(codigo)`, `reconocer(clases, inicio)`
+(con el mismo resultado que AnalizadorLexico._reconocer_afd) y
+`escanear(codigo)`, que recorre todo el código sin una llamada por token.
+AnalizadorLexico lo usa con backend='generado', y `python -m src generar`
+lo escribe en un archivo.
+"""
+
+import types
+from .afd import AFDCompilado
+
+# Los estados y clases se guardan en bytes: como máximo 256 de cada uno
+MAXIMO_BYTES = 256
+
+def generar_escaner(afd: AFDCompilado, huella: str = '') -> str:
+    """
+    Genera el código fuente de un escáner especializado para un AFD.
+
+    Args:
+        afd (AFDCompilado): AFD a especializar (el de clases 0 como "otro")
+        huella (str): Huella de la gramática, que se anota en el módulo
+
+    Returns:
+        str: Código fuente del módulo
+
+    Raises:
+        ValueError: Si el AFD tiene más de MAXIMO_BYTES clases (no caben en
+                    la traducción a bytes)
+    """
+    if afd.n_clases > MAXIMO_BYTES:
+        raise ValueError(f"El AFD tiene {afd.n_clases} clases; el generador admite hasta {MAXIMO_BYTES}")
+    filas = bytes if afd.n_estados <= MAXIMO_BYTES else tuple
+
+    lineas = [
+        '"""',
+        "Escáner léxico generado por src/generador.py. No editar.",
+        f"Huella de la gramática: {huella or 'desconocida'}",
+        '"""',
+        '',
+        'from bisect import bisect_right',
+        '',
+        f'HUELLA = {huella!r}',
+        f'N_ESTADOS = {afd.n_estados}',
+        f'N_CLASES = {afd.n_clases}',
+        '',
+        '# Clase de cada carácter suelto y de los intervalos de las clases grandes',
+        f'CLASES = {dict(sorted((ord(c), clase) for c, clase in afd.clases.sueltos().items() if isinstance(c, str) and len(c) == 1))!r}',
+        f'INTERVALOS = {[(inicio, fin, clase) for inicio, fin, clase in afd.clases.intervalos]!r}',
+        '_INICIOS = [inicio for inicio, _, _ in INTERVALOS]',
+        '',
+        '',
+        'class _Traduccion(dict):',
+        '    """Tabla de str.translate: punto de código -> carácter con su clase."""',
+        '',
+        '    def __missing__(self, punto):',
+        '        indice = bisect_right(_INICIOS, punto) - 1',
+        '        clase = 0',
+        '        if indice >= 0 and punto <= INTERVALOS[indice][1]:',
+        '            clase = INTERVALOS[indice][2]',
+        '        self[punto] = caracter = chr(clase)',
+        '        return caracter',
+        '',
+        '',
+        '_TRADUCCION = _Traduccion((punto, chr(clase)) for punto, clase in CLASES.items())',
+        '_TRADUCCION_LATIN1 = bytes(ord(_TRADUCCION[punto]) for punto in range(256))',
+        '',
+        '',
+        'def preparar(codigo):',
+        '    """Devuelve un bytes con la clase de cada carácter del código."""',
+        '    # Si todos los caracteres caben en latin-1 bytes.translate lo hace en C',
+        '    try:',
+        "        return codigo.encode('latin-1').translate(_TRADUCCION_LATIN1)",
+        '    except UnicodeEncodeError:',
+        "        return codigo.translate(_TRADUCCION).encode('latin-1')",
+        '',
+        '',
+        'def _crear():',
+    ]
+
+    # Filas de transiciones y ciclos de cada estado (variables de la clausura)
+    ciclos = {}
+    for estado in range(1, afd.n_estados):
+        fila = [afd.tabla[estado * afd.n_clases + clase] for clase in range(afd.n_clases)]
+        lineas.append(f'    S{estado} = {filas(fila)!r}')
+        ciclo = [int(destino == estado) for destino in fila]
+        if any(ciclo):
+            ciclos[estado] = ciclo
+            lineas.append(f'    B{estado} = {bytes(ciclo)!r}')
+
+    lineas += [
+        '',
+        '    def reconocer(clases, inicio):',
+        '        """',
+        '        Reconoce el lexema más largo desde `inicio` sobre el resultado de',
+        '        preparar(). Devuelve (tipo, fin, agotado) como el AFD interpretado.',
+        '        """',
+        '        n = len(clases)',
+        '        if inicio == n:',
+        '            return None, inicio, True',
+        f'        estado = S{afd.estado_inicial}[clases[inicio]]',
+        '        if not estado:',
+        '            return None, inicio, False',
+        '        i = inicio + 1',
+        '        tipo = None',
+        '        fin = inicio',
+    ]
+    _generar_maquina(afd, ciclos, 2, lineas, 'return tipo, fin, True', 'return tipo, fin, False')
+    lineas += [
+        '',
+        '    def escanear(codigo):',
+        '        """',
+        '        Recorre todo el código con la regla del máximo alcance.',
+        '',
+        '        Genera tuplas (tipo, inicio, fin); tipo es None para un carácter',
+        '        que ningún patrón reconoce.',
+        '        """',
+        '        clases = preparar(codigo)',
+        '        n = len(clases)',
+        '        inicio = 0',
+        '        while inicio < n:',
+        '            tipo = None',
+        '            fin = inicio',
+        f'            estado = S{afd.estado_inicial}[clases[inicio]]',
+        '            i = inicio + 1',
+        '            if estado:',
+    ]
+    _generar_maquina(afd, ciclos, 4, lineas, 'break', 'break')
+    lineas += [
+        '            if tipo is None or fin == inicio:',
+        '                yield None, inicio, inicio + 1',
+        '                inicio += 1',
+        '            else:',
+        '                yield tipo, inicio, fin',
+        '                inicio = fin',
+        '',
+        '    return reconocer, escanear',
+        '',
+        '',
+        'reconocer, escanear = _crear()',
+        '',
+    ]
+    return '\n'.join(lineas)
+
+def _generar_maquina(afd: AFDCompilado, ciclos: dict, nivel: int, lineas: list, agotado: str, muerto: str):
+    """
+    Agrega el bucle que recorre el AFD desde el estado de la variable `estado`.
+
+    Args:
+        afd (AFDCompilado): AFD a especializar
+        ciclos (dict): {estado: fila de 0/1 por clase} de los estados con ciclo
+        nivel (int): Nivel de sangría (de cuatro espacios)
+        lineas (list): Líneas del módulo, a las que se agrega el código
+        agotado (str): Sentencia que termina el recorrido al final del texto
+        muerto (str): Sentencia que lo termina al llegar al estado muerto
+    """
+    lineas.append('    ' * nivel + 'while True:')
+    _generar_arbol(afd, ciclos, list(range(1, afd.n_estados)), nivel + 1, lineas, agotado, muerto)
+
+def _generar_arbol(afd: AFDCompilado, ciclos: dict, estados: list, nivel: int, lineas: list,
+                   agotado: str, muerto: str):
+    """
+    Agrega el árbol de comparaciones que lleva al bloque de cada estado.
+
+    Args:
+        afd (AFDCompilado): AFD a especializar
+        ciclos (dict): {estado: fila de 0/1 por clase} de los estados con ciclo
+        estados (list): Estados consecutivos que cubre este subárbol
+        nivel (int): Nivel de sangría (de cuatro espacios)
+        lineas (list): Líneas del módulo, a las que se agrega el código
+        agotado (str): Ver _generar_maquina
+        muerto (str): Ver _generar_maquina
+    """
+    sangria = '    ' * nivel
+    if len(estados) == 1:
+        _generar_estado(afd, ciclos, estados[0], nivel, lineas, agotado, muerto)
+        return
+    medio = len(estados) // 2
+    lineas.append(f'{sangria}if estado < {estados[medio]}:')
+    _generar_arbol(afd, ciclos, estados[:medio], nivel + 1, lineas, agotado, muerto)
+    lineas.append(f'{sangria}else:')
+    _generar_arbol(afd, ciclos, estados[medio:], nivel + 1, lineas, agotado, muerto)
+
+def _generar_estado(afd: AFDCompilado, ciclos: dict, estado: int, nivel: int, lineas: list,
+                    agotado: str, muerto: str):
+    """
+    Agrega el bloque de un estado: anota el lexema si es final, consume su
+    ciclo y pasa al estado siguiente (o termina).
+
+    Args:
+        afd (AFDCompilado): AFD a especializar
+        ciclos (dict): {estado: fila de 0/1 por clase} de los estados con ciclo
+        estado (int): Estado del bloque
+        nivel (int): Nivel de sangría (de cuatro espacios)
+        lineas (list): Líneas del módulo, a las que se agrega el código
+        agotado (str): Ver _generar_maquina
+        muerto (str): Ver _generar_maquina
+    """
+    sangria = '    ' * nivel
+    tipo = afd.tipos[estado]
+    comentario = f'{sangria}# Estado {estado}'
+    lineas.append(comentario + (f' ({tipo})' if tipo is not None else ''))
+    if tipo is not None:
+        # Se llega a un estado siempre después de consumir un carácter, así
+        # que el lexema nunca es vacío
+        lineas.append(f'{sangria}tipo = {tipo!r}')
+        lineas.append(f'{sangria}fin = i')
+    if estado in ciclos:
+        lineas.append(f'{sangria}while i < n and B{estado}[clases[i]]:')
+        lineas.append(f'{sangria}    i += 1')
+        if tipo is not None:
+            lineas.append(f'{sangria}fin = i')
+    lineas.append(f'{sangria}if i == n:')
+    lineas.append(f'{sangria}    {agotado}')
+    if not any(afd.tabla[estado * afd.n_clases + clase] for clase in range(afd.n_clases)):
+        # Sin transiciones: el lexema ya no puede crecer
+        lineas.append(f'{sangria}{muerto}')
+        return
+    lineas.append(f'{sangria}estado = S{estado}[clases[i]]')
+    lineas.append(f'{sangria}i += 1')
+    lineas.append(f'{sangria}if not estado:')
+    lineas.append(f'{sangria}    {muerto}')
+
+def cargar_escaner(fuente: str, nombre: str = 'escaner_generado') -> types.ModuleType:
+    """
+    Carga en memoria un módulo generado por generar_escaner.
+
+    Args:
+        fuente (str): Código fuente del módulo
+        nombre (str): Nombre del módulo
+
+    Returns:
+        types.ModuleType: Módulo con preparar, reconocer y escanear
+    """
+    modulo = types.ModuleType(nombre)
+    modulo.__file__ = f'<{nombre}>'
+    exec(compile(fuente, modulo.__file__, 'exec'), modulo.__dict__)
+    return modulo
@@ -4,10 +4,14 @@ Este módulo implementa una interfaz gráfica de usuario (GUI) que permite
 interactuar con el analizador léxico de manera visual e intuitiva.
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 from tkinter import scrolledtext
 from .analizador_lexico import AnalizadorLexico
+from .tabla_virtual import TablaVirtual
+from .token import TipoToken, contar_por_tipo
 
 class AnalizadorLexicoGUI:
     """
@@ -15,11 +19,23 @@ class AnalizadorLexicoGUI:
     
     Proporciona una ventana con:
     - Área de texto para ingresar código fuente
-    - Tabla para mostrar los tokens identificados
-    - Botones para analizar el código y probar los autómatas
+    - Tabla virtual para mostrar los tokens identificados, con orden por
+      columna, filtro por categoría y salto a una línea
+    - Botones para analizar el código, cancelar el análisis y probar los autómatas
+    - Barra de progreso del análisis
     - Visualización clara de errores léxicos
+    
+    El análisis corre en un hilo de trabajo que envía los tokens por lotes
+    a una cola; la ventana la consulta periódicamente con root.after y
+    muestra los tokens recibidos. Como la tabla solo dibuja las filas
+    visibles, actualizarla no depende de la cantidad de tokens.
     """
     
+    # Milisegundos entre consultas de la cola de resultados
+    INTERVALO_SONDEO = 15
+    # Texto del filtro que muestra todas las categorías
+    TODAS = "Todas"
+    
     def __init__(self, root):
         """
         Inicializa la ventana principal y sus componentes.
@@ -31,6 +47,15 @@ class AnalizadorLexicoGUI:
         self.root.title("Analizador Léxico Kotlin")
         self.analizador = AnalizadorLexico()
         
+        # Último análisis, para reanalizar solo lo que cambie
+        self.resultado = None
+        
+        # Estado del análisis en segundo plano
+        self.cola = queue.Queue()
+        self.trabajo = None
+        self.cancelar = None
+        self.parcial = None
+        
         # Configurar el tema
         style = ttk.Style()
         style.theme_use('clam')
@@ -46,7 +71,8 @@ class AnalizadorLexicoGUI:
         - Frame principal
         - Área de texto con scroll
         - Frame de botones
-        - Tabla de tokens con scrollbars
+        - Controles de filtro por categoría y salto a línea
+        - Tabla virtual de tokens
         """
         # Frame principal
         self.main_frame = ttk.Frame(self.root, padding="10")
@@ -72,6 +98,22 @@ class AnalizadorLexicoGUI:
             command=self._analizar_codigo
         )
         
+        # Botón para cancelar el análisis en curso
+        self.cancelar_btn = ttk.Button(
+            self.botones_frame,
+            text="Cancelar",
+            command=self._cancelar_analisis,
+            state=tk.DISABLED
+        )
+        
+        # Barra de progreso del análisis
+        self.progreso = ttk.Progressbar(
+            self.botones_frame,
+            orient=tk.HORIZONTAL,
+            length=200,
+            mode='determinate'
+        )
+        
         # Botón para probar AFND
         self.probar_afnd_btn = ttk.Button(
             self.botones_frame,
@@ -79,35 +121,33 @@ class AnalizadorLexicoGUI:
             command=self._probar_afnd
         )
         
-        # Tabla de tokens
-        self.tabla_frame = ttk.Frame(self.main_frame)
-        self.tabla = ttk.Treeview(
-            self.tabla_frame,
-            columns=('Lexema', 'Categoría', 'Fila', 'Columna'),
-            show='headings'
+        # Filtro por categoría
+        self.vista_frame = ttk.Frame(self.main_frame)
+        self.filtro_label = ttk.Label(self.vista_frame, text="Categoría:")
+        self.filtro_combo = ttk.Combobox(
+            self.vista_frame,
+            values=[self.TODAS] + [tipo.name for tipo in TipoToken],
+            state='readonly',
+            width=20
         )
+        self.filtro_combo.set(self.TODAS)
+        self.filtro_combo.bind('<<ComboboxSelected>>', self._filtrar)
         
-        # Configurar columnas
-        self.tabla.heading('Lexema', text='Lexema')
-        self.tabla.heading('Categoría', text='Categoría')
-        self.tabla.heading('Fila', text='Fila')
-        self.tabla.heading('Columna', text='Columna')
-        
-        # Scrollbars para la tabla
-        self.scrolly = ttk.Scrollbar(
-            self.tabla_frame,
-            orient=tk.VERTICAL,
-            command=self.tabla.yview
-        )
-        self.scrollx = ttk.Scrollbar(
-            self.tabla_frame,
-            orient=tk.HORIZONTAL,
-            command=self.tabla.xview
-        )
-        self.tabla.configure(
-            yscrollcommand=self.scrolly.set,
-            xscrollcommand=self.scrollx.set
+        # Salto a una línea
+        self.linea_label = ttk.Label(self.vista_frame, text="Línea:")
+        self.linea_entry = ttk.Entry(self.vista_frame, width=8)
+        self.linea_entry.bind('<Return>', self._ir_a_linea)
+        self.ir_btn = ttk.Button(
+            self.vista_frame,
+            text="Ir",
+            command=self._ir_a_linea
         )
+        
+        # Tabla de tokens
+        self.tabla = TablaVirtual(self.main_frame)
+        
+        # Resumen de cantidad de tokens por tipo
+        self.resumen_label = ttk.Label(self.main_frame, text="")
 
     def _configurar_layout(self):
         """
@@ -125,55 +165,178 @@ class AnalizadorLexicoGUI:
         # Frame de botones
         self.botones_frame.grid(row=2, column=0, pady=10)
         self.analizar_btn.grid(row=0, column=0, padx=5)
-        self.probar_afnd_btn.grid(row=0, column=1, padx=5)
+        self.cancelar_btn.grid(row=0, column=1, padx=5)
+        self.probar_afnd_btn.grid(row=0, column=2, padx=5)
+        self.progreso.grid(row=0, column=3, padx=5)
         
-        self.tabla_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Frame de filtro y salto a línea
+        self.vista_frame.grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+        self.filtro_label.grid(row=0, column=0, padx=(0, 5))
+        self.filtro_combo.grid(row=0, column=1, padx=(0, 15))
+        self.linea_label.grid(row=0, column=2, padx=(0, 5))
+        self.linea_entry.grid(row=0, column=3, padx=(0, 5))
+        self.ir_btn.grid(row=0, column=4)
         
-        # Configurar la tabla y scrollbars
-        self.tabla.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.scrolly.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.scrollx.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.tabla.grid(row=4, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.resumen_label.grid(row=5, column=0, sticky=tk.W, pady=(5, 0))
         
         # Configurar los pesos del grid
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         self.main_frame.columnconfigure(0, weight=1)
         self.main_frame.rowconfigure(1, weight=1)
-        self.main_frame.rowconfigure(3, weight=1)
-        self.tabla_frame.columnconfigure(0, weight=1)
-        self.tabla_frame.rowconfigure(0, weight=1)
+        self.main_frame.rowconfigure(4, weight=1)
 
     def _analizar_codigo(self):
         """
-        Analiza el código ingresado y muestra los tokens en la tabla.
+        Inicia el análisis del código ingresado en un hilo de trabajo.
         
         Proceso:
-        1. Limpia la tabla de resultados anteriores
-        2. Obtiene el código del área de texto
-        3. Ejecuta el analizador léxico
-        4. Muestra los tokens encontrados en la tabla
+        1. Obtiene el código del área de texto
+        2. Lanza el hilo que ejecuta el analizador léxico; si ya se analizó
+           antes, solo reanaliza la zona que cambió desde el análisis anterior
+        3. Programa la consulta periódica de la cola de resultados, que va
+           mostrando los tokens en la tabla a medida que llegan
         """
-        # Limpiar tabla
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
+        if self.trabajo is not None:
+            return
         
-        # Obtener código y analizarlo
+        # Obtener código
         codigo = self.codigo_text.get('1.0', tk.END)
-        tokens = self.analizador.analizar(codigo)
-        
-        # Mostrar tokens en la tabla
-        for token in tokens:
-            token_dict = token.to_dict()
-            self.tabla.insert(
-                '',
-                tk.END,
-                values=(
-                    token_dict['Lexema'],
-                    token_dict['Categoría'],
-                    token_dict['Fila'],
-                    token_dict['Columna']
-                )
-            )
+        
+        # Estado de esta ejecución
+        self.parcial = None
+        self.terminado = False
+        self.cancelar = threading.Event()
+        
+        self.analizar_btn.configure(state=tk.DISABLED)
+        self.cancelar_btn.configure(state=tk.NORMAL)
+        self.progreso.configure(maximum=max(len(codigo), 1), value=0)
+        
+        self.trabajo = threading.Thread(
+            target=self._trabajo_analisis,
+            args=(codigo, self.resultado, self.cancelar, self.cola),
+            daemon=True
+        )
+        self.trabajo.start()
+        self.root.after(self.INTERVALO_SONDEO, self._atender_cola)
+
+    def _trabajo_analisis(self, codigo: str, anterior, cancelar, cola):
+        """
+        Ejecuta el análisis en el hilo de trabajo.
+        
+        Args:
+            codigo (str): Código a analizar
+            anterior (ResultadoIncremental): Último análisis, o None
+            cancelar (threading.Event): Se activa para pedir la cancelación
+            cola (queue.Queue): Cola por la que se envían a la ventana los
+                                mensajes ('lote', primero, tokens, posicion)
+                                y, al final, ('fin', resultado), con
+                                resultado None si se canceló
+        """
+        enviados = 0
+        
+        def al_avanzar(primero, nuevos, posicion):
+            nonlocal enviados
+            cola.put(('lote', primero, nuevos[enviados:], posicion))
+            enviados = len(nuevos)
+            return not cancelar.is_set()
+        
+        resultado = None
+        try:
+            if anterior is None:
+                resultado = self.analizador.analizar_incremental(codigo, al_avanzar)
+            else:
+                edicion = AnalizadorLexico.calcular_edicion(anterior.codigo, codigo)
+                resultado = self.analizador.reanalizar(anterior, *edicion, al_avanzar=al_avanzar)
+        finally:
+            cola.put(('fin', resultado))
+
+    def _atender_cola(self):
+        """
+        Procesa los mensajes del hilo de trabajo y actualiza la tabla.
+        
+        Se ejecuta en el hilo de Tk cada INTERVALO_SONDEO milisegundos
+        mientras dure el análisis. Mientras llegan lotes, la tabla muestra
+        los tokens anteriores a la zona reanalizada seguidos de los tokens
+        nuevos recibidos; al terminar muestra el resultado completo, o el
+        análisis anterior si se canceló.
+        """
+        while True:
+            try:
+                mensaje = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            if mensaje[0] == 'lote':
+                _, primero, lote, posicion = mensaje
+                if self.parcial is None:
+                    self.parcial = self.resultado.tokens[:primero] if self.resultado is not None else []
+                    self.parcial += lote
+                    self.tabla.mostrar(self.parcial)
+                else:
+                    self.parcial += lote
+                    self.tabla.agregados()
+                self.progreso.configure(value=posicion)
+            else:
+                if mensaje[1] is not None:
+                    self.resultado = mensaje[1]
+                self.terminado = True
+        
+        if self.terminado:
+            self.tabla.mostrar(self.resultado.tokens if self.resultado is not None else [])
+            self._terminar_analisis()
+        else:
+            self.root.after(self.INTERVALO_SONDEO, self._atender_cola)
+
+    def _terminar_analisis(self):
+        """
+        Restablece los controles al terminar o cancelar el análisis y muestra
+        la cantidad de tokens de cada tipo.
+        """
+        self.trabajo = None
+        self.analizar_btn.configure(state=tk.NORMAL)
+        self.cancelar_btn.configure(state=tk.DISABLED)
+        self.progreso.configure(value=0)
+        
+        # Mostrar el resumen por tipo
+        if self.resultado is not None:
+            contadores = contar_por_tipo(self.resultado.tokens)
+            self.resumen_label.configure(text="  ".join(
+                f"{tipo.name}: {contadores[tipo]}" for tipo in TipoToken if contadores[tipo]
+            ))
+
+    def _cancelar_analisis(self):
+        """
+        Pide al hilo de trabajo que cancele el análisis en curso.
+        """
+        if self.cancelar is not None:
+            self.cancelar.set()
+
+    def _filtrar(self, evento=None):
+        """
+        Aplica a la tabla el filtro de categoría elegido.
+        
+        Args:
+            evento: Evento de selección del combobox (no se usa)
+        """
+        nombre = self.filtro_combo.get()
+        self.tabla.filtrar(None if nombre == self.TODAS else TipoToken[nombre])
+            
+    def _ir_a_linea(self, evento=None):
+        """
+        Desplaza la tabla hasta el primer token de la línea ingresada.
+        
+        Args:
+            evento: Evento de teclado (no se usa)
+        """
+        try:
+            fila = int(self.linea_entry.get())
+        except ValueError:
+            self.root.bell()
+            return
+        if not self.tabla.ir_a_linea(fila):
+            self.root.bell()
 
     def _probar_afnd(self):
         """
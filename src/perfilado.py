@@ -0,0 +1,197 @@
+"""
+Módulo de perfilado del analizador léxico.
+Este módulo guarda las mediciones del modo de perfilado de AnalizadorLexico
+(ver AnalizadorLexico.activar_perfilado): por cada tipo reconocido por el
+AFD, cuántos tokens hubo, cuántos caracteres consumieron, cuánto tiempo
+llevó reconocerlos y ejecutar su acción y cuántos errores léxicos
+produjeron, más el tiempo de despacho entre un token y el siguiente.
+
+Las mediciones se pueden imprimir como tabla, convertir a diccionario o
+volcar en el formato de `cProfile` para abrirlas con `pstats` u otras
+herramientas que lo leen.
+"""
+
+import marshal
+
+# Nombre con el que se informan los caracteres que ningún patrón reconoce
+NO_RECONOCIDO = 'NO_RECONOCIDO'
+
+# Tipos cuya acción no emite tokens; se informan aparte, fuera del total
+SIN_TOKEN = frozenset({'ESPACIO'})
+
+class ContadorClase:
+    """
+    Mediciones acumuladas de un tipo de token.
+
+    Atributos:
+        tokens (int): Veces que se ejecutó la acción del tipo (en los tipos
+                      de SIN_TOKEN, tramos consumidos sin emitir un token)
+        caracteres (int): Caracteres consumidos por esas acciones
+        reconocimiento_ns (int): Nanosegundos reconociendo los lexemas
+        accion_ns (int): Nanosegundos en la acción del tipo
+        errores (int): Errores léxicos que produjo la acción
+    """
+
+    __slots__ = ('tokens', 'caracteres', 'reconocimiento_ns', 'accion_ns', 'errores')
+
+    def __init__(self):
+        self.tokens = 0
+        self.caracteres = 0
+        self.reconocimiento_ns = 0
+        self.accion_ns = 0
+        self.errores = 0
+
+
+class PerfilAnalisis:
+    """
+    Estadísticas del modo de perfilado de AnalizadorLexico.
+
+    Cada paso del análisis se divide en tres partes:
+    - reconocimiento: el backend busca el lexema más largo
+    - acción: el método del tipo reconocido (_analizar_cadena,
+      _analizar_comentario, ...) emite el token y avanza la posición
+    - despacho: el resto del bucle entre el fin de una acción y el
+      reconocimiento siguiente (llamadas, condición del bucle, registro de
+      posiciones en el análisis incremental)
+
+    Los tiempos incluyen el costo de leer el reloj (del orden de decenas de
+    nanosegundos por medición), así que sirven para comparar las partes
+    entre sí más que como valores absolutos.
+
+    Atributos:
+        clases (dict): {tipo: ContadorClase}; los caracteres no reconocidos
+                       se cuentan como NO_RECONOCIDO
+        despacho_ns (int): Nanosegundos de despacho acumulados
+        pasos (int): Pasos cuyo despacho se midió
+        funciones (dict): {tipo: código de la función de la acción}, para el
+                          volcado de cProfile
+        reconocedor: Código de la función de reconocimiento del backend
+    """
+
+    def __init__(self, funciones: dict = None, reconocedor=None):
+        """
+        Args:
+            funciones (dict): {tipo: función de la acción}
+            reconocedor: Función de reconocimiento del backend
+        """
+        self.clases = {}
+        self.despacho_ns = 0
+        self.pasos = 0
+        self.funciones = {tipo: funcion.__code__ for tipo, funcion in (funciones or {}).items()}
+        self.reconocedor = reconocedor.__code__ if reconocedor is not None else None
+        
+        # Estado del paso en curso, que actualiza el analizador
+        self.pendiente_ns = 0
+        self.errores_en_curso = 0
+        self.fin_ns = None
+        self.codigo = None
+        self.posicion = None
+
+    def registrar(self, tipo, caracteres: int, accion_ns: int, errores: int):
+        """
+        Acumula un paso del análisis; el tiempo de reconocimiento es el
+        pendiente desde el paso anterior.
+        
+        Args:
+            tipo (str): Tipo reconocido, o None si ningún patrón lo reconoce
+            caracteres (int): Caracteres que consumió la acción
+            accion_ns (int): Nanosegundos en la acción
+            errores (int): Errores léxicos que produjo la acción
+        """
+        clave = NO_RECONOCIDO if tipo is None else tipo
+        contador = self.clases.get(clave)
+        if contador is None:
+            contador = self.clases[clave] = ContadorClase()
+        contador.tokens += 1
+        contador.caracteres += caracteres
+        contador.reconocimiento_ns += self.pendiente_ns
+        contador.accion_ns += accion_ns
+        contador.errores += errores
+        self.pendiente_ns = 0
+
+    def totales(self, incluir_sin_token: bool = False) -> ContadorClase:
+        """
+        Args:
+            incluir_sin_token (bool): Si es True suma también los tipos de
+                                      SIN_TOKEN (espacios)
+        
+        Returns:
+            ContadorClase: Suma de las mediciones de los tipos
+        """
+        total = ContadorClase()
+        for tipo, contador in self.clases.items():
+            if tipo in SIN_TOKEN and not incluir_sin_token:
+                continue
+            for campo in ContadorClase.__slots__:
+                setattr(total, campo, getattr(total, campo) + getattr(contador, campo))
+        return total
+
+    def a_dict(self) -> dict:
+        """
+        Returns:
+            dict: {'clases': {tipo: {campo: valor}}, 'despacho_ns': ...,
+                  'pasos': ..., 'errores': ...}, apto para JSON
+        """
+        return {
+            'clases': {
+                tipo: {campo: getattr(contador, campo) for campo in ContadorClase.__slots__}
+                for tipo, contador in self.clases.items()
+            },
+            'despacho_ns': self.despacho_ns,
+            'pasos': self.pasos,
+            'errores': self.totales().errores,
+        }
+
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: Tabla con una fila por tipo ordenada por tiempo total, más
+            el total, los tipos que no emiten tokens (espacios) y el
+            despacho. El total solo suma los tipos que emiten tokens, para
+            que su ns/token no se diluya con los tramos de espacios
+        """
+        def fila(nombre, contador):
+            tiempo = contador.reconocimiento_ns + contador.accion_ns
+            return (f"{nombre:<24}{contador.tokens:>10}{contador.caracteres:>12}"
+                    f"{contador.reconocimiento_ns / 1e6:>14.2f}{contador.accion_ns / 1e6:>11.2f}"
+                    f"{tiempo / max(contador.tokens, 1):>10.0f}{contador.errores:>9}")
+        
+        lineas = [f"{'Tipo':<24}{'Tokens':>10}{'Caracteres':>12}{'Reconocer ms':>14}"
+                  f"{'Acción ms':>11}{'ns/token':>10}{'Errores':>9}"]
+        ordenadas = sorted(self.clases.items(), key=lambda par: -(par[1].reconocimiento_ns + par[1].accion_ns))
+        lineas += [fila(tipo, contador) for tipo, contador in ordenadas if tipo not in SIN_TOKEN]
+        lineas.append(fila('Total', self.totales()))
+        lineas += [fila(f'{tipo} (sin token)', contador) for tipo, contador in ordenadas if tipo in SIN_TOKEN]
+        lineas.append(f"Despacho: {self.despacho_ns / 1e6:.2f} ms en {self.pasos} pasos "
+                      f"({self.despacho_ns / max(self.pasos, 1):.0f} ns/paso)")
+        return '\n'.join(lineas)
+
+    def volcar(self, ruta):
+        """
+        Guarda las mediciones en el formato de los archivos de cProfile.
+        
+        Args:
+            ruta: Archivo de salida; se lee con pstats.Stats(ruta)
+        
+        Cada tipo aparece como dos funciones, la de reconocimiento y la de
+        su acción, con el archivo y la línea del código real y el tipo entre
+        corchetes en el nombre. Ambas son llamadas desde una función
+        'analisis' cuyo tiempo propio es el despacho.
+        """
+        raiz = ('~', 0, '<analisis>')
+        total = self.totales(incluir_sin_token=True)
+        tiempo_total = (self.despacho_ns + total.reconocimiento_ns + total.accion_ns) / 1e9
+        estadisticas = {raiz: (1, 1, self.despacho_ns / 1e9, tiempo_total, {})}
+        for tipo, contador in self.clases.items():
+            partes = ((self.reconocedor, 'reconocer', contador.reconocimiento_ns),
+                      (self.funciones.get(tipo), 'accion', contador.accion_ns))
+            for codigo, nombre, nanosegundos in partes:
+                if codigo is not None:
+                    clave = (codigo.co_filename, codigo.co_firstlineno, f"{codigo.co_name}[{tipo}]")
+                else:
+                    clave = ('~', 0, f"<{nombre}>[{tipo}]")
+                segundos = nanosegundos / 1e9
+                llamadas = (contador.tokens, contador.tokens, segundos, segundos)
+                estadisticas[clave] = llamadas + ({raiz: llamadas},)
+        with open(ruta, 'wb') as archivo:
+            marshal.dump(estadisticas, archivo)
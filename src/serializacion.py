@@ -0,0 +1,201 @@
+"""
+Módulo de serialización de tokens.
+Este módulo escribe y lee tokens en formatos pensados para otras
+herramientas: JSON Lines, CSV y un formato binario compacto. Los
+escritores consumen los registros a medida que se producen (por ejemplo,
+de AnalizadorLexico.iter_tokens con posiciones=True), sin armar una lista
+intermedia, y cada lector devuelve los mismos registros.
+
+Un registro es una tupla (token, inicio, fin): el Token y las posiciones
+en caracteres [inicio, fin) del texto del código que lo produjo.
+"""
+
+import csv
+import json
+import struct
+from .token import Token, TipoToken
+
+# Cabecera del formato binario: identificador y versión
+MAGICO_BINARIO = b'KTOK\x01'
+
+# Registro binario: tipo, fila, columna, inicio, longitud en el código y
+# largo en bytes del lexema UTF-8, que sigue a continuación
+REGISTRO_BINARIO = struct.Struct('<BIIQII')
+
+# Columnas de JSON Lines y CSV
+CAMPOS = ('lexema', 'tipo', 'fila', 'columna', 'inicio', 'longitud')
+
+# Miembros de TipoToken indexados por su valor
+_TIPOS = tuple(TipoToken)
+
+def escribir_jsonl(registros, archivo) -> int:
+    """
+    Escribe registros como JSON Lines: un objeto por línea.
+
+    Args:
+        registros: Iterable de tuplas (token, inicio, fin)
+        archivo: Archivo de texto abierto para escritura
+
+    Returns:
+        int: Cantidad de registros escritos
+
+    Cada objeto tiene las claves de CAMPOS; el tipo se escribe por nombre.
+    """
+    cantidad = 0
+    volcar = json.JSONEncoder(ensure_ascii=False).encode
+    escribir = archivo.write
+    for token, inicio, fin in registros:
+        escribir(volcar({
+            'lexema': token.lexema,
+            'tipo': token.tipo.name,
+            'fila': token.fila,
+            'columna': token.columna,
+            'inicio': inicio,
+            'longitud': fin - inicio,
+        }))
+        escribir('\n')
+        cantidad += 1
+    return cantidad
+
+def leer_jsonl(archivo):
+    """
+    Lee registros escritos con escribir_jsonl.
+
+    Args:
+        archivo: Archivo de texto abierto para lectura
+
+    Yields:
+        tuple: (token, inicio, fin) por cada línea no vacía
+    """
+    for linea in archivo:
+        if not linea.strip():
+            continue
+        objeto = json.loads(linea)
+        inicio = objeto['inicio']
+        token = Token(objeto['lexema'], TipoToken[objeto['tipo']], objeto['fila'], objeto['columna'])
+        yield token, inicio, inicio + objeto['longitud']
+
+def escribir_csv(registros, archivo) -> int:
+    """
+    Escribe registros como CSV con una fila de encabezado.
+
+    Args:
+        registros: Iterable de tuplas (token, inicio, fin)
+        archivo: Archivo de texto abierto para escritura con newline=''
+
+    Returns:
+        int: Cantidad de registros escritos
+
+    Las columnas son las de CAMPOS; el tipo se escribe por nombre.
+    """
+    escritor = csv.writer(archivo)
+    escritor.writerow(CAMPOS)
+    cantidad = 0
+    escribir = escritor.writerow
+    for token, inicio, fin in registros:
+        escribir((token.lexema, token.tipo.name, token.fila, token.columna, inicio, fin - inicio))
+        cantidad += 1
+    return cantidad
+
+def leer_csv(archivo):
+    """
+    Lee registros escritos con escribir_csv.
+
+    Args:
+        archivo: Archivo de texto abierto para lectura con newline=''
+
+    Yields:
+        tuple: (token, inicio, fin) por cada fila después del encabezado
+
+    Raises:
+        ValueError: Si el encabezado no corresponde al formato
+    """
+    lector = csv.reader(archivo)
+    encabezado = next(lector, None)
+    if encabezado is not None and tuple(encabezado) != CAMPOS:
+        raise ValueError(f"Encabezado CSV inesperado: {encabezado}")
+    for lexema, tipo, fila, columna, inicio, longitud in lector:
+        inicio = int(inicio)
+        yield Token(lexema, TipoToken[tipo], int(fila), int(columna)), inicio, inicio + int(longitud)
+
+def escribir_binario(registros, archivo) -> int:
+    """
+    Escribe registros en el formato binario compacto.
+
+    Args:
+        registros: Iterable de tuplas (token, inicio, fin)
+        archivo: Archivo binario abierto para escritura
+
+    Returns:
+        int: Cantidad de registros escritos
+
+    El archivo comienza con MAGICO_BINARIO y sigue con un registro por
+    token: la cabecera fija REGISTRO_BINARIO (tipo como entero, fila,
+    columna, inicio, longitud y largo del lexema) seguida del lexema en
+    UTF-8, de modo que cada registro se puede saltar sin decodificarlo.
+    """
+    archivo.write(MAGICO_BINARIO)
+    empaquetar = REGISTRO_BINARIO.pack
+    escribir = archivo.write
+    cantidad = 0
+    for token, inicio, fin in registros:
+        lexema = token.lexema.encode('utf-8')
+        escribir(empaquetar(token.tipo, token.fila, token.columna, inicio, fin - inicio, len(lexema)))
+        escribir(lexema)
+        cantidad += 1
+    return cantidad
+
+def leer_binario(archivo):
+    """
+    Lee registros escritos con escribir_binario.
+
+    Args:
+        archivo: Archivo binario abierto para lectura
+
+    Yields:
+        tuple: (token, inicio, fin) por cada registro
+
+    Raises:
+        ValueError: Si falta la cabecera o el archivo termina a mitad de
+                    un registro
+    """
+    if archivo.read(len(MAGICO_BINARIO)) != MAGICO_BINARIO:
+        raise ValueError("El archivo no está en el formato binario de tokens")
+    desempaquetar = REGISTRO_BINARIO.unpack
+    tamano = REGISTRO_BINARIO.size
+    leer = archivo.read
+    while True:
+        cabecera = leer(tamano)
+        if not cabecera:
+            return
+        if len(cabecera) < tamano:
+            raise ValueError("Registro binario incompleto")
+        tipo, fila, columna, inicio, longitud, largo = desempaquetar(cabecera)
+        lexema = leer(largo)
+        if len(lexema) < largo:
+            raise ValueError("Registro binario incompleto")
+        yield Token(lexema.decode('utf-8'), _TIPOS[tipo], fila, columna), inicio, inicio + longitud
+
+# Formatos disponibles: nombre -> (escritor, lector, modo binario)
+FORMATOS = {
+    'jsonl': (escribir_jsonl, leer_jsonl, False),
+    'csv': (escribir_csv, leer_csv, False),
+    'binario': (escribir_binario, leer_binario, True),
+}
+
+def abrir(ruta, formato: str, modo: str = 'r'):
+    """
+    Abre un archivo con el modo adecuado para un formato.
+
+    Args:
+        ruta: Ruta del archivo
+        formato (str): Clave de FORMATOS
+        modo (str): 'r' para leer o 'w' para escribir
+
+    Returns:
+        Archivo abierto: binario para 'binario'; de texto UTF-8 sin
+        traducción de saltos de línea para los demás
+    """
+    if FORMATOS[formato][2]:
+        return open(ruta, modo + 'b')
+    return open(ruta, modo, encoding='utf-8', newline='')
@@ -0,0 +1,331 @@
+"""
+Módulo de la tabla virtual de tokens.
+Este módulo implementa una tabla basada en ttk.Treeview que solo crea las
+filas visibles y las reutiliza al desplazarse, de modo que mostrar, ordenar
+o filtrar cientos de miles de tokens no requiere una llamada a Tk por token.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from .token import TipoToken
+
+class TablaVirtual:
+    """
+    Tabla de tokens que materializa solo las filas visibles.
+
+    El modelo es una secuencia indexable de tokens (lista de Token o
+    TokenArray) y una vista: la lista de índices del modelo que pasan el
+    filtro, en el orden elegido. El Treeview contiene únicamente tantas
+    filas como caben en pantalla; al desplazarse se reescriben sus valores
+    con los tokens de la vista que corresponden a esa posición.
+
+    Permite:
+    - Ordenar por cualquier columna haciendo clic en su encabezado
+    - Filtrar por categoría de token
+    - Saltar a la primera fila de una línea del código
+    """
+
+    COLUMNAS = ('Lexema', 'Categoría', 'Fila', 'Columna')
+
+    # Medidas por defecto, hasta que el Treeview informe las reales
+    ALTO_FILA = 20
+    ALTO_ENCABEZADO = 24
+
+    def __init__(self, padre):
+        """
+        Crea la tabla y sus barras de desplazamiento dentro de un frame.
+        
+        Args:
+            padre: Widget contenedor
+        """
+        self.frame = ttk.Frame(padre)
+        self.tabla = ttk.Treeview(
+            self.frame,
+            columns=self.COLUMNAS,
+            show='headings',
+            selectmode='browse'
+        )
+        
+        # Configurar columnas; el clic en el encabezado ordena por esa columna
+        for columna in self.COLUMNAS:
+            self.tabla.heading(columna, text=columna, command=lambda c=columna: self.ordenar(c))
+        
+        # Resaltar las filas de errores léxicos
+        self.tabla.tag_configure('error', foreground='red')
+        
+        # La barra vertical recorre la vista, no las filas del Treeview
+        self.scrolly = ttk.Scrollbar(
+            self.frame,
+            orient=tk.VERTICAL,
+            command=self._desplazar
+        )
+        self.scrollx = ttk.Scrollbar(
+            self.frame,
+            orient=tk.HORIZONTAL,
+            command=self.tabla.xview
+        )
+        self.tabla.configure(xscrollcommand=self.scrollx.set)
+        
+        self.tabla.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrolly.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.scrollx.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+        
+        # Desplazamiento con la rueda del ratón y el teclado
+        self.tabla.bind('<Configure>', self._al_redimensionar)
+        self.tabla.bind('<MouseWheel>', self._al_girar_rueda)
+        self.tabla.bind('<Button-4>', lambda evento: self._mover(-3))
+        self.tabla.bind('<Button-5>', lambda evento: self._mover(3))
+        self.tabla.bind('<Prior>', lambda evento: self._mover(-len(self.filas)))
+        self.tabla.bind('<Next>', lambda evento: self._mover(len(self.filas)))
+        
+        # Modelo y vista
+        self.tokens = []
+        self.vista = []
+        self.revisados = 0
+        self.tipo_filtro = None
+        self.orden = None
+        self.descendente = False
+        self.primera = 0
+        
+        # Filas reutilizables del Treeview
+        self.filas = []
+        self._ajustar_filas(int(self.tabla.cget('height')))
+
+    def grid(self, **opciones):
+        """
+        Ubica la tabla en su contenedor con el sistema grid.
+        
+        Args:
+            **opciones: Opciones de grid del frame de la tabla
+        """
+        self.frame.grid(**opciones)
+
+    def mostrar(self, tokens):
+        """
+        Reemplaza los tokens mostrados, conservando el filtro y el orden.
+        
+        Args:
+            tokens: Lista de Token o TokenArray a mostrar
+        """
+        self.tokens = tokens
+        self._calcular_vista()
+        self._refrescar()
+
+    def agregados(self):
+        """
+        Avisa que se agregaron tokens al final de la secuencia mostrada.
+        
+        Sin orden activo la vista se extiende solo con los tokens nuevos;
+        con un orden activo se vuelve a ordenar toda la vista.
+        """
+        if self.orden is not None:
+            self._calcular_vista()
+        else:
+            self.vista.extend(self._filtrados(self.revisados))
+            self.revisados = len(self.tokens)
+        self._refrescar()
+
+    def filtrar(self, tipo: TipoToken = None):
+        """
+        Muestra solo los tokens de una categoría.
+        
+        Args:
+            tipo (TipoToken): Categoría a mostrar, o None para mostrar todas
+        """
+        self.tipo_filtro = tipo
+        self.primera = 0
+        self._calcular_vista()
+        self._refrescar()
+
+    def ordenar(self, columna: str):
+        """
+        Ordena la vista por una columna; al repetirla se invierte el sentido.
+        
+        Args:
+            columna (str): Nombre de la columna ('Lexema', 'Categoría',
+                           'Fila' o 'Columna')
+        """
+        if self.orden == columna:
+            self.descendente = not self.descendente
+        else:
+            self.orden = columna
+            self.descendente = False
+        self.primera = 0
+        self._calcular_vista()
+        self._refrescar()
+
+    def ir_a_linea(self, fila: int) -> bool:
+        """
+        Desplaza la tabla hasta el primer token de una línea y lo selecciona.
+        
+        Args:
+            fila (int): Número de línea del código
+        
+        Returns:
+            bool: True si algún token de la vista está en esa línea o después
+        
+        Si la línea no tiene tokens en la vista se va al primero (en el orden
+        del código) de las líneas siguientes, con cualquier orden de la
+        tabla. Con la vista en el orden del código la búsqueda es binaria,
+        porque las filas de los tokens no decrecen; con otro orden se recorre.
+        """
+        tokens = self.tokens
+        vista = self.vista
+        if self.orden is None or (self.orden == 'Fila' and not self.descendente):
+            bajo, alto = 0, len(vista)
+            while bajo < alto:
+                medio = (bajo + alto) // 2
+                if tokens[vista[medio]].fila < fila:
+                    bajo = medio + 1
+                else:
+                    alto = medio
+            posicion = bajo
+        else:
+            # El menor (fila, índice) entre los tokens de esa línea o posteriores
+            _, _, posicion = min(
+                ((tokens[indice].fila, indice, posicion) for posicion, indice in enumerate(vista)
+                 if tokens[indice].fila >= fila),
+                default=(None, None, len(vista))
+            )
+        if posicion >= len(vista):
+            return False
+        self.primera = posicion
+        self._refrescar()
+        # Cerca del final la vista no puede subir la fila hasta arriba
+        self.tabla.selection_set(self.filas[min(posicion - self.primera, len(self.filas) - 1)])
+        return True
+
+    def _filtrados(self, desde: int = 0) -> list:
+        """
+        Índices de los tokens que pasan el filtro, en el orden del código.
+        
+        Args:
+            desde (int): Primer índice del modelo a considerar
+        
+        Returns:
+            list: Índices del modelo
+        """
+        tokens = self.tokens
+        if self.tipo_filtro is None:
+            return list(range(desde, len(tokens)))
+        tipo = self.tipo_filtro
+        return [indice for indice in range(desde, len(tokens)) if tokens[indice].tipo == tipo]
+
+    def _calcular_vista(self):
+        """
+        Recalcula la vista aplicando el filtro y el orden actuales.
+        """
+        vista = self._filtrados()
+        if self.orden is not None:
+            tokens = self.tokens
+            claves = {
+                'Lexema': lambda indice: tokens[indice].lexema,
+                'Categoría': lambda indice: tokens[indice].tipo,
+                'Fila': lambda indice: tokens[indice].fila,
+                'Columna': lambda indice: tokens[indice].columna,
+            }
+            # El orden es estable: a igual clave se conserva el orden del código
+            vista.sort(key=claves[self.orden], reverse=self.descendente)
+        self.vista = vista
+        self.revisados = len(self.tokens)
+
+    def _ajustar_filas(self, cantidad: int):
+        """
+        Crea o elimina filas del Treeview para tener exactamente `cantidad`.
+        
+        Args:
+            cantidad (int): Cantidad de filas visibles
+        """
+        while len(self.filas) < cantidad:
+            self.filas.append(self.tabla.insert('', tk.END, values=()))
+        if len(self.filas) > cantidad:
+            self.tabla.delete(*self.filas[cantidad:])
+            del self.filas[cantidad:]
+
+    def _refrescar(self):
+        """
+        Escribe en las filas del Treeview los tokens visibles de la vista y
+        actualiza la barra de desplazamiento.
+        """
+        total = len(self.vista)
+        visibles = len(self.filas)
+        self.primera = max(0, min(self.primera, total - visibles))
+        
+        for desplazamiento, fila in enumerate(self.filas):
+            posicion = self.primera + desplazamiento
+            if posicion < total:
+                token = self.tokens[self.vista[posicion]]
+                self.tabla.item(
+                    fila,
+                    values=(token.lexema, token.tipo.name, token.fila, token.columna),
+                    tags=('error',) if token.tipo == TipoToken.ERROR_LEXICO else ()
+                )
+            else:
+                self.tabla.item(fila, values=(), tags=())
+        
+        if total:
+            self.scrolly.set(self.primera / total, min(1.0, (self.primera + visibles) / total))
+        else:
+            self.scrolly.set(0.0, 1.0)
+
+    def _desplazar(self, accion: str, cantidad: str, unidad: str = None):
+        """
+        Atiende los comandos de la barra de desplazamiento vertical.
+        
+        Args:
+            accion (str): 'moveto' o 'scroll'
+            cantidad (str): Fracción de destino ('moveto') o cantidad de
+                            unidades a desplazar ('scroll')
+            unidad (str): 'units' o 'pages' para 'scroll'
+        """
+        if accion == 'moveto':
+            self.primera = int(float(cantidad) * len(self.vista))
+            self._refrescar()
+        else:
+            paso = len(self.filas) if unidad == 'pages' else 1
+            self._mover(int(cantidad) * paso)
+
+    def _mover(self, filas: int) -> str:
+        """
+        Desplaza la vista una cantidad de filas.
+        
+        Args:
+            filas (int): Filas a desplazar (negativo hacia arriba)
+        
+        Returns:
+            str: 'break', para que el Treeview no procese el evento
+        """
+        self.primera += filas
+        self._refrescar()
+        return 'break'
+
+    def _al_girar_rueda(self, evento) -> str:
+        """
+        Desplaza la vista con la rueda del ratón (Windows y macOS).
+        
+        Args:
+            evento: Evento de Tk con el giro en `delta`
+        
+        Returns:
+            str: 'break', para que el Treeview no procese el evento
+        """
+        pasos = -evento.delta // 120 if abs(evento.delta) >= 120 else -evento.delta
+        return self._mover(pasos * 3)
+
+    def _al_redimensionar(self, evento):
+        """
+        Ajusta la cantidad de filas al alto disponible del Treeview.
+        
+        Args:
+            evento: Evento <Configure> con el nuevo alto en `height`
+        """
+        alto_fila, encabezado = self.ALTO_FILA, self.ALTO_ENCABEZADO
+        caja = self.tabla.bbox(self.filas[0]) if self.filas else ''
+        if caja:
+            encabezado, alto_fila = caja[1], caja[3]
+        cantidad = max(1, (evento.height - encabezado) // alto_fila)
+        if cantidad != len(self.filas):
+            self._ajustar_filas(cantidad)
+            self._refrescar()
@@ -1,9 +1,268 @@
 """
 Módulo que define la estructura de un token léxico.
-Este módulo contiene la clase Token que representa las unidades léxicas
-identificadas durante el análisis del código fuente Kotlin.
+Este módulo contiene la enumeración TipoToken con las categorías de token,
+la clase Token que representa las unidades léxicas identificadas durante el
+análisis del código fuente Kotlin, la clase TokenArray que guarda muchos
+tokens en columnas compactas, la clase IndiceLineas que convierte
+posiciones del código en fila y columna, y la clase ResultadoIncremental
+que permite actualizar un análisis tras editar el código.
 """
 
+import re
+from array import array
+from bisect import bisect_right
+from enum import IntEnum
+
+class TipoToken(IntEnum):
+    """
+    Categorías de token producidas por el analizador léxico.
+    
+    Al ser enteros, comparar y filtrar tokens por tipo son operaciones
+    enteras, y los tipos sirven directamente como índices de listas de
+    contadores (ver contar_por_tipo). El nombre de cada miembro es el texto
+    que se muestra al usuario. Los miembros nuevos se agregan al final para
+    no cambiar el valor de los existentes, que se guarda al serializar.
+    
+    Las palabras clave de Kotlin se dividen en tres tipos:
+    - PALABRA_RESERVADA: palabras clave duras (fun, class, if...), que
+      nunca pueden ser un nombre
+    - PALABRA_CLAVE_SUAVE: palabras clave solo en ciertos contextos (by,
+      get, set, where...)
+    - MODIFICADOR: modificadores de declaraciones (private, override,
+      data...)
+    Las suaves y los modificadores pueden usarse como nombres: el
+    analizador léxico no conoce el contexto y los clasifica siempre por su
+    texto, y decidir si en un lugar son un nombre queda para el análisis
+    sintáctico (ver puede_ser_nombre).
+    """
+    PALABRA_RESERVADA = 0
+    IDENTIFICADOR = 1
+    NUMERO_NATURAL = 2
+    NUMERO_REAL = 3
+    OPERADOR = 4
+    DELIMITADOR = 5
+    CADENA = 6
+    COMENTARIO_LINEA = 7
+    COMENTARIO_BLOQUE = 8
+    ERROR_LEXICO = 9
+    PALABRA_CLAVE_SUAVE = 10
+    MODIFICADOR = 11
+    
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: Nombre del tipo, para mostrarlo
+        """
+        return self.name
+    
+    def __format__(self, especificacion: str) -> str:
+        """
+        Formatea el tipo por su nombre, también dentro de f-strings.
+        
+        Args:
+            especificacion (str): Especificación de formato
+            
+        Returns:
+            str: Nombre del tipo formateado
+        """
+        return format(self.name, especificacion)
+    
+    def es_comentario(self) -> bool:
+        """
+        Returns:
+            bool: True si el tipo es un comentario de línea o de bloque
+        """
+        return self is TipoToken.COMENTARIO_LINEA or self is TipoToken.COMENTARIO_BLOQUE
+    
+    def es_palabra_clave(self) -> bool:
+        """
+        Returns:
+            bool: True si el tipo es una palabra clave dura, suave o un modificador
+        """
+        return (self is TipoToken.PALABRA_RESERVADA or self is TipoToken.PALABRA_CLAVE_SUAVE
+                or self is TipoToken.MODIFICADOR)
+    
+    def puede_ser_nombre(self) -> bool:
+        """
+        Returns:
+            bool: True si un token de este tipo puede ser el nombre de algo
+            según el contexto: un identificador, una palabra clave suave o
+            un modificador
+        """
+        return (self is TipoToken.IDENTIFICADOR or self is TipoToken.PALABRA_CLAVE_SUAVE
+                or self is TipoToken.MODIFICADOR)
+
+# Miembros indexados por su valor, para convertir enteros sin pasar por TipoToken(valor)
+_TIPOS = tuple(TipoToken)
+
+# Fin de la última línea de un IndiceLineas: mayor que cualquier posición
+_SIN_LIMITE = 1 << 63
+
+def contar_por_tipo(tokens) -> list:
+    """
+    Cuenta los tokens de cada tipo.
+    
+    Args:
+        tokens: Lista de Token, TokenArray o cualquier iterable de tokens
+        
+    Returns:
+        list: Lista indexada por TipoToken con la cantidad de tokens de cada tipo
+    """
+    contadores = [0] * len(_TIPOS)
+    if isinstance(tokens, TokenArray):
+        for tipo in tokens.tipos:
+            contadores[tipo] += 1
+    else:
+        for token in tokens:
+            contadores[token.tipo] += 1
+    return contadores
+
+class IndiceLineas:
+    """
+    Índice de los inicios de línea de un código fuente.
+    
+    Se construye una sola vez por código buscando los saltos de línea con
+    una expresión regular, y convierte una posición en caracteres a fila y
+    columna con una búsqueda binaria. Así el analizador no necesita llevar
+    la línea y la columna al día carácter por carácter: los tokens guardan
+    su posición y la fila y la columna se calculan al pedirlas.
+    
+    Como el analizador consulta posiciones crecientes, el índice recuerda
+    la última línea consultada y solo busca cuando la posición cae fuera
+    de ella: la búsqueda se hace una vez por línea y no una vez por token.
+    
+    Atributos:
+        inicios (array): Posición del primer carácter de cada línea
+        fila (int): Número de la primera línea del código
+        columna (int): Columna del primer carácter del código
+        desde (int): Inicio de la última línea consultada
+        hasta (int): Inicio de la línea siguiente a ésa
+        fila_actual (int): Número de la última línea consultada
+        origen (int): Posición que tendría la columna 0 de esa línea, de
+                      modo que la columna de una posición p es p - origen
+    """
+    __slots__ = ('inicios', 'fila', 'columna', 'desde', 'hasta', 'fila_actual', 'origen')
+    
+    def __init__(self, codigo: str, fila: int = 1, columna: int = 1):
+        """
+        Construye el índice de un código.
+        
+        Args:
+            codigo (str): Código fuente
+            fila (int): Número de la primera línea; distinto de 1 cuando el
+                        código es un trozo de un texto mayor (ver iter_tokens)
+            columna (int): Columna del primer carácter del código
+        """
+        self.inicios = array('Q', [0])
+        self.inicios.extend([salto.end() for salto in re.finditer('\n', codigo)])
+        self.fila = fila
+        self.columna = columna
+        self.situar(0)
+    
+    def situar(self, desplazamiento: int):
+        """
+        Busca la línea de una posición y la recuerda como línea actual.
+        
+        Args:
+            desplazamiento (int): Posición en caracteres desde el inicio del
+                                  código (puede ser la del final o posterior)
+        """
+        inicios = self.inicios
+        indice = bisect_right(inicios, desplazamiento) - 1
+        self.desde = inicios[indice]
+        self.hasta = inicios[indice + 1] if indice + 1 < len(inicios) else _SIN_LIMITE
+        self.fila_actual = self.fila + indice
+        self.origen = self.desde - 1 if indice else -self.columna
+    
+    def posicion(self, desplazamiento: int) -> tuple:
+        """
+        Convierte una posición del código en fila y columna.
+        
+        Args:
+            desplazamiento (int): Posición en caracteres desde el inicio del
+                                  código (puede ser la del final)
+            
+        Returns:
+            tuple: (fila, columna) del carácter en esa posición
+        """
+        if not self.desde <= desplazamiento < self.hasta:
+            self.situar(desplazamiento)
+        return self.fila_actual, desplazamiento - self.origen
+    
+    def fila_de(self, desplazamiento: int) -> int:
+        """
+        Args:
+            desplazamiento (int): Posición en caracteres
+            
+        Returns:
+            int: Número de línea de esa posición
+        """
+        return self.posicion(desplazamiento)[0]
+    
+    def columna_de(self, desplazamiento: int) -> int:
+        """
+        Args:
+            desplazamiento (int): Posición en caracteres
+            
+        Returns:
+            int: Columna de esa posición
+        """
+        return self.posicion(desplazamiento)[1]
+    
+    def desplazamiento(self, fila: int, columna: int = 1) -> int:
+        """
+        Convierte una fila y una columna en la posición del código.
+        
+        Args:
+            fila (int): Número de línea
+            columna (int): Columna dentro de la línea
+            
+        Returns:
+            int: Posición en caracteres
+            
+        Raises:
+            IndexError: Si la línea no existe en el código
+        """
+        indice = fila - self.fila
+        if not 0 <= indice < len(self.inicios):
+            raise IndexError("línea fuera del código")
+        if not indice:
+            columna -= self.columna - 1
+        return self.inicios[indice] + columna - 1
+    
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: Cantidad de líneas del código
+        """
+        return len(self.inicios)
+    
+    def editar(self, inicio: int, borrados: int, insertado: str):
+        """
+        Calcula el índice del código tras una edición sin volver a recorrerlo.
+        
+        Args:
+            inicio (int): Posición donde comienza la edición
+            borrados (int): Cantidad de caracteres eliminados desde `inicio`
+            insertado (str): Texto insertado en `inicio`
+            
+        Returns:
+            IndiceLineas: Índice del código editado; solo se buscan saltos de
+            línea en el texto insertado y se desplazan los inicios posteriores
+        """
+        inicios = self.inicios
+        desplazamiento = len(insertado) - borrados
+        nuevo = IndiceLineas('', self.fila, self.columna)
+        nuevo.inicios = inicios[:bisect_right(inicios, inicio)]
+        nuevo.inicios.extend([inicio + salto.end() for salto in re.finditer('\n', insertado)])
+        resto = inicios[bisect_right(inicios, inicio + borrados):]
+        if desplazamiento:
+            nuevo.inicios.extend(map(desplazamiento.__add__, resto))
+        else:
+            nuevo.inicios.extend(resto)
+        nuevo.situar(0)
+        return nuevo
+
 class Token:
     """
     Clase que representa un token léxico identificado en el código fuente.
@@ -12,17 +271,24 @@ class Token:
     - El lexema (texto exacto encontrado en el código)
     - El tipo de token (identificador, número, operador, etc.)
     - La posición exacta donde se encontró (fila y columna)
+    
+    Usa __slots__ para no reservar un diccionario por instancia.
     """
-    def __init__(self, lexema: str, tipo: str, fila: int, columna: int):
+    __slots__ = ('lexema', 'tipo', 'fila', 'columna')
+    
+    def __init__(self, lexema: str, tipo: TipoToken, fila: int, columna: int):
         """
         Inicializa un nuevo token.
         
         Args:
             lexema (str): El texto del token identificado
-            tipo (str): La categoría del token (ej: 'IDENTIFICADOR', 'NUMERO', etc.)
+            tipo (TipoToken): La categoría del token (ej: TipoToken.IDENTIFICADOR);
+                              también se acepta su nombre como texto
             fila (int): Número de línea donde se encontró el token
             columna (int): Posición en la línea donde comienza el token
         """
+        if isinstance(tipo, str):
+            tipo = TipoToken[tipo]
         self.lexema = lexema
         self.tipo = tipo
         self.fila = fila
@@ -35,7 +301,7 @@ class Token:
         Returns:
             str: Cadena con formato "Token(lexema='X', tipo='Y', pos=(fila, columna))"
         """
-        return f"Token(lexema='{self.lexema}', tipo='{self.tipo}', pos=({self.fila}, {self.columna}))"
+        return f"Token(lexema='{self.lexema}', tipo='{self.tipo.name}', pos=({self.fila}, {self.columna}))"
     
     def to_dict(self) -> dict:
         """
@@ -52,7 +318,212 @@ class Token:
         """
         return {
             'Lexema': self.lexema,
-            'Categoría': self.tipo,
+            'Categoría': self.tipo.name,
             'Fila': self.fila,
             'Columna': self.columna
-        } 
\ No newline at end of file
+        } 
+
+
+class VistaToken:
+    """
+    Vista liviana de un token guardado en un TokenArray.
+    
+    Expone los mismos atributos y métodos que Token (lexema, tipo, fila,
+    columna, __str__ y to_dict), pero los lee de las columnas del arreglo
+    cuando se consultan, en lugar de copiarlos.
+    """
+    __slots__ = ('arreglo', 'indice')
+    
+    def __init__(self, arreglo, indice: int):
+        """
+        Inicializa la vista.
+        
+        Args:
+            arreglo (TokenArray): Arreglo que contiene el token
+            indice (int): Posición del token dentro del arreglo
+        """
+        self.arreglo = arreglo
+        self.indice = indice
+    
+    @property
+    def lexema(self) -> str:
+        """str: Lexema, recortado del código fuente al consultarlo."""
+        return self.arreglo.lexema(self.indice)
+    
+    @property
+    def tipo(self) -> TipoToken:
+        """TipoToken: Categoría del token."""
+        return _TIPOS[self.arreglo.tipos[self.indice]]
+    
+    @property
+    def fila(self) -> int:
+        """int: Número de línea del token, calculado desde su posición."""
+        return self.arreglo.lineas.fila_de(self.arreglo.inicios[self.indice])
+    
+    @property
+    def columna(self) -> int:
+        """int: Columna donde comienza el token, calculada desde su posición."""
+        return self.arreglo.lineas.columna_de(self.arreglo.inicios[self.indice])
+    
+    __str__ = Token.__str__
+    to_dict = Token.to_dict
+
+
+class TokenArray:
+    """
+    Resultado columnar del análisis léxico.
+    
+    En lugar de un objeto Token por token, guarda columnas paralelas de
+    `array` con:
+    - inicios y fines: posiciones del lexema en el código fuente
+    - tipos: valor entero del TipoToken
+    
+    Los lexemas no se copian: se recortan del código fuente al consultarlos.
+    La fila y la columna tampoco se guardan: se calculan desde el inicio del
+    token con un IndiceLineas del código, que se construye la primera vez
+    que se consultan. Los tokens de error, cuyo lexema es un mensaje, lo
+    guardan aparte; su inicio es la posición del error.
+    Al indexar o recorrer el arreglo se obtienen objetos VistaToken.
+    """
+    
+    def __init__(self, codigo: str):
+        """
+        Inicializa un arreglo vacío asociado a un código fuente.
+        
+        Args:
+            codigo (str): Código fuente del que se recortan los lexemas
+        """
+        self.codigo = codigo
+        self.inicios = array('Q')
+        self.fines = array('Q')
+        self.tipos = array('B')
+        self.mensajes = {}
+        self._lineas = None
+    
+    @property
+    def lineas(self) -> IndiceLineas:
+        """IndiceLineas: Índice de líneas del código, construido al primer uso."""
+        if self._lineas is None:
+            self._lineas = IndiceLineas(self.codigo)
+        return self._lineas
+    
+    @lineas.setter
+    def lineas(self, indice: IndiceLineas):
+        self._lineas = indice
+    
+    def agregar(self, tipo: TipoToken, inicio: int, fin: int, lexema: str = None):
+        """
+        Agrega un token al final del arreglo.
+        
+        Args:
+            tipo (TipoToken): Categoría del token
+            inicio (int): Posición inicial del lexema en el código, de la
+                          que se obtienen su fila y su columna
+            fin (int): Posición final (exclusiva) del lexema
+            lexema (str): Lexema explícito, solo para los que no son un
+                          recorte del código (mensajes de error)
+        """
+        if lexema is not None:
+            self.mensajes[len(self.tipos)] = lexema
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+        self.tipos.append(tipo)
+    
+    def lexema(self, indice: int) -> str:
+        """
+        Obtiene el lexema de un token.
+        
+        Args:
+            indice (int): Posición del token en el arreglo
+            
+        Returns:
+            str: El mensaje guardado o el recorte del código fuente
+        """
+        mensaje = self.mensajes.get(indice)
+        if mensaje is not None:
+            return mensaje
+        return self.codigo[self.inicios[indice]:self.fines[indice]]
+    
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: Cantidad de tokens del arreglo
+        """
+        return len(self.tipos)
+    
+    def __getitem__(self, indice: int) -> VistaToken:
+        """
+        Obtiene una vista del token en la posición dada.
+        
+        Args:
+            indice (int): Posición del token (admite índices negativos)
+            
+        Returns:
+            VistaToken: Vista del token
+        """
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de token fuera de rango")
+        return VistaToken(self, indice)
+    
+    def __iter__(self):
+        """
+        Recorre el arreglo.
+        
+        Yields:
+            VistaToken: Vista de cada token, en orden
+        """
+        for indice in range(len(self)):
+            yield VistaToken(self, indice)
+    
+    def a_tokens(self) -> list:
+        """
+        Materializa el arreglo como una lista de objetos Token.
+        
+        Returns:
+            list: Lista de Token equivalentes
+        """
+        return [Token(vista.lexema, vista.tipo, vista.fila, vista.columna) for vista in self]
+
+
+
+class ResultadoIncremental:
+    """
+    Resultado de un análisis que puede actualizarse tras editar el código.
+    
+    Además de la lista de tokens guarda, para cada token, la posición del
+    analizador al terminar el paso que lo produjo, y el índice de líneas
+    del código. Esas posiciones son los puntos desde los que
+    AnalizadorLexico.reanalizar retoma el análisis y con los que comprueba
+    si el análisis nuevo volvió a coincidir con éste.
+    
+    Atributos:
+        codigo (str): Código fuente analizado
+        tokens (list): Lista de objetos Token
+        fines (array): Posición del analizador tras el paso de cada token
+        lineas (IndiceLineas): Inicios de línea del código, para convertir
+                               posiciones en fila y columna
+        cambio (tuple): (inicio, fin_anterior, fin_nuevo): los tokens
+                        [inicio, fin_anterior) del resultado anterior fueron
+                        reemplazados por los tokens [inicio, fin_nuevo) de
+                        éste. En un análisis completo es (0, 0, len(tokens))
+    """
+    __slots__ = ('codigo', 'tokens', 'fines', 'lineas', 'cambio')
+    
+    def __init__(self, codigo: str, tokens: list, fines, lineas: IndiceLineas, cambio: tuple):
+        """
+        Inicializa el resultado.
+        
+        Args:
+            codigo (str): Código fuente analizado
+            tokens (list): Lista de objetos Token
+            fines (array): Posición del analizador tras cada token
+            lineas (IndiceLineas): Índice de líneas del código
+            cambio (tuple): Rango de tokens reemplazado (ver la clase)
+        """
+        self.codigo = codigo
+        self.tokens = tokens
+        self.fines = fines
+        self.lineas = lineas
+        self.cambio = cambio
\ No newline at end of file